@@ -0,0 +1,10 @@
+"""
+Runs the command line coordinate converter of core.cli, for example
+
+    python -m latlontools --from mgrs --columns grid --to geohash < in.csv
+"""
+import sys
+
+from .core.cli import main
+
+sys.exit(main(prog='python -m {}'.format(__package__)))
@@ -0,0 +1,87 @@
+"""
+Conversion of features in chunks, for the processing algorithms whose
+coordinate format has array functions. Features are read BATCH_SIZE at a
+time, their coordinates converted with one call and the output features
+written to the sink.
+"""
+from itertools import islice
+from math import isnan
+from qgis.core import QgsFeature, QgsGeometry, QgsPointXY
+
+# Number of features converted at once
+BATCH_SIZE = 10000
+
+
+def encodePoints(source, sink, transform, encoder, feedback, total):
+    '''Add a coordinate string field to point features, converting them in
+    chunks of BATCH_SIZE with an encoder that takes lists of latitudes and
+    longitudes and returns an array of strings.'''
+    iterator = source.getFeatures()
+    cnt = 0
+    while not feedback.isCanceled():
+        features = list(islice(iterator, BATCH_SIZE))
+        if not features:
+            break
+        lat = [float('nan')] * len(features)
+        lon = [float('nan')] * len(features)
+        valid = [False] * len(features)
+        for i, feature in enumerate(features):
+            try:
+                pt = feature.geometry().asPoint()
+                if transform is not None:
+                    pt = transform.transform(pt)
+                lat[i] = pt.y()
+                lon[i] = pt.x()
+                valid[i] = True
+            except Exception:
+                pass
+        msgs = encoder(lat, lon).tolist()
+        for feature, msg, ok in zip(features, msgs, valid):
+            f = QgsFeature()
+            f.setGeometry(feature.geometry())
+            f.setAttributes(feature.attributes() + [msg if ok else ''])
+            sink.addFeature(f)
+        cnt += len(features)
+        feedback.setProgress(int(cnt * total))
+
+
+def decodeField(source, sink, field_name, decoder, feedback, total, field2_name=None):
+    '''Create point features from a coordinate string field, converting them
+    in chunks of BATCH_SIZE with a decoder that takes a list of strings and
+    returns arrays of latitudes and longitudes, NaN for invalid strings.
+    If field2_name is given the decoder takes a second list of strings with
+    the values of that field. Returns the number of invalid features.'''
+    iterator = source.getFeatures()
+    cnt = 0
+    failed = 0
+    while not feedback.isCanceled():
+        features = list(islice(iterator, BATCH_SIZE))
+        if not features:
+            break
+        codes = [''] * len(features)
+        codes2 = [''] * len(features)
+        valid = [False] * len(features)
+        for i, feature in enumerate(features):
+            try:
+                codes[i] = feature[field_name].strip()
+                if field2_name is not None:
+                    codes2[i] = feature[field2_name].strip()
+                valid[i] = True
+            except Exception:
+                pass
+        if field2_name is None:
+            lat, lon = decoder(codes)
+        else:
+            lat, lon = decoder(codes, codes2)
+        for feature, y, x, ok in zip(features, lat.tolist(), lon.tolist(), valid):
+            if not ok or isnan(y) or isnan(x):
+                failed += 1
+                continue
+            f = QgsFeature()
+            f.setAttributes(feature.attributes())
+            f.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
+            sink.addFeature(f)
+        cnt += len(features)
+        feedback.setProgress(int(cnt * total))
+    return failed
+
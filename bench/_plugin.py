@@ -0,0 +1,22 @@
+"""
+Helper used by the benchmark scripts to import the plugin modules.
+
+The plugin uses relative imports so its modules can only be loaded as members
+of a package. The plugin directory is imported as a package under its own
+directory name.
+"""
+import importlib
+import os
+import sys
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(PLUGIN_DIR)
+
+if os.path.dirname(PLUGIN_DIR) not in sys.path:
+    sys.path.insert(0, os.path.dirname(PLUGIN_DIR))
+
+
+def load(name):
+    """ Imports the plugin module name and returns it
+    """
+    return importlib.import_module('{}.{}'.format(PACKAGE, name))
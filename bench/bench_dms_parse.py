@@ -0,0 +1,193 @@
+"""
+Compares the tokenizer in core/dms.py with the regular expression parser that
+util.parseDMSString used before it. A copy of the old parser is kept below
+so the two can be timed side by side without QGIS.
+
+The corpus holds random coordinates written in formats found in real data:
+decimal degrees with various separators, DMS and degrees and decimal minutes
+with symbols, letters or colons, hemispheres before or after the values,
+packed DDMMSS values and both coordinate orders. For every format the
+throughput of both parsers is printed together with the number of strings
+where the results differ.
+
+Usage: python bench/bench_dms_parse.py [strings per format]
+"""
+import random
+import re
+import sys
+import time
+
+from _plugin import load
+
+dms = load('core.dms')
+
+
+def legacyParseDMSString(str, order=0):
+    str = str.strip().upper()
+    try:
+        if re.search(r"[NSEW]", str) is None:
+            str = re.sub(r"[^\d.+-]+", " ", str).strip()
+            coords = re.split(r'\s+', str, 1)
+            if len(coords) != 2:
+                raise ValueError('Invalid Coordinates')
+            if order == 0:
+                lat = float(coords[0])
+                lon = float(coords[1])
+            else:
+                lon = float(coords[0])
+                lat = float(coords[1])
+        else:
+            if re.search(r'[NSEW]\s*\d+.+[NSEW]\s*\d+', str) is None:
+                m = re.findall(r'(.+)\s*([NS])[\s,;:]*(.+)\s*([EW])', str)
+                if len(m) != 1 or len(m[0]) != 4:
+                    m = re.findall(r'(.+)\s*([EW])[\s,;:]*(.+)\s*([NS])', str)
+                    if len(m) != 1 or len(m[0]) != 4:
+                        raise ValueError('Invalid DMS Coordinate')
+                    else:
+                        lon = legacyParseDMS(m[0][0], m[0][1])
+                        lat = legacyParseDMS(m[0][2], m[0][3])
+                else:
+                    lat = legacyParseDMS(m[0][0], m[0][1])
+                    lon = legacyParseDMS(m[0][2], m[0][3])
+            else:
+                m = re.findall(r'([NS])\s*(\d+.*?)[\s,;:]*([EW])(.+)', str)
+                if len(m) != 1 or len(m[0]) != 4:
+                    m = re.findall(r'([EW])\s*(\d+.*?)[\s,;:]*([NS])(.+)', str)
+                    if len(m) != 1 or len(m[0]) != 4:
+                        raise ValueError('Invalid DMS Coordinate')
+                    else:
+                        lon = legacyParseDMS(m[0][1], m[0][0])
+                        lat = legacyParseDMS(m[0][3], m[0][2])
+                else:
+                    lat = legacyParseDMS(m[0][1], m[0][0])
+                    lon = legacyParseDMS(m[0][3], m[0][2])
+    except Exception:
+        raise ValueError('Invalid Coordinates')
+    return lat, lon
+
+
+def legacyParseDMS(str, hemisphere):
+    str = re.sub(r"[^\d.]+", " ", str).strip()
+    parts = re.split(r'[\s]+', str)
+    dmslen = len(parts)
+    if dmslen == 3:
+        deg = float(parts[0]) + float(parts[1]) / 60.0 + float(parts[2]) / 3600.0
+    elif dmslen == 2:
+        deg = float(parts[0]) + float(parts[1]) / 60.0
+    elif dmslen == 1:
+        dms = parts[0]
+        if hemisphere == 'N' or hemisphere == 'S':
+            dms = '0' + dms
+        ll = dms.find('.')
+        if ll == -1:
+            ll = len(dms)
+        if ll >= 7:
+            deg = float(dms[0:3]) + float(dms[3:5]) / 60.0 + float(dms[5:]) / 3600.0
+        elif ll == 6:
+            deg = float(dms[0:2]) + float(dms[2:4]) / 60.0 + float(dms[4:]) / 3600.0
+        elif ll == 5:
+            deg = float(dms[0:3]) + float(dms[3:]) / 60.0
+        elif ll == 4:
+            deg = float(dms[0:2]) + float(dms[2:]) / 60.0
+        else:
+            deg = float(dms)
+    else:
+        raise ValueError('Invalid DMS Coordinate')
+    if hemisphere == 'S' or hemisphere == 'W':
+        deg = -deg
+    return deg
+
+
+def split(value, ndigits):
+    """ Returns degrees, minutes, seconds and decimal minutes of abs(value)
+    """
+    value = abs(value)
+    d = int(value)
+    minutes = (value - d) * 60
+    m = int(minutes)
+    return d, m, round((minutes - m) * 60, ndigits), round(minutes, ndigits)
+
+
+FORMATS = [
+    ('decimal comma', lambda c: '{lat:.6f}, {lon:.6f}'.format(**c)),
+    ('decimal space', lambda c: '{lat:.6f} {lon:.6f}'.format(**c)),
+    ('decimal degree sign', lambda c: '{lat:.5f}\xb0 {lon:.5f}\xb0'.format(**c)),
+    ('decimal hemisphere after', lambda c: '{alat:.5f}{ns} {alon:.5f}{ew}'.format(**c)),
+    ('decimal hemisphere before', lambda c: '{ns} {alat:.5f}, {ew} {alon:.5f}'.format(**c)),
+    ('dms symbols', lambda c: '{ld}\xb0{lm}\'{ls}"{ns} {od}\xb0{om}\'{os}"{ew}'.format(**c)),
+    ('dms primes lon lat', lambda c: '{od}\xb0{om}′{os}″{ew}, {ld}\xb0{lm}′{ls}″{ns}'.format(**c)),
+    ('dms spaces', lambda c: '{ld} {lm} {ls} {ns} {od} {om} {os} {ew}'.format(**c)),
+    ('dms hemisphere before', lambda c: '{ns}{ld}\xb0 {lm}\' {ls}" {ew}{od}\xb0 {om}\' {os}"'.format(**c)),
+    ('dms colons', lambda c: '{ld}:{lm}:{ls}{ns}, {od}:{om}:{os}{ew}'.format(**c)),
+    ('dms dashes', lambda c: '{ld}-{lm}-{ls}{ns} {od}-{om}-{os}{ew}'.format(**c)),
+    ('dms letters', lambda c: '{ld}d{lm}m{ls}s{ns} {od}d{om}m{os}s{ew}'.format(**c)),
+    ('ddm', lambda c: '{ld}\xb0 {lmm}\' {ns}, {od}\xb0 {omm}\' {ew}'.format(**c)),
+    ('packed ddmmss', lambda c: '{ld:02d}{lm:02d}{lsi:02d}{ns} {od:03d}{om:02d}{osi:02d}{ew}'.format(**c)),
+    ('packed ddmm.mmm', lambda c: '{ns}{ld:02d}{lmm:06.3f} {ew}{od:03d}{omm:06.3f}'.format(**c)),
+]
+
+
+def sampleCoordinates(count, seed=1):
+    rnd = random.Random(seed)
+    coords = []
+    for _ in range(count):
+        lat = rnd.uniform(-90.0, 90.0)
+        lon = rnd.uniform(-180.0, 180.0)
+        ndigits = rnd.choice([0, 1, 2, 3])
+        ld, lm, ls, lmm = split(lat, ndigits)
+        od, om, os, omm = split(lon, ndigits)
+        coords.append(dict(
+            lat=lat, lon=lon, alat=abs(lat), alon=abs(lon),
+            ns='N' if lat >= 0 else 'S', ew='E' if lon >= 0 else 'W',
+            ld=ld, lm=lm, ls=ls, lsi=int(ls), lmm=lmm,
+            od=od, om=om, os=os, osi=int(os), omm=omm))
+    return coords
+
+
+def runLegacy(strings):
+    out = []
+    for s in strings:
+        try:
+            out.append(legacyParseDMSString(s))
+        except ValueError:
+            out.append(None)
+    return out
+
+
+def runTokenizer(strings):
+    out = []
+    for s in strings:
+        lat, lon, error = dms.tryParseDMSString(s)
+        out.append(None if error is not None else (lat, lon))
+    return out
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    coords = sampleCoordinates(count)
+    print('{} strings per format'.format(count))
+    print('{:<26} {:>12} {:>12} {:>8} {:>8}'.format(
+        'format', 'old str/s', 'new str/s', 'speedup', 'differ'))
+    t_old = t_new = 0.0
+    for name, fmt in FORMATS:
+        strings = [fmt(c) for c in coords]
+        old, old_time = timed(runLegacy, strings)
+        new, new_time = timed(runTokenizer, strings)
+        t_old += old_time
+        t_new += new_time
+        differ = sum(1 for a, b in zip(old, new) if a != b)
+        print('{:<26} {:>12.0f} {:>12.0f} {:>7.2f}x {:>8}'.format(
+            name, count / old_time, count / new_time, old_time / new_time, differ))
+    total = count * len(FORMATS)
+    print('{:<26} {:>12.0f} {:>12.0f} {:>7.2f}x'.format(
+        'all', total / t_old, total / t_new, t_old / t_new))
+
+
+if __name__ == '__main__':
+    main()
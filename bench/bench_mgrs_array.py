@@ -0,0 +1,80 @@
+"""
+Compares mgrs.toMgrsArray/toWgsArray with calling toMgrs/toWgs once per point.
+
+The scalar functions, and toWgsArray with exact=True, are timed on at most
+SCALAR_LIMIT points and their throughput is extrapolated for the larger
+sizes. The array results are checked
+against the scalar results for the timed points: the strings and the exact
+decoding must be identical, for the default decoding the largest difference
+in degrees is shown.
+
+Usage: python bench/bench_mgrs_array.py [sizes...]
+"""
+import sys
+import time
+
+import numpy as np
+
+from _plugin import load
+
+mgrs = load('core.mgrs')
+
+SCALAR_LIMIT = 20000
+
+
+def samplePoints(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-90.0, 90.0, count), rng.uniform(-180.0, 180.0, count)
+
+
+def scalarToMgrs(lat, lon):
+    return [mgrs.toMgrs(y, x, 5) for y, x in zip(lat.tolist(), lon.tolist())]
+
+
+def scalarToWgs(strings):
+    return [mgrs.toWgs(s) for s in strings]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(float(s)) for s in sys.argv[1:]] or [1000, 100000, 10000000]
+    print('backend: {}'.format(mgrs.getBackend()))
+    print('{:>10} {:>8} {:>14} {:>14} {:>9} {:>9}'.format(
+        'points', 'func', 'scalar pts/s', 'array pts/s', 'speedup', 'identical'))
+    for count in sizes:
+        lat, lon = samplePoints(count)
+        n = min(count, SCALAR_LIMIT)
+
+        strings, t_array = timed(mgrs.toMgrsArray, lat, lon, 5)
+        ref, t_scalar = timed(scalarToMgrs, lat[:n], lon[:n])
+        same = strings[:n].tolist() == ref
+        print('{:>10} {:>8} {:>14.0f} {:>14.0f} {:>8.1f}x {:>9}'.format(
+            count, 'toMgrs', n / t_scalar, count / t_array,
+            (t_scalar / n) / (t_array / count), str(same)))
+
+        for exact in (False, True):
+            # exact=True still projects point by point, only time a sample
+            sample = strings[:n] if exact else strings
+            (la, lo), t_array = timed(mgrs.toWgsArray, sample, exact=exact)
+            ref, t_scalar = timed(scalarToWgs, strings[:n].tolist())
+            ref = np.array(ref)
+            if exact:
+                same = (np.array_equal(la[:n], ref[:, 0]) and
+                        np.array_equal(lo[:n], ref[:, 1]))
+            else:
+                same = '{:.1e}'.format(max(np.abs(la[:n] - ref[:, 0]).max(),
+                                           np.abs(lo[:n] - ref[:, 1]).max()))
+            print('{:>10} {:>8} {:>14.0f} {:>14.0f} {:>8.1f}x {:>9}'.format(
+                count, 'toWgs' + ('*' if exact else ''), n / t_scalar,
+                sample.size / t_array, (t_scalar / n) / (t_array / sample.size),
+                str(same)))
+    print('* exact=True')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Compares the native Transverse Mercator engine in core/tmerc.py with the
+projection backends used by the plugin: osgeo.osr, pyproj and QGIS. Each
+backend that can be imported is timed on the same set of random points and the
+maximum difference from the native results is reported in meters for the
+forward direction and in degrees for the inverse.
+
+Usage: python bench/bench_tmerc.py [number of points]
+"""
+import random
+import sys
+import time
+
+from _plugin import load
+
+tmerc = load('core.tmerc')
+
+
+def samplePoints(count, seed=1):
+    """ Returns random (lat, lon, zone, hemisphere) tuples within the UTM zones
+    """
+    rnd = random.Random(seed)
+    points = []
+    for _ in range(count):
+        lat = rnd.uniform(-80.0, 84.0)
+        lon = rnd.uniform(-180.0, 180.0)
+        zone = min(int((lon + 180) / 6) + 1, 60)
+        hemisphere = 'N' if lat >= 0 else 'S'
+        points.append((lat, lon, zone, hemisphere))
+    return points
+
+
+def epsgCode(zone, hemisphere):
+    return (32600 if hemisphere == 'N' else 32700) + zone
+
+
+def nativeForward(points):
+    return [tmerc.toUtm(lat, lon, zone, hemisphere) for lat, lon, zone, hemisphere in points]
+
+
+def nativeInverse(points, utm):
+    return [tmerc.fromUtm(e, n, zone, hemisphere) for (_, _, zone, hemisphere), (e, n) in zip(points, utm)]
+
+
+def pyprojBackend():
+    try:
+        from pyproj import Transformer
+    except ImportError:
+        return None
+    cache = {}
+
+    def get(epsg, inverse):
+        key = (epsg, inverse)
+        if key not in cache:
+            if inverse:
+                cache[key] = Transformer.from_crs(epsg, 4326, always_xy=True)
+            else:
+                cache[key] = Transformer.from_crs(4326, epsg, always_xy=True)
+        return cache[key]
+
+    def forward(points):
+        return [get(epsgCode(zone, hemisphere), False).transform(lon, lat)
+                for lat, lon, zone, hemisphere in points]
+
+    def inverse(points, utm):
+        out = []
+        for (_, _, zone, hemisphere), (e, n) in zip(points, utm):
+            lon, lat = get(epsgCode(zone, hemisphere), True).transform(e, n)
+            out.append((lat, lon))
+        return out
+    return forward, inverse
+
+
+def osrBackend():
+    try:
+        from osgeo import osr
+    except ImportError:
+        return None
+    wgs = osr.SpatialReference()
+    wgs.ImportFromEPSG(4326)
+    wgs.SetAxisMappingStrategy(osr.OAMS_TRADITIONAL_GIS_ORDER)
+    cache = {}
+
+    def get(epsg, inverse):
+        key = (epsg, inverse)
+        if key not in cache:
+            utm = osr.SpatialReference()
+            utm.ImportFromEPSG(epsg)
+            if inverse:
+                cache[key] = osr.CoordinateTransformation(utm, wgs)
+            else:
+                cache[key] = osr.CoordinateTransformation(wgs, utm)
+        return cache[key]
+
+    def forward(points):
+        return [get(epsgCode(zone, hemisphere), False).TransformPoint(lon, lat)[:2]
+                for lat, lon, zone, hemisphere in points]
+
+    def inverse(points, utm):
+        out = []
+        for (_, _, zone, hemisphere), (e, n) in zip(points, utm):
+            lon, lat = get(epsgCode(zone, hemisphere), True).TransformPoint(e, n)[:2]
+            out.append((lat, lon))
+        return out
+    return forward, inverse
+
+
+def qgisBackend():
+    try:
+        from qgis.core import (QgsCoordinateReferenceSystem, QgsCoordinateTransform,
+                               QgsPointXY, QgsProject)
+    except ImportError:
+        return None
+    wgs = QgsCoordinateReferenceSystem('EPSG:4326')
+    cache = {}
+
+    def get(epsg, inverse):
+        key = (epsg, inverse)
+        if key not in cache:
+            utm = QgsCoordinateReferenceSystem('EPSG:{}'.format(epsg))
+            if inverse:
+                cache[key] = QgsCoordinateTransform(utm, wgs, QgsProject.instance())
+            else:
+                cache[key] = QgsCoordinateTransform(wgs, utm, QgsProject.instance())
+        return cache[key]
+
+    def forward(points):
+        out = []
+        for lat, lon, zone, hemisphere in points:
+            pt = get(epsgCode(zone, hemisphere), False).transform(QgsPointXY(lon, lat))
+            out.append((pt.x(), pt.y()))
+        return out
+
+    def inverse(points, utm):
+        out = []
+        for (_, _, zone, hemisphere), (e, n) in zip(points, utm):
+            pt = get(epsgCode(zone, hemisphere), True).transform(QgsPointXY(e, n))
+            out.append((pt.y(), pt.x()))
+        return out
+    return forward, inverse
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def maxDiff(a, b):
+    return max(max(abs(p[0] - q[0]), abs(p[1] - q[1])) for p, q in zip(a, b))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    points = samplePoints(count)
+
+    utm, t_fwd = timed(nativeForward, points)
+    wgs, t_inv = timed(nativeInverse, points, utm)
+    print('{} points'.format(count))
+    print('{:<8} {:>14} {:>14} {:>14} {:>14}'.format(
+        'backend', 'fwd pts/s', 'inv pts/s', 'fwd err (m)', 'inv err (deg)'))
+    print('{:<8} {:>14.0f} {:>14.0f} {:>14} {:>14}'.format(
+        'native', count / t_fwd, count / t_inv, '-', '-'))
+
+    backends = (('pyproj', pyprojBackend), ('osr', osrBackend), ('qgis', qgisBackend))
+    for name, factory in backends:
+        backend = factory()
+        if backend is None:
+            print('{:<8} not available'.format(name))
+            continue
+        forward, inverse = backend
+        b_utm, b_fwd = timed(forward, points)
+        b_wgs, b_inv = timed(inverse, points, utm)
+        print('{:<8} {:>14.0f} {:>14.0f} {:>14.3e} {:>14.3e}'.format(
+            name, count / b_fwd, count / b_inv, maxDiff(utm, b_utm), maxDiff(wgs, b_wgs)))
+
+
+if __name__ == '__main__':
+    main()
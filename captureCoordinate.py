@@ -1,9 +1,10 @@
 from qgis.PyQt.QtCore import Qt, pyqtSignal
 from qgis.PyQt.QtGui import QColor
 from qgis.PyQt.QtCore import pyqtSlot
-from qgis.core import QgsCoordinateTransform, QgsPointXY, QgsProject, QgsSettings
+from qgis.core import QgsPointXY, QgsSettings
 from qgis.gui import QgsMapToolEmitPoint, QgsVertexMarker
 from .util import epsg4326
+from . import transformCache
 
 class CaptureCoordinate(QgsMapToolEmitPoint):
     '''Class to interact with the map canvas to capture the coordinate
@@ -53,7 +54,7 @@ class CaptureCoordinate(QgsMapToolEmitPoint):
 
         try:
             canvasCRS = self.canvas.mapSettings().destinationCrs()
-            transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+            transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
             pt4326 = transform.transform(pt.x(), pt.y())
             self.capturePoint.emit(pt4326)
         except Exception as e:
@@ -1,14 +1,15 @@
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtWidgets import QApplication
-from qgis.core import Qgis, QgsCoordinateTransform, QgsCoordinateReferenceSystem, QgsProject
+from qgis.core import Qgis, QgsCoordinateReferenceSystem
 from qgis.gui import QgsMapToolExtent
 # import traceback
 from .util import epsg4326
+from . import transformCache
 from .settings import settings, CopyExtent
 
 def getExtentString(bbox, src_crs, dst_crs):
     if src_crs != dst_crs:
-        transform = QgsCoordinateTransform(src_crs, dst_crs, QgsProject.instance())
+        transform = transformCache.coordinateTransform(src_crs, dst_crs)
         bbox = transform.transformBoundingBox(bbox)
     delim = settings.bBoxDelimiter
     prefix = settings.bBoxPrefix
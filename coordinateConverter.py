@@ -5,19 +5,21 @@ from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QDockWidget, QMenu, QApplication
 from qgis.PyQt.QtCore import pyqtSlot
 from qgis.PyQt.uic import loadUiType
-from qgis.core import QgsCoordinateTransform, QgsPoint, QgsPointXY, QgsProject
+from qgis.core import QgsPoint, QgsPointXY
 from .util import epsg4326, parseDMSString, formatDmsString
+from . import transformCache
 # import traceback
 
 from .captureCoordinate  import CaptureCoordinate
 from .settings import settings
-from . import mgrs
-from . import olc
-from .utm import latLon2Utm, isUtm, utm2Point
+from .core import mgrs
+from .core import olc
+from . import utm
+from .utm import latLon2Utm, utm2Point
 from .ups import latLon2Ups, ups2Point
-from . import geohash
-from . import maidenhead
-from . import georef
+from .core import geohash
+from .core import maidenhead
+from .core import georef
 
 FORM_CLASS, _ = loadUiType(os.path.join(
     os.path.dirname(__file__), 'ui/coordinateConverter.ui'))
@@ -180,7 +182,7 @@ class CoordinateConverterWidget(QDockWidget, FORM_CLASS):
         if crs == epsg4326:
             pt4326 = pt
         else:
-            trans = QgsCoordinateTransform(crs, epsg4326, QgsProject.instance())
+            trans = transformCache.coordinateTransform(crs, epsg4326)
             pt4326 = trans.transform(pt.x(), pt.y())
         if id != 0:  # WGS 84
             if self.inputXYOrder == 0:  # Y, X
@@ -193,7 +195,7 @@ class CoordinateConverterWidget(QDockWidget, FORM_CLASS):
                 if crs == projCRS:
                     newpt = pt
                 else:
-                    trans = QgsCoordinateTransform(crs, projCRS, QgsProject.instance())
+                    trans = transformCache.coordinateTransform(crs, projCRS)
                     newpt = trans.transform(pt.x(), pt.y())
                 if projCRS == epsg4326:
                     precision = settings.converter4326DDPrec
@@ -211,7 +213,7 @@ class CoordinateConverterWidget(QDockWidget, FORM_CLASS):
                 if crs == customCRS:
                     newpt = pt
                 else:
-                    trans = QgsCoordinateTransform(crs, customCRS, QgsProject.instance())
+                    trans = transformCache.coordinateTransform(crs, customCRS)
                     newpt = trans.transform(pt.x(), pt.y())
                 if customCRS == epsg4326:
                     precision = settings.converter4326DDPrec
@@ -356,8 +358,9 @@ class CoordinateConverterWidget(QDockWidget, FORM_CLASS):
 
     def commitUtm(self):
         text = self.utmLineEdit.text().strip()
-        if isUtm(text):
-            pt = utm2Point(text, epsg4326)
+        coord = utm.tryParse(text)
+        if coord is not None:
+            pt = utm2Point(coord, epsg4326)
             self.updateCoordinates(6, QgsPoint(pt), epsg4326)
         else:
             self.showInvalid(6)
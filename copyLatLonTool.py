@@ -1,18 +1,19 @@
 from qgis.PyQt.QtCore import Qt, pyqtSignal
 from qgis.PyQt.QtGui import QColor
 from qgis.PyQt.QtWidgets import QApplication
-from qgis.core import Qgis, QgsCoordinateTransform, QgsPointXY, QgsProject, QgsSettings
+from qgis.core import Qgis, QgsPointXY, QgsSettings
 from qgis.gui import QgsMapToolEmitPoint, QgsVertexMarker
 
 from .settings import settings, CoordOrder
 from .util import epsg4326, formatDmsString
+from . import transformCache
 from .utm import latLon2Utm
 from .ups import latLon2Ups
-from . import mgrs
-from . import olc
-from . import geohash
-from . import maidenhead
-from . import georef
+from .core import mgrs
+from .core import olc
+from .core import geohash
+from .core import maidenhead
+from .core import georef
 # import traceback
 
 class CopyLatLonTool(QgsMapToolEmitPoint):
@@ -48,7 +49,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             lat = pt4326.y()
             lon = pt4326.x()
@@ -80,7 +81,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             # Projection is a custom CRS
             canvasCRS = self.canvas.mapSettings().destinationCrs()
             customCRS = self.settings.captureCustomCRS()
-            transform = QgsCoordinateTransform(canvasCRS, customCRS, QgsProject.instance())
+            transform = transformCache.coordinateTransform(canvasCRS, customCRS)
             pt = transform.transform(pt.x(), pt.y())
             if self.settings.otherNumberFormat == 0:  # Numerical
                 if self.settings.coordOrder == CoordOrder.OrderYX:
@@ -95,7 +96,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             try:
                 msg = mgrs.toMgrs(pt4326.y(), pt4326.x())
@@ -108,7 +109,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             try:
                 msg = olc.encode(pt4326.y(), pt4326.x(), self.settings.plusCodesLength)
@@ -120,7 +121,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             msg = latLon2Utm(pt4326.y(), pt4326.x(), settings.captureUtmPrecision, settings.captureUtmFormat)
             if msg == '':
@@ -131,7 +132,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             msg = latLon2Ups(pt4326.y(), pt4326.x(), settings.captureUpsPrecision, settings.captureUpsFormat)
             if msg == '':
@@ -142,7 +143,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             msg = geohash.encode(pt4326.y(), pt4326.x(), settings.captureGeohashPrecision)
             if msg == '':
@@ -153,7 +154,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             try:
                 msg = maidenhead.toMaiden(pt4326.y(), pt4326.x(), precision=settings.captureMaidenheadPrecision)
@@ -165,7 +166,7 @@ class CopyLatLonTool(QgsMapToolEmitPoint):
             if canvasCRS == epsg4326:
                 pt4326 = pt
             else:
-                transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+                transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
                 pt4326 = transform.transform(pt.x(), pt.y())
             try:
                 msg = georef.encode(pt4326.y(), pt4326.x(), settings.captureGeorefPrecision)
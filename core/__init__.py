@@ -0,0 +1,10 @@
+"""
+Coordinate codecs that do not depend on QGIS or Qt: DMS parsing and
+formatting, MGRS, UTM, UPS, Plus codes, geohash, Maidenhead and GEOREF, and
+the projection engines and transformation backends they use.
+
+The modules can be imported in worker processes, batch jobs and benchmarks
+without a QGIS application. The QGIS specific parts, such as creating
+QgsPointXY objects or transforming to other CRS, are in the modules of the
+plugin package.
+"""
@@ -0,0 +1,229 @@
+"""
+Conversion of coordinate columns of Apache Arrow record batches, Parquet
+files and Arrow IPC files. The columns are decoded and encoded with the
+Decoder and Encoder of convert, so the options are those of the Field2Geom
+and Geom2Field algorithms and the strings are the same.
+
+Latitude and longitude columns with numbers go to the array functions as
+NumPy views of the Arrow buffers and the string arrays they return become
+Arrow arrays in one step. String columns are trimmed with Arrow compute and
+copied from the Arrow buffers into NumPy string arrays. Plus codes, geohash,
+Maidenhead and GEOREF strings are then decoded, and MGRS, plus code,
+geohash, Maidenhead and GEOREF fields encoded, without a Python object for
+every row. The other formats still make one for every row: the coordinates,
+latlon, lonlat, MGRS, UTM and UPS inputs are parsed string by string, the
+decimal degree, GeoJSON and WKT fields are formatted with np.char.mod, and
+the DMS, UTM and UPS fields point by point. Files are read and written one
+record batch at a time.
+
+Requires pyarrow and NumPy.
+"""
+try:
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+from .convert import ConvertException
+
+# Maximum number of rows in the record batches read from files
+BATCH_SIZE = 65536
+
+FILE_FORMATS = ('parquet', 'arrow')
+
+# Longest ASCII strings copied straight from the Arrow buffers
+MAX_STRING_WIDTH = 64
+
+
+def _requirePyarrow():
+    if not HAVE_PYARROW:
+        raise ConvertException('The Arrow conversion requires pyarrow and NumPy.')
+
+
+def _floats(column):
+    """ Returns a numeric column as a float64 NumPy array with NaN for nulls,
+    or None for other columns
+    """
+    t = column.type
+    if not (pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t)):
+        return None
+    column = pc.fill_null(pc.cast(column, pa.float64()), float('nan'))
+    return column.to_numpy(zero_copy_only=False)
+
+
+def _strings(column):
+    """ Returns a column as a NumPy array of stripped strings, empty for
+    nulls. ASCII strings of up to MAX_STRING_WIDTH characters are copied from
+    the Arrow buffers into a fixed width array, other columns go through a
+    Python str for every row.
+    """
+    column = pc.utf8_trim_whitespace(pc.fill_null(pc.cast(column, pa.string()), ''))
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    n = len(column)
+    _, offsetBuffer, dataBuffer = column.buffers()
+    offsets = np.frombuffer(offsetBuffer, dtype=np.int32)[column.offset:column.offset + n + 1]
+    lengths = np.diff(offsets)
+    width = int(lengths.max()) if n else 0
+    if width == 0:
+        return np.full(n, '', dtype='U1')
+    data = np.frombuffer(dataBuffer, dtype=np.uint8)[offsets[0]:offsets[-1]]
+    if width > MAX_STRING_WIDTH or (data > 127).any():
+        return column.to_numpy(zero_copy_only=False)
+    index = (offsets[:-1] - offsets[0])[:, None] + np.arange(width)
+    inside = np.arange(width) < lengths[:, None]
+    chars = np.where(inside, data[np.where(inside, index, 0)], 0).astype(np.uint8)
+    return chars.view('S{}'.format(width)).ravel().astype('U{}'.format(width))
+
+
+def outputSchema(schema, encoder, names, select=None):
+    """ Returns the schema of the batches made by convertBatch
+
+    @param schema - schema of the input batches
+    @param encoder - convert.Encoder, or None for float64 latitudes and
+        longitudes
+    @param names - names of the new fields
+    @param select - names of the input columns to keep, None for all
+    @returns - pyarrow.Schema
+    """
+    _requirePyarrow()
+    keep = schema.names if select is None else select
+    missing = [name for name in keep if name not in schema.names]
+    if missing:
+        raise ConvertException('Columns not found: {}'.format(', '.join(missing)))
+    valueType = pa.float64() if encoder is None else pa.string()
+    fields = [schema.field(name) for name in keep if name not in names]
+    return pa.schema(fields + [pa.field(name, valueType) for name in names])
+
+
+def convertBatch(batch, decoder, encoder, columns, names, schema):
+    """ Converts the coordinate columns of a record batch. Latitude and
+    longitude columns with numbers are used as they are, other columns are
+    decoded as strings.
+
+    @param batch - pyarrow.RecordBatch
+    @param decoder - convert.Decoder for the input columns
+    @param encoder - convert.Encoder for the new fields, or None for the
+        latitudes and longitudes as float64 fields
+    @param columns - names of the decoder's input columns
+    @param names - names of the new fields
+    @param schema - output schema from outputSchema
+    @returns - tuple of a RecordBatch of the converted rows with schema and
+        a RecordBatch of the input rows that cannot be converted
+    """
+    inputs = [batch.column(name) for name in columns]
+    floats = [_floats(column) for column in inputs] if decoder.fieldType == 0 else [None]
+    if floats[0] is not None and floats[1] is not None:
+        lat, lon = floats
+    else:
+        lat, lon = decoder.decodeArrays(*[_strings(column) for column in inputs])
+
+    if encoder is None:
+        values = [lat, lon]
+        valid = np.isfinite(lat) & np.isfinite(lon)
+    else:
+        values = encoder.encodeArrays(lat, lon)
+        valid = values[0] != ''
+    arrays = [batch.column(field.name) for field in schema if field.name not in names]
+    arrays += [pa.array(value, type=schema.field(name).type) for name, value in zip(names, values)]
+    out = pa.RecordBatch.from_arrays(arrays, schema=schema)
+    if valid.all():
+        return out, batch.slice(0, 0)
+    mask = pa.array(valid)
+    return out.filter(mask), batch.filter(pc.invert(mask))
+
+
+def readBatches(source, fileFormat, batchSize=BATCH_SIZE):
+    """ Opens a Parquet or Arrow IPC file or stream
+
+    @param source - path or binary file object
+    @param fileFormat - 'parquet' or 'arrow'
+    @param batchSize - maximum number of rows in a batch
+    @returns - tuple of the schema and an iterator over the record batches
+    """
+    _requirePyarrow()
+    if fileFormat == 'parquet':
+        f = pq.ParquetFile(source)
+        return f.schema_arrow, f.iter_batches(batch_size=batchSize)
+    reader = None
+    if isinstance(source, str):
+        try:
+            reader = pa.ipc.open_file(source)
+        except pa.ArrowInvalid:
+            pass
+    if reader is not None:
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        reader = pa.ipc.open_stream(source)
+        batches = iter(reader)
+
+    def sliced():
+        for batch in batches:
+            for offset in range(0, batch.num_rows, batchSize):
+                yield batch.slice(offset, batchSize)
+    return reader.schema, sliced()
+
+
+def openWriter(sink, fileFormat, schema):
+    """ Returns a writer of record batches to a Parquet file or an Arrow IPC
+    stream, with write_batch and close methods
+
+    @param sink - path or binary file object
+    @param fileFormat - 'parquet' or 'arrow'
+    @param schema - schema of the batches
+    """
+    _requirePyarrow()
+    if fileFormat == 'parquet':
+        return pq.ParquetWriter(sink, schema)
+    return pa.ipc.new_stream(sink, schema)
+
+
+def convertFile(source, destination, decoder, encoder, columns, names, select=None,
+                rejects=None, inputFormat='parquet', outputFormat=None, batchSize=BATCH_SIZE):
+    """ Converts the coordinate columns of a Parquet or Arrow IPC file one
+    record batch at a time
+
+    @param source - path or binary file object of the input
+    @param destination - path or binary file object of the output
+    @param decoder - convert.Decoder for the input columns
+    @param encoder - convert.Encoder for the new fields, or None for float64
+        latitudes and longitudes
+    @param columns - names of the decoder's input columns
+    @param names - names of the new fields
+    @param select - names of the input columns to keep, None for all
+    @param rejects - path or binary file object for the rows that cannot be
+        converted, written in the input format
+    @param inputFormat - 'parquet' or 'arrow'
+    @param outputFormat - 'parquet' or 'arrow', the input format if None
+    @param batchSize - maximum number of rows converted at once
+    @returns - tuple of the number of rows read and rejected
+    """
+    schema, batches = readBatches(source, inputFormat, batchSize)
+    missing = [name for name in columns if name not in schema.names]
+    if missing:
+        raise ConvertException('Columns not found: {}'.format(', '.join(missing)))
+    if len(columns) != decoder.fieldCount:
+        raise ConvertException('The input format takes {} column(s)'.format(decoder.fieldCount))
+    outSchema = outputSchema(schema, encoder, names, select)
+    writer = openWriter(destination, outputFormat or inputFormat, outSchema)
+    rejectWriter = None
+    rows = 0
+    rejected = 0
+    try:
+        if rejects is not None:
+            rejectWriter = openWriter(rejects, inputFormat, schema)
+        for batch in batches:
+            good, bad = convertBatch(batch, decoder, encoder, columns, names, outSchema)
+            writer.write_batch(good)
+            if rejectWriter is not None and bad.num_rows:
+                rejectWriter.write_batch(bad)
+            rows += batch.num_rows
+            rejected += bad.num_rows
+    finally:
+        writer.close()
+        if rejectWriter is not None:
+            rejectWriter.close()
+    return rows, rejected
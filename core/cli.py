@@ -0,0 +1,368 @@
+"""
+Command line conversion of coordinate columns in CSV, newline delimited JSON
+(NDJSON), Parquet and Arrow IPC files, without QGIS. The plugin directory is run as a module:
+
+    python -m latlontools --from mgrs --columns grid --to geohash < in.csv > out.csv
+
+The input columns are decoded like the Field2Geom algorithm decodes fields
+and the coordinates encoded like the Geom2Field algorithm, so --from and --to
+take the names of their options, see convert.DECODE_FORMATS and
+convert.ENCODE_FORMATS. The new fields are added to every row, after the
+input columns or the ones chosen with --select.
+
+Rows are read, converted and written CHUNK_SIZE at a time, so memory use
+does not grow with the input. Rows that cannot be converted are left out of
+the output and can be written unchanged to a file of their own with
+--rejects. When the input is done the number of rows and the rate are
+written to standard error.
+
+Parquet and Arrow files are converted with the arrow module, a record batch
+at a time, and can only be converted to each other. Arrow files are written
+in the IPC stream format so they can be piped.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from . import arrow
+from . import transformBackends
+from .convert import (
+    ENCODE_FORMATS, DECODE_FORMATS, NUMBER_FORMATS, ConvertException, Encoder, Decoder)
+
+# Number of rows converted at once
+CHUNK_SIZE = 10000
+
+FILE_FORMATS = ('csv', 'ndjson') + arrow.FILE_FORMATS
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value.strip()
+    return str(value)
+
+
+class CsvReader(object):
+    """ Reads the rows of a CSV file with a header line as dictionaries
+    """
+
+    def __init__(self, f, separator=','):
+        self.reader = csv.reader(f, delimiter=separator)
+        self.fields = next(self.reader, [])
+
+    def read(self, count):
+        """ Returns a list of up to count (record, original row) pairs
+        """
+        fields = self.fields
+        return [(dict(zip(fields, row)), row) for row in islice(self.reader, count)]
+
+
+class NdjsonReader(object):
+    """ Reads the objects of a file with one JSON object on each line. A line
+    that is not an object gives an empty record.
+    """
+
+    def __init__(self, f):
+        self.lines = (line for line in f if line.strip())
+        self.fields = None
+
+    def read(self, count):
+        """ Returns a list of up to count (record, original line) pairs
+        """
+        out = []
+        for line in islice(self.lines, count):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            out.append((record if isinstance(record, dict) else {}, line))
+        return out
+
+
+class CsvWriter(object):
+    """ Writes records as CSV rows, the header line with the first chunk
+    """
+
+    def __init__(self, f, separator=','):
+        self.f = f
+        self.separator = separator
+        self.writer = None
+
+    def write(self, fields, records):
+        if self.writer is None:
+            self.writer = csv.DictWriter(
+                self.f, fields, restval='', extrasaction='ignore',
+                delimiter=self.separator, lineterminator='\n')
+            self.writer.writeheader()
+        self.writer.writerows(records)
+
+
+class NdjsonWriter(object):
+    """ Writes records as one JSON object on each line
+    """
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, fields, records):
+        dumps = json.dumps
+        if fields is None:
+            self.f.writelines(dumps(r, ensure_ascii=False) + '\n' for r in records)
+        else:
+            self.f.writelines(
+                dumps({k: r.get(k) for k in fields}, ensure_ascii=False) + '\n' for r in records)
+
+
+class RejectWriter(object):
+    """ Writes rejected rows the way they were read
+    """
+
+    def __init__(self, f, fileFormat, header, separator=','):
+        self.f = f
+        self.writer = None
+        if fileFormat == 'csv':
+            self.writer = csv.writer(f, delimiter=separator, lineterminator='\n')
+            self.writer.writerow(header)
+
+    def write(self, originals):
+        if self.writer is not None:
+            self.writer.writerows(originals)
+        else:
+            self.f.writelines(line if line.endswith('\n') else line + '\n' for line in originals)
+
+
+def convertStream(reader, writer, decoder, encoder, columns, names, select=None,
+                  rejects=None, chunkSize=CHUNK_SIZE):
+    """ Converts the rows of reader chunkSize at a time and writes them to
+    writer
+
+    @param reader - CsvReader or NdjsonReader
+    @param writer - CsvWriter or NdjsonWriter
+    @param decoder - convert.Decoder for the input columns
+    @param encoder - convert.Encoder for the new fields
+    @param columns - names of the decoder's input columns
+    @param names - names of the encoder's new fields
+    @param select - names of the input columns to copy, None for all
+    @param rejects - RejectWriter for the rows that cannot be converted
+    @param chunkSize - number of rows converted at once
+    @returns - tuple of the number of rows read and rejected
+    """
+    fields = select
+    if fields is None and reader.fields is not None:
+        fields = reader.fields
+    outFields = None
+    rows = 0
+    rejected = 0
+    while True:
+        chunk = reader.read(chunkSize)
+        if not chunk:
+            break
+        records = [record for record, _ in chunk]
+        if outFields is None:
+            if fields is None and isinstance(writer, CsvWriter):
+                # Without a header the first NDJSON record gives the columns
+                fields = list(records[0])
+            if fields is not None:
+                outFields = [f for f in fields if f not in names] + list(names)
+        texts = [[_text(r.get(c)) for r in records] for c in columns]
+        lat, lon = decoder.decode(*texts)
+        values = encoder.encode(lat, lon)
+        good = []
+        bad = []
+        for i, msg in enumerate(values[0]):
+            if msg:
+                record = records[i] if select is None else {k: records[i].get(k) for k in select}
+                for name, column in zip(names, values):
+                    record[name] = column[i]
+                good.append(record)
+            else:
+                bad.append(chunk[i][1])
+        writer.write(outFields, good)
+        if rejects is not None and bad:
+            rejects.write(bad)
+        rows += len(chunk)
+        rejected += len(bad)
+    return rows, rejected
+
+
+def _open(path, mode):
+    if path == '-':
+        stream = sys.stdin if mode == 'r' else sys.stdout
+        return open(stream.fileno(), mode, encoding='utf-8', newline='', closefd=False)
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _names(value):
+    return [v.strip() for v in value.split(',')] if value else None
+
+
+def _fileFormat(path):
+    path = path.lower()
+    if path.endswith(('.ndjson', '.jsonl', '.json')):
+        return 'ndjson'
+    if path.endswith(('.parquet', '.pq')):
+        return 'parquet'
+    if path.endswith(('.arrow', '.arrows', '.feather', '.ipc')):
+        return 'arrow'
+    return 'csv'
+
+
+def buildParser(prog=None):
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Convert coordinate columns of CSV, NDJSON, Parquet or Arrow files without QGIS.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='input file, standard input if missing or -')
+    parser.add_argument('-o', '--output', default='-',
+                        help='output file, standard output by default')
+    parser.add_argument('--rejects',
+                        help='file for the rows that cannot be converted, in the input format')
+    parser.add_argument('--input-format', choices=FILE_FORMATS,
+                        help='format of the input, by default from the file extension or csv')
+    parser.add_argument('--output-format', choices=FILE_FORMATS,
+                        help='format of the output, by default from the file extension or the input format')
+    parser.add_argument('--separator', default=',',
+                        help='CSV field separator, a comma by default')
+    parser.add_argument('-f', '--from', dest='source', choices=DECODE_FORMATS, default='coordinates2',
+                        help='format of the input columns, by default latitude and longitude '
+                        'in two columns')
+    parser.add_argument('-c', '--columns',
+                        help='comma separated input columns, lat,lon by default for coordinates2')
+    parser.add_argument('-t', '--to', dest='target', choices=ENCODE_FORMATS, required=True,
+                        help='format of the new fields')
+    parser.add_argument('-n', '--names',
+                        help='comma separated names of the new fields, y,x for coordinates2 and '
+                        'the format name for the others by default')
+    parser.add_argument('-s', '--select',
+                        help='comma separated input columns copied to the output, all by default')
+    parser.add_argument('--number-format', choices=NUMBER_FORMATS, default='dd',
+                        help='number format of coordinates2 and coordinates')
+    parser.add_argument('-p', '--precision', type=int,
+                        help='decimals, code length or precision of the new fields, '
+                        'the default of the processing algorithm if missing')
+    parser.add_argument('--order', choices=('latlon', 'lonlat'), default='latlon',
+                        help='coordinate order of coordinates')
+    parser.add_argument('--delimiter', default=',',
+                        help='text between the two values of coordinates')
+    parser.add_argument('--dms-space', action='store_true',
+                        help='add a space between D M S and D M.MM parts')
+    parser.add_argument('--pad-zeros', action='store_true',
+                        help='pad D M S and D M.MM numbers with leading zeros')
+    parser.add_argument('--backend', choices=transformBackends.backendNames(),
+                        help='transformation backend for UTM, UPS and MGRS')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='number of rows converted at once')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not report the number of rows and the rate')
+    return parser
+
+
+def _encoder(args):
+    outputFormat = ENCODE_FORMATS.index(args.target)
+    wgs84Format = NUMBER_FORMATS.index(args.number_format)
+    options = {}
+    if args.precision is not None:
+        if outputFormat <= 1 and wgs84Format != 0:
+            options['dmsPrecision'] = args.precision
+        else:
+            option = {4: 'mgrsPrecision', 5: 'plusCodesLength', 6: 'geohashPrecision',
+                      7: 'dmsPrecision', 8: 'maidenPrecision', 9: 'upsPrecision',
+                      10: 'georefPrecision'}.get(outputFormat, 'decimalPrecision')
+            options[option] = args.precision
+    return Encoder(
+        outputFormat, wgs84Format, coordOrder=0 if args.order == 'latlon' else 1,
+        delimiter=args.delimiter, useDmsSpace=args.dms_space, padZeros=args.pad_zeros,
+        **options)
+
+
+def _convertText(args, inputFormat, outputFormat, decoder, encoder, columns, names, select):
+    rejectFile = None
+    try:
+        with _open(args.input, 'r') as fin, _open(args.output, 'w') as fout:
+            if inputFormat == 'csv':
+                reader = CsvReader(fin, args.separator)
+                missing = [c for c in columns + (select or []) if c not in reader.fields]
+                if missing:
+                    raise ConvertException('Columns not found: {}'.format(', '.join(missing)))
+            else:
+                reader = NdjsonReader(fin)
+            if outputFormat == 'csv':
+                writer = CsvWriter(fout, args.separator)
+            else:
+                writer = NdjsonWriter(fout)
+            rejects = None
+            if args.rejects:
+                rejectFile = _open(args.rejects, 'w')
+                rejects = RejectWriter(rejectFile, inputFormat, reader.fields, args.separator)
+            return convertStream(
+                reader, writer, decoder, encoder, columns, names, select, rejects, args.chunk_size)
+    finally:
+        if rejectFile is not None:
+            rejectFile.close()
+
+
+def main(argv=None, prog=None):
+    """ Runs the converter with the command line arguments argv and returns
+    the exit status
+    """
+    parser = buildParser(prog)
+    args = parser.parse_args(argv)
+    decoder = Decoder(DECODE_FORMATS.index(args.source))
+    encoder = _encoder(args)
+
+    columns = _names(args.columns)
+    if columns is None:
+        if decoder.fieldCount == 1:
+            parser.error('--columns is required with --from {}'.format(args.source))
+        columns = ['lat', 'lon']
+    if len(columns) != decoder.fieldCount:
+        parser.error('--from {} takes {} column(s)'.format(args.source, decoder.fieldCount))
+    names = _names(args.names)
+    if names is None:
+        names = ['y', 'x'] if encoder.fieldCount == 2 else [args.target]
+    if len(names) != encoder.fieldCount:
+        parser.error('--to {} makes {} field(s)'.format(args.target, encoder.fieldCount))
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.backend:
+        transformBackends.setBackend(args.backend)
+
+    inputFormat = args.input_format or _fileFormat(args.input)
+    outputFormat = args.output_format
+    if outputFormat is None:
+        outputFormat = inputFormat if args.output == '-' else _fileFormat(args.output)
+    columnar = (inputFormat in arrow.FILE_FORMATS, outputFormat in arrow.FILE_FORMATS)
+    if columnar[0] != columnar[1]:
+        parser.error('CSV and NDJSON cannot be converted to or from Parquet or Arrow')
+    if inputFormat == 'parquet' and args.input == '-':
+        parser.error('Parquet input must be a file')
+    select = _names(args.select)
+    errors = (ConvertException, OSError, csv.Error)
+    if arrow.HAVE_PYARROW:
+        errors += (arrow.pa.ArrowException,)
+    start = time.perf_counter()
+    try:
+        if columnar[0]:
+            rows, rejected = arrow.convertFile(
+                sys.stdin.buffer if args.input == '-' else args.input,
+                sys.stdout.buffer if args.output == '-' else args.output,
+                decoder, encoder, columns, names, select, args.rejects,
+                inputFormat, outputFormat, args.chunk_size)
+        else:
+            rows, rejected = _convertText(
+                args, inputFormat, outputFormat, decoder, encoder, columns, names, select)
+    except BrokenPipeError:
+        # The reader of the output went away, e.g. head
+        return 1
+    except errors as e:
+        sys.stderr.write('{}: {}\n'.format(parser.prog, e))
+        return 1
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        sys.stderr.write('{}: {} rows, {} rejected, {:.2f} s, {:.0f} rows/s\n'.format(
+            parser.prog, rows, rejected, elapsed, rows / elapsed if elapsed > 0 else 0))
+    return 0
@@ -0,0 +1,330 @@
+"""
+Converters between WGS 84 latitudes and longitudes and the coordinate
+formats of the Geom2Field and Field2Geom processing algorithms, working on
+whole columns at a time.
+
+An Encoder turns columns of latitudes and longitudes into the string fields
+of one Geom2Field output format and a Decoder turns the string fields of one
+Field2Geom input type into latitudes and longitudes. The formats are numbered
+like the options of the algorithms and ENCODE_FORMATS and DECODE_FORMATS give
+them names. With NumPy the formats that have array functions are converted
+in bulk, the others point by point with the same functions the algorithms
+use, so the strings and coordinates are the same whichever way is taken.
+"""
+import math
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+from . import dms
+from . import mgrs
+from . import olc
+from . import geohash
+from . import utm
+from . import ups
+from . import maidenhead
+from . import georef
+
+# Names of the Geom2Field output formats, in the order of its options
+ENCODE_FORMATS = (
+    'coordinates2', 'coordinates', 'geojson', 'wkt', 'mgrs', 'pluscodes',
+    'geohash', 'utm', 'maidenhead', 'ups', 'georef')
+
+# Names of the Geom2Field number formats for WGS 84 coordinates
+NUMBER_FORMATS = ('dd', 'dms', 'ddm', 'ddmmss')
+
+# Names of the Field2Geom input field types, in the order of its options
+DECODE_FORMATS = (
+    'coordinates2', 'latlon', 'lonlat', 'mgrs', 'pluscodes', 'geohash',
+    'utm', 'maidenhead', 'ups', 'georef')
+
+
+class ConvertException(Exception):
+    pass
+
+
+def plusCodesCenters(codes):
+    '''Batch decoder returning the centers of full plus codes'''
+    area = olc.decodeArray(codes)
+    return area.latitudeCenter, area.longitudeCenter
+
+
+def _tolist(values):
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+def _parsePair(text, order):
+    lat, lon, error = dms.tryParseDMSString(text, order)
+    if error is not None:
+        raise error
+    return lat, lon
+
+
+def _plusCodeCenter(code):
+    area = olc.decode(code)
+    return area.latitudeCenter, area.longitudeCenter
+
+
+class Encoder(object):
+    """ Converts latitudes and longitudes to the strings of a Geom2Field
+    output format. The options have the meaning and defaults of the
+    algorithm parameters.
+
+    @param outputFormat - index of the format in ENCODE_FORMATS
+    @param wgs84Format - index of the number format in NUMBER_FORMATS
+    @param decimalPrecision - decimals of decimal degrees
+    @param dmsPrecision - decimals of the seconds, decimal minutes or UTM
+    @param coordOrder - 0 for Lat, Lon and 1 for Lon, Lat in one field
+    @param delimiter - text between the coordinates in one field
+    @param useDmsSpace - space between D M S and D M.MM parts
+    @param padZeros - pad D M S and D M.MM numbers with leading zeros
+    @param plusCodesLength - length of plus codes
+    @param geohashPrecision - length of geohashes
+    @param maidenPrecision - Maidenhead grid locator precision
+    @param upsPrecision - decimals of UPS eastings and northings
+    @param georefPrecision - GEOREF precision
+    @param mgrsPrecision - MGRS precision, always 5 in the algorithm
+    """
+
+    def __init__(self, outputFormat, wgs84Format=0, decimalPrecision=8, dmsPrecision=0,
+                 coordOrder=0, delimiter=',', useDmsSpace=False, padZeros=False,
+                 plusCodesLength=11, geohashPrecision=12, maidenPrecision=3,
+                 upsPrecision=0, georefPrecision=5, mgrsPrecision=5):
+        if outputFormat < 0 or outputFormat >= len(ENCODE_FORMATS):
+            raise ConvertException('Unknown output format {}'.format(outputFormat))
+        self.outputFormat = outputFormat
+        self.fieldCount = 2 if outputFormat == 0 else 1
+
+        # Array function for the format, taking latitudes and longitudes and
+        # returning an array of strings, or None
+        self.batch = None
+        if outputFormat == 4 and mgrs.tmerc.HAVE_NUMPY:
+            self.batch = lambda lat, lon: mgrs.toMgrsArray(lat, lon, mgrsPrecision)
+        elif outputFormat == 5 and olc.HAVE_NUMPY:
+            self.batch = lambda lat, lon: olc.encodeArray(lat, lon, plusCodesLength)
+        elif outputFormat == 6 and geohash.HAVE_NUMPY and geohashPrecision <= geohash.MAX_INT_PRECISION:
+            self.batch = lambda lat, lon: geohash.encode_array(lat, lon, geohashPrecision)
+        elif outputFormat == 7 and utm.HAVE_NUMPY:
+            self.batch = lambda lat, lon: utm.latLon2UtmArray(lat, lon, dmsPrecision)
+        elif outputFormat == 8 and maidenhead.HAVE_NUMPY:
+            self.batch = lambda lat, lon: maidenhead.toMaidenArray(lat, lon, maidenPrecision)[0]
+        elif outputFormat == 10 and georef.HAVE_NUMPY:
+            self.batch = lambda lat, lon: georef.encodeArray(lat, lon, georefPrecision)[0]
+
+        # Function converting one point to a tuple of fieldCount strings
+        spec = '.{}f'.format(decimalPrecision)
+        if wgs84Format == 1:  # DMS
+            dms_mode = 0
+        elif wgs84Format == 2:  # D M.MM
+            dms_mode = 2
+        else:  # DDMMSS
+            dms_mode = 1
+        if outputFormat == 0 and wgs84Format == 0:  # Two fields, decimal degrees
+            self.point = lambda lat, lon: (format(lat, spec), format(lon, spec))
+        elif outputFormat == 0:  # Two fields, DMS, D M.MM or DDMMSS
+            formatLat = dms.coordFormatter(True, dms_mode, dmsPrecision, useDmsSpace, padZeros)
+            formatLon = dms.coordFormatter(False, dms_mode, dmsPrecision, useDmsSpace, padZeros)
+            self.point = lambda lat, lon: (formatLat(lat), formatLon(lon))
+        elif outputFormat == 1 and wgs84Format == 0:  # One field, decimal degrees
+            if coordOrder == 0:
+                self.point = lambda lat, lon: (format(lat, spec) + delimiter + format(lon, spec),)
+            else:
+                self.point = lambda lat, lon: (format(lon, spec) + delimiter + format(lat, spec),)
+        elif outputFormat == 1:  # One field, DMS, D M.MM or DDMMSS
+            formatPair = dms.dmsFormatter(dms_mode, dmsPrecision, coordOrder, delimiter, useDmsSpace, padZeros)
+            self.point = lambda lat, lon: (formatPair(lat, lon),)
+        elif outputFormat == 2:  # GeoJSON
+            self.point = lambda lat, lon: ('{{"type": "Point","coordinates": [{},{}]}}'.format(
+                format(lon, spec), format(lat, spec)),)
+        elif outputFormat == 3:  # WKT
+            self.point = lambda lat, lon: ('POINT({} {})'.format(format(lon, spec), format(lat, spec)),)
+        elif outputFormat == 4:  # MGRS
+            self.point = lambda lat, lon: (mgrs.toMgrs(lat, lon, mgrsPrecision),)
+        elif outputFormat == 5:  # Plus codes
+            self.point = lambda lat, lon: (olc.encode(lat, lon, plusCodesLength),)
+        elif outputFormat == 6:  # Geohash
+            self.point = lambda lat, lon: (geohash.encode(lat, lon, geohashPrecision),)
+        elif outputFormat == 7:  # WGS 84 UTM
+            self.point = lambda lat, lon: (utm.latLon2Utm(lat, lon, dmsPrecision),)
+        elif outputFormat == 8:  # Maidenhead grid
+            self.point = lambda lat, lon: (maidenhead.toMaiden(lat, lon, maidenPrecision),)
+        elif outputFormat == 9:  # UPS
+            self.point = lambda lat, lon: (ups.latLon2Ups(lat, lon, upsPrecision, 0),)
+        elif outputFormat == 10:  # GEOREF
+            self.point = lambda lat, lon: (georef.encode(lat, lon, georefPrecision),)
+
+        # Function formatting arrays of latitudes and longitudes in decimal
+        # degrees with NumPy, returning a list of fieldCount string arrays,
+        # or None. The strings are those of point.
+        self.formatArrays = None
+        if HAVE_NUMPY and (outputFormat in (2, 3) or (outputFormat <= 1 and wgs84Format == 0)):
+            template = '%.{}f'.format(decimalPrecision)
+
+            def formatArrays(lat, lon):
+                y = np.char.mod(template, lat)
+                x = np.char.mod(template, lon)
+                if outputFormat == 0:
+                    return [y, x]
+                if outputFormat == 1:
+                    first, second = (y, x) if coordOrder == 0 else (x, y)
+                    return [np.char.add(np.char.add(first, delimiter), second)]
+                if outputFormat == 2:
+                    start, middle, end = '{"type": "Point","coordinates": [', ',', ']}'
+                else:
+                    start, middle, end = 'POINT(', ' ', ')'
+                return [np.char.add(np.char.add(np.char.add(np.char.add(start, x), middle), y), end)]
+            self.formatArrays = formatArrays
+
+    def encode(self, lat, lon):
+        """ Converts columns of latitudes and longitudes
+
+        @param lat - sequence or array of latitudes, NaN for missing points
+        @param lon - sequence or array of longitudes
+        @returns - list of fieldCount lists of strings, empty where the point
+            is missing or cannot be converted
+        """
+        lat = _tolist(lat)
+        lon = _tolist(lon)
+        finite = [math.isfinite(y) and math.isfinite(x) for y, x in zip(lat, lon)]
+        if self.batch is not None:
+            msgs = _tolist(self.batch(lat, lon))
+            return [[msg if ok else '' for msg, ok in zip(msgs, finite)]]
+        columns = [[''] * len(lat) for _ in range(self.fieldCount)]
+        point = self.point
+        for i, (y, x, ok) in enumerate(zip(lat, lon, finite)):
+            if not ok:
+                continue
+            try:
+                msgs = point(y, x)
+            except Exception:
+                continue
+            for column, msg in zip(columns, msgs):
+                column[i] = msg
+        return columns
+
+    def encodeArrays(self, lat, lon):
+        """ Converts arrays of latitudes and longitudes like encode, but
+        leaves the strings of the array functions in NumPy arrays. Decimal
+        degrees, GeoJSON and WKT are formatted with np.char.mod, DMS, D M.MM,
+        DDMMSS and UPS point by point. Requires NumPy.
+
+        @param lat - array of latitudes, NaN for missing points
+        @param lon - array of longitudes
+        @returns - list of fieldCount NumPy arrays of strings, empty where
+            the point is missing or cannot be converted
+        """
+        lat = np.asarray(lat, dtype=np.float64)
+        lon = np.asarray(lon, dtype=np.float64)
+        if self.batch is not None:
+            columns = [np.asarray(self.batch(lat, lon))]
+        elif self.formatArrays is not None:
+            columns = self.formatArrays(lat, lon)
+        else:
+            return [np.array(column, dtype=object) for column in self.encode(lat, lon)]
+        finite = np.isfinite(lat) & np.isfinite(lon)
+        if finite.all():
+            return columns
+        return [np.where(finite, column, '') for column in columns]
+
+
+class Decoder(object):
+    """ Converts the strings of a Field2Geom input field type to WGS 84
+    latitudes and longitudes.
+
+    @param fieldType - index of the field type in DECODE_FORMATS
+    """
+
+    def __init__(self, fieldType):
+        if fieldType < 0 or fieldType >= len(DECODE_FORMATS):
+            raise ConvertException('Unknown input field type {}'.format(fieldType))
+        self.fieldType = fieldType
+        self.fieldCount = 2 if fieldType == 0 else 1
+
+        # Array function for the field type, taking a list of strings, or
+        # two for two fields, and returning arrays of latitudes and
+        # longitudes with NaN for invalid strings, or None
+        self.batch = None
+        if fieldType == 0 and dms.HAVE_NUMPY:  # Lat (y), Lon (x) fields
+            self.batch = lambda lat, lon: dms.parseDMSStringColumns(lat, lon)[:2]
+        elif fieldType == 1 and dms.HAVE_NUMPY:  # Lat (y), Lon (x)
+            self.batch = lambda codes: dms.parseDMSStringArray(codes, 0)[:2]
+        elif fieldType == 2 and dms.HAVE_NUMPY:  # Lon (x), Lat (y)
+            self.batch = lambda codes: dms.parseDMSStringArray(codes, 1)[:2]
+        elif fieldType == 3 and mgrs.tmerc.HAVE_NUMPY:  # MGRS
+            self.batch = lambda codes: mgrs.toWgsArray(codes, exact=True)
+        elif fieldType == 4 and olc.HAVE_NUMPY:  # Plus codes
+            self.batch = plusCodesCenters
+        elif fieldType == 5 and geohash.HAVE_NUMPY:  # Geohash
+            self.batch = lambda codes: geohash.decode_exactly_array(codes)[:2]
+        elif fieldType == 6 and utm.HAVE_NUMPY:  # UTM
+            self.batch = lambda codes: utm.utm2LatLonArray(codes)[:2]
+        elif fieldType == 7 and maidenhead.HAVE_NUMPY:  # Maidenhead Grid Locator
+            self.batch = lambda codes: maidenhead.maidenGridCenterArray(codes)[:2]
+        elif fieldType == 9 and georef.HAVE_NUMPY:  # GEOREF
+            self.batch = lambda codes: georef.decodeArray(codes)[:2]
+
+        # Function converting the strings of one row to (lat, lon), raising
+        # an exception if they are invalid
+        if fieldType == 0:
+            self.point = lambda lat, lon: _parsePair('{} {}'.format(lat, lon), 0)
+        elif fieldType == 1:
+            self.point = lambda code: _parsePair(code, 0)
+        elif fieldType == 2:
+            self.point = lambda code: _parsePair(code, 1)
+        elif fieldType == 3:
+            self.point = lambda code: mgrs.toWgs(str(code))
+        elif fieldType == 4:
+            self.point = _plusCodeCenter
+        elif fieldType == 5:
+            self.point = lambda code: geohash.decode_exactly(code)[:2]
+        elif fieldType == 6:
+            self.point = utm.utm2LatLon
+        elif fieldType == 7:
+            self.point = lambda code: tuple(float(v) for v in maidenhead.maidenGridCenter(code))
+        elif fieldType == 8:
+            self.point = ups.ups2LatLon
+        else:
+            self.point = lambda code: georef.decode(code, False)[:2]
+
+    def decode(self, codes, codes2=None):
+        """ Converts a column of stripped strings, or the two columns of the
+        Lat (y), Lon (x) field type
+
+        @param codes - list of strings
+        @param codes2 - list of longitude strings for two fields
+        @returns - lists of latitudes and longitudes, NaN for invalid strings
+        """
+        columns = (codes,) if self.fieldCount == 1 else (codes, codes2)
+        if self.batch is not None:
+            lat, lon = self.batch(*columns)
+            return _tolist(lat), _tolist(lon)
+        nan = float('nan')
+        lat = [nan] * len(codes)
+        lon = [nan] * len(codes)
+        point = self.point
+        for i, row in enumerate(zip(*columns)):
+            try:
+                lat[i], lon[i] = point(*row)
+            except Exception:
+                pass
+        return lat, lon
+
+    def decodeArrays(self, codes, codes2=None):
+        """ Converts strings like decode, but returns NumPy arrays.
+        Requires NumPy.
+
+        @param codes - list or NumPy array of strings
+        @param codes2 - list or NumPy array of longitude strings for two
+            fields
+        @returns - arrays of latitudes and longitudes, NaN for invalid strings
+        """
+        if self.batch is not None:
+            columns = (codes,) if self.fieldCount == 1 else (codes, codes2)
+            lat, lon = self.batch(*columns)
+        else:
+            lat, lon = self.decode(codes, codes2)
+        return np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64)
@@ -0,0 +1,423 @@
+"""
+Parsing and formatting of WGS 84 coordinates written in decimal degrees or in
+degrees, minutes and seconds (DMS).
+
+The upper cased text is split into tokens in a single pass of one compiled
+expression. A token is either a word of letters or a run of digits, decimal
+points and signs. Everything else, such as white space, commas, semicolons
+and the degree, minute and second symbols, only separates tokens. The words
+N, S, E, W, NORTH, SOUTH, EAST and WEST are hemispheres, as is a hemisphere
+letter written straight after a D, M or S unit letter, e.g. 46SN. Other words
+such as LAT, LON or DEG are ignored.
+
+The token sequence is then checked against the accepted layouts
+
+    number number                        decimal degrees, no hemispheres
+    numbers hemisphere numbers hemisphere  hemispheres after the values
+    hemisphere numbers hemisphere numbers  hemispheres before the values
+
+where numbers is one to three values: degrees, degrees and minutes or
+degrees, minutes and seconds. A single value may also be packed as DDMM,
+DDMMSS, DDDMM or DDDMMSS with an optional decimal fraction. With hemispheres
+the values may be given in either order and signs only separate values.
+
+The parsing functions return an error instead of raising it so callers
+converting many values do not pay for an exception on every invalid one.
+
+parseDMSStringArray and parseDMSStringColumns parse whole columns. Rows that
+are plain decimal numbers are found with one regular expression search over
+the joined column and converted by NumPy together; only the other rows go
+through the tokenizer.
+
+Formatting goes through formatters created once for a set of options by
+coordFormatter and dmsFormatter, so the unit symbols, padding and number
+formats are not worked out again for every coordinate.
+"""
+import math
+import re
+from functools import lru_cache
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+FORMATTER_CACHE_SIZE = 64
+
+_TOKENS = re.compile(r'[A-Z]+|[\d.+-]+')
+_SIGNS = re.compile(r'[+-]')
+
+# Lines of a joined column that are not one or two plain decimal numbers
+_NUMBER = r'[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)'
+_NOT_DECIMAL = re.compile(r'^(?![ \t]*{0}[ \t]*$).*$'.format(_NUMBER), re.M)
+_NOT_DECIMAL_PAIR = re.compile(
+    r'^(?![ \t]*{0}(?:[ \t]*[,;][ \t]*|[ \t]+){0}[ \t]*$).*$'.format(_NUMBER), re.M)
+_SEPARATORS = str.maketrans(',;\t', '   ')
+
+_HEMISPHERES = {
+    'N': 'N', 'S': 'S', 'E': 'E', 'W': 'W',
+    'NORTH': 'N', 'SOUTH': 'S', 'EAST': 'E', 'WEST': 'W'}
+for _unit in 'DMS':
+    for _h in 'NSEW':
+        _HEMISPHERES[_unit + _h] = _h
+
+
+class DmsParseError(ValueError):
+    pass
+
+
+def _tokenize(text):
+    """ Returns the value tokens of text and the positions of the hemisphere
+    letters among them. Words that are not hemispheres and tokens made only of
+    decimal points are dropped.
+    """
+    items = []
+    hemispheres = []
+    for token in _TOKENS.findall(text.upper()):
+        if token[0].isalpha():
+            h = _HEMISPHERES.get(token)
+            if h is None:
+                continue
+            hemispheres.append(len(items))
+            items.append(h)
+        elif token.strip('.'):
+            items.append(token)
+    return items, hemispheres
+
+
+def _degrees(tokens, hemisphere):
+    """ Returns (degrees, error) for the number tokens of one coordinate
+    """
+    parts = []
+    for token in tokens:
+        if '-' in token or '+' in token:
+            parts.extend(p for p in _SIGNS.split(token) if p.strip('.'))
+        else:
+            parts.append(token)
+    try:
+        dmslen = len(parts)
+        if dmslen == 3:
+            deg = float(parts[0]) + float(parts[1]) / 60.0 + float(parts[2]) / 3600.0
+        elif dmslen == 2:
+            deg = float(parts[0]) + float(parts[1]) / 60.0
+        elif dmslen == 1:
+            dms = parts[0]
+            if hemisphere == 'N' or hemisphere == 'S':
+                dms = '0' + dms
+            # Find the length up to the first decimal
+            ll = dms.find('.')
+            if ll == -1:
+                ll = len(dms)
+            if ll >= 7:
+                deg = float(dms[0:3]) + float(dms[3:5]) / 60.0 + float(dms[5:]) / 3600.0
+            elif ll == 6:  # A leading 0 was left off but we can still work with 6 digits
+                deg = float(dms[0:2]) + float(dms[2:4]) / 60.0 + float(dms[4:]) / 3600.0
+            elif ll == 5:
+                deg = float(dms[0:3]) + float(dms[3:]) / 60.0
+            elif ll == 4:  # Leading 0's were left off
+                deg = float(dms[0:2]) + float(dms[2:]) / 60.0
+            else:
+                deg = float(dms)
+        elif dmslen == 0:
+            return None, DmsParseError('Missing coordinate value')
+        else:
+            return None, DmsParseError('Too many values in a DMS coordinate')
+    except ValueError:
+        return None, DmsParseError('Invalid number in DMS coordinate')
+    if hemisphere == 'S' or hemisphere == 'W':
+        deg = -deg
+    return deg, None
+
+
+def tryParseDMS(text, hemisphere):
+    """ Parses the value of one DMS coordinate without its hemisphere
+
+    @param text - degrees, minutes and seconds separated by any non digits or
+        a packed DDMMSS style value
+    @param hemisphere - 'N', 'S', 'E' or 'W'
+    @returns - (degrees, None) or (None, DmsParseError)
+    """
+    tokens = [t for t in _TOKENS.findall(text.upper()) if not t[0].isalpha() and t.strip('.')]
+    return _degrees(tokens, hemisphere)
+
+
+def tryParseDMSString(text, order=0):
+    """ Parses a pair of coordinates in DMS or decimal degrees without raising
+    an exception. Decimal degrees are in latitude, longitude order if order is
+    0 and in longitude, latitude order otherwise. For DMS coordinates the
+    hemispheres decide the order.
+
+    @param text - coordinate string
+    @param order - 0 for Lat Lon and 1 for Lon Lat decimal degrees
+    @returns - (lat, lon, None) or (None, None, DmsParseError)
+    """
+    tokens, hemispheres = _tokenize(text)
+    if not hemispheres:
+        if len(tokens) != 2:
+            return None, None, DmsParseError('Expected two decimal degree values')
+        try:
+            y = float(tokens[0])
+            x = float(tokens[1])
+        except ValueError:
+            return None, None, DmsParseError('Invalid decimal degree value')
+        if order == 0:
+            return y, x, None
+        return x, y, None
+
+    if len(hemispheres) != 2:
+        return None, None, DmsParseError('Expected two hemispheres')
+    i, j = hemispheres
+    last = len(tokens) - 1
+    if i == 0 and 1 < j < last:
+        # The hemispheres occur before the values
+        first = tokens[1:j]
+        second = tokens[j + 1:]
+    elif j == last and 0 < i < j - 1:
+        # The hemispheres occur after the values
+        first = tokens[:i]
+        second = tokens[i + 1:j]
+    else:
+        return None, None, DmsParseError('Hemispheres must all be before or all after the values')
+    h1 = tokens[i]
+    h2 = tokens[j]
+    if (h1 in 'NS') == (h2 in 'NS'):
+        return None, None, DmsParseError('Expected one latitude and one longitude hemisphere')
+    v1, error = _degrees(first, h1)
+    if error is not None:
+        return None, None, error
+    v2, error = _degrees(second, h2)
+    if error is not None:
+        return None, None, error
+    if h1 in 'NS':
+        return v1, v2, None
+    return v2, v1, None
+
+
+def tryParseDMSStringSingle(text):
+    """ Parses a single coordinate in DMS or decimal degrees without raising
+    an exception. It does not tell whether the value is a latitude or a
+    longitude.
+
+    @param text - coordinate string
+    @returns - (value, None) or (None, DmsParseError)
+    """
+    tokens, hemispheres = _tokenize(text)
+    if not hemispheres:
+        if len(tokens) != 1:
+            return None, DmsParseError('Expected one decimal degree value')
+        try:
+            return float(tokens[0]), None
+        except ValueError:
+            return None, DmsParseError('Invalid decimal degree value')
+    if len(hemispheres) != 1:
+        return None, DmsParseError('Expected one hemisphere')
+    i = hemispheres[0]
+    if i == 0 and len(tokens) > 1:
+        return _degrees(tokens[1:], tokens[0])
+    if i == len(tokens) - 1 and i > 0:
+        return _degrees(tokens[:i], tokens[i])
+    return None, DmsParseError('Hemisphere must be before or after the value')
+
+
+
+def _decimalColumn(texts, notDecimal, width):
+    """ Converts the rows of texts that are width plain decimal numbers in one
+    pass over the whole column
+
+    @returns - (values, others) where values has the shape (len(texts),
+        width) and others lists the indices of the rows that were not
+        converted and are NaN in values
+    """
+    n = len(texts)
+    text = '\n'.join(texts)
+    if text.count('\n') != n - 1:
+        # Some rows contain line breaks so leave all of them to the tokenizer
+        return np.full((n, width), np.nan), range(n)
+    ends = np.cumsum(np.fromiter(map(len, texts), dtype=np.int64, count=n) + 1)
+    starts = [m.start() for m in notDecimal.finditer(text)]
+    others = np.searchsorted(ends, starts, side='right').tolist()
+    if others:
+        texts = list(texts)
+        blank = ' '.join(['nan'] * width)
+        for i in others:
+            texts[i] = blank
+        text = '\n'.join(texts)
+    values = np.fromstring(text.translate(_SEPARATORS), sep=' ')
+    if values.size != n * width:
+        return np.full((n, width), np.nan), range(n)
+    return values.reshape(n, width), others
+
+
+def parseDMSStringArray(texts, order=0):
+    """ Parses a column of coordinate pairs in DMS or decimal degrees. Gives
+    the same results as tryParseDMSString on each row.
+
+    @param texts - sequence of coordinate strings
+    @param order - 0 for Lat Lon and 1 for Lon Lat decimal degrees
+    @returns - (lat, lon, valid) arrays, lat and lon are NaN where valid is
+        False
+    """
+    texts = list(texts)
+    values, others = _decimalColumn(texts, _NOT_DECIMAL_PAIR, 2)
+    if order == 0:
+        lat = values[:, 0].copy()
+        lon = values[:, 1].copy()
+    else:
+        lat = values[:, 1].copy()
+        lon = values[:, 0].copy()
+    valid = np.ones(len(texts), dtype=bool)
+    for i in others:
+        y, x, error = tryParseDMSString(texts[i], order)
+        if error is None:
+            lat[i] = y
+            lon[i] = x
+        else:
+            valid[i] = False
+    return lat, lon, valid
+
+
+def parseDMSStringColumns(latTexts, lonTexts):
+    """ Parses a latitude and a longitude column in DMS or decimal degrees.
+    Gives the same results as tryParseDMSString on the two values of each row
+    joined with a space.
+
+    @param latTexts - sequence of latitude strings
+    @param lonTexts - sequence of longitude strings of the same length
+    @returns - (lat, lon, valid) arrays, lat and lon are NaN where valid is
+        False
+    """
+    latTexts = list(latTexts)
+    lonTexts = list(lonTexts)
+    lat, latOthers = _decimalColumn(latTexts, _NOT_DECIMAL, 1)
+    lon, lonOthers = _decimalColumn(lonTexts, _NOT_DECIMAL, 1)
+    lat = lat[:, 0].copy()
+    lon = lon[:, 0].copy()
+    valid = np.ones(len(latTexts), dtype=bool)
+    for i in sorted(set(latOthers).union(lonOthers)):
+        y, x, error = tryParseDMSString('{} {}'.format(latTexts[i], lonTexts[i]), 0)
+        if error is None:
+            lat[i] = y
+            lon[i] = x
+        else:
+            lat[i] = np.nan
+            lon[i] = np.nan
+            valid[i] = False
+    return lat, lon, valid
+
+
+@lru_cache(maxsize=FORMATTER_CACHE_SIZE)
+def coordFormatter(islat, dms_mode=0, prec=0, useDmsSpace=True, padZeros=False):
+    """ Returns a function formatting a latitude or a longitude in decimal
+    degrees as D M S (dms_mode 0), DDMMSS (1) or D M.MM (2). The strings are
+    the same as those of util.convertDD2DMS with the same options.
+
+    @param islat - True for latitudes and False for longitudes
+    @param dms_mode - 0, 1 or 2
+    @param prec - number of decimals of the seconds or minutes
+    @param useDmsSpace - put a space between the parts
+    @param padZeros - pad the degrees, minutes and seconds with zeros
+    @returns - function taking the coordinate and returning a string
+    """
+    space = ' ' if useDmsSpace else ''
+    zeros = 1 if padZeros else 0
+    dextra = 1 if prec else 0
+    degWidth = zeros * 2 if islat else zeros * 3
+    # Width of the last number, the seconds or the decimal minutes
+    lastWidth = prec + zeros * 2 + dextra
+    spec = '.{}f'.format(prec)
+    sixty = format(60.0, spec)
+    zero = format(0.0, spec)
+
+    if dms_mode == 0:  # D M S
+        template = '%s\xB0' + space + "%s'" + space + '%s"' + space + '%s'
+        minWidth = zeros * 2
+    elif dms_mode == 1:  # DDMMSS
+        template = '%s%s%s%s'
+        degWidth = 2 if islat else 3
+        minWidth = 2
+        lastWidth = 2 if prec == 0 else prec + 3
+    elif dms_mode == 2:  # DM.MM
+        template = '%s\xB0' + space + "%s'" + space + '%s'
+    else:
+        return lambda coord: ''
+
+    def formatCoord(coord):
+        if islat:
+            unit = 'S' if coord < 0 else 'N'
+        else:
+            unit = 'E' if coord > 0 else 'W'
+        coord = math.fabs(coord)
+        deg = math.floor(coord)
+        dmin = (coord - deg) * 60.0
+        if dms_mode == 2:
+            s = format(dmin, spec)
+            # Carry when the minutes round up to 60
+            if s == sixty:
+                deg += 1
+                s = zero
+            return template % (str(deg).zfill(degWidth), s.zfill(lastWidth), unit)
+        mins = math.floor(dmin)
+        s = format((dmin - mins) * 60.0, spec)
+        # Carry when the seconds round up to 60
+        if s == sixty:
+            s = zero
+            mins += 1
+            if mins == 60:
+                deg += 1
+                mins = 0
+        return template % (str(deg).zfill(degWidth), str(mins).zfill(minWidth), s.zfill(lastWidth), unit)
+    return formatCoord
+
+
+class DmsFormatter(object):
+    """ Formats latitude, longitude pairs with fixed options. Use dmsFormatter
+    to get one.
+    """
+
+    def __init__(self, dms_mode=0, prec=0, order=0, delimiter=', ', useDmsSpace=True, padZeros=False):
+        self.formatLat = coordFormatter(True, dms_mode, prec, useDmsSpace, padZeros)
+        self.formatLon = coordFormatter(False, dms_mode, prec, useDmsSpace, padZeros)
+        self.order = order
+        self.delimiter = str(delimiter)
+
+    def __call__(self, lat, lon):
+        """ Returns the formatted coordinate pair
+        """
+        if self.order == 0:  # Y, X or Lat, Lon
+            return self.formatLat(lat) + self.delimiter + self.formatLon(lon)
+        return self.formatLon(lon) + self.delimiter + self.formatLat(lat)
+
+    def formatArray(self, lat, lon):
+        """ Formats many points
+
+        @param lat - sequence or array of latitudes
+        @param lon - sequence or array of longitudes
+        @returns - list of strings, empty for points that are not finite
+        """
+        if hasattr(lat, 'tolist'):
+            lat = lat.tolist()
+        if hasattr(lon, 'tolist'):
+            lon = lon.tolist()
+        out = []
+        for y, x in zip(lat, lon):
+            try:
+                out.append(self(y, x))
+            except (ValueError, OverflowError):
+                out.append('')
+        return out
+
+
+@lru_cache(maxsize=FORMATTER_CACHE_SIZE)
+def dmsFormatter(dms_mode=0, prec=0, order=0, delimiter=', ', useDmsSpace=True, padZeros=False):
+    """ Returns a DmsFormatter for the options, the same one for the same
+    options. It creates the same strings as util.formatDmsString.
+
+    @param dms_mode - 0 for D M S, 1 for DDMMSS and 2 for D M.MM
+    @param prec - number of decimals of the seconds or minutes
+    @param order - 0 for Lat, Lon and 1 for Lon, Lat
+    @param delimiter - text between the two coordinates
+    @param useDmsSpace - put a space between the parts
+    @param padZeros - pad the degrees, minutes and seconds with zeros
+    @returns - DmsFormatter
+    """
+    return DmsFormatter(dms_mode, prec, order, delimiter, useDmsSpace, padZeros)
@@ -0,0 +1,385 @@
+"""
+Copyright (C) 2008 Leonard Norrgard <leonard.norrgard@gmail.com>
+Copyright (C) 2015 Leonard Norrgard <leonard.norrgard@gmail.com>
+
+This file is part of Geohash.
+
+Geohash is free software: you can redistribute it and/or modify it
+under the terms of the GNU Affero General Public License as published
+by the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Geohash is distributed in the hope that it will be useful, but WITHOUT
+ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Affero General Public
+License for more details.
+
+You should have received a copy of the GNU Affero General Public
+License along with Geohash.  If not, see
+<http://www.gnu.org/licenses/>.
+"""
+from math import log10, isnan
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+#  Note: the alphabet in geohash differs from the common base32
+#  alphabet described in IETF's RFC 4648
+#  (http://tools.ietf.org/html/rfc4648)
+__base32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+__decodemap = { }
+for i in range(len(__base32)):
+    __decodemap[__base32[i]] = i
+del i
+
+# Geohashes of up to 12 characters are handled as 60 bit integers with the
+# longitude and latitude cell indexes interleaved in Morton order, longitude
+# first. Longer geohashes use the original bisection.
+MAX_INT_PRECISION = 12
+_BITS = 30
+_CELLS = 1 << _BITS
+_LAT_WIDTH = 180.0 / _CELLS
+_LON_WIDTH = 360.0 / _CELLS
+
+# _SPREAD[b] has the bits of the byte b moved to the even bit positions
+_SPREAD = []
+for b in range(256):
+    v = 0
+    for i in range(8):
+        v |= ((b >> i) & 1) << (2 * i)
+    _SPREAD.append(v)
+del b, i, v
+
+# _COMPACT[v] has the even bits of the 16 bit value v packed into a byte
+_COMPACT = [0] * 65536
+for b in range(256):
+    for odd in range(256):
+        _COMPACT[_SPREAD[b] | (_SPREAD[odd] << 1)] = b
+del b, odd
+
+# Geohash characters of every 10 bit value
+_PAIRS = [__base32[v >> 5] + __base32[v & 31] for v in range(1024)]
+
+def _cellIndex(value, lo, width):
+    """
+    Returns the number of cell boundaries lo + k * width (0 < k < 2^30)
+    that are strictly less than value. This is the cell the bisection in
+    encode ends up in, as it only moves up if the value is greater than
+    the midpoint. The cell boundaries are exact binary fractions, so the
+    estimate is corrected by comparing with them.
+    """
+    if isnan(value):
+        return 0
+    f = (value - lo) / width
+    if f <= 0:
+        return 0
+    if f >= _CELLS:
+        return _CELLS - 1
+    i = int(f)
+    if i == f:
+        i -= 1
+    while i > 0 and value <= lo + i * width:
+        i -= 1
+    while i < _CELLS - 1 and value > lo + (i + 1) * width:
+        i += 1
+    return i
+
+def _spread(v):
+    return (_SPREAD[v & 255] | (_SPREAD[(v >> 8) & 255] << 16) |
+            (_SPREAD[(v >> 16) & 255] << 32) | (_SPREAD[v >> 24] << 48))
+
+def _compact(v):
+    return (_COMPACT[v & 65535] | (_COMPACT[(v >> 16) & 65535] << 8) |
+            (_COMPACT[(v >> 32) & 65535] << 16) |
+            (_COMPACT[(v >> 48) & 65535] << 24))
+
+def _encode12(latitude, longitude):
+    code = (_spread(_cellIndex(longitude, -180.0, _LON_WIDTH)) << 1) | \
+        _spread(_cellIndex(latitude, -90.0, _LAT_WIDTH))
+    return (_PAIRS[code >> 50] + _PAIRS[(code >> 40) & 1023] +
+            _PAIRS[(code >> 30) & 1023] + _PAIRS[(code >> 20) & 1023] +
+            _PAIRS[(code >> 10) & 1023] + _PAIRS[code & 1023])
+
+def _cellIndexes(geohash):
+    """
+    Returns the latitude and longitude cell indexes of a geohash of at
+    most 12 characters and the number of bits of each.
+    """
+    length = len(geohash)
+    code = 0
+    for c in geohash:
+        code = (code << 5) | __decodemap[c]
+    code <<= 5 * (MAX_INT_PRECISION - length)
+    lon_bits = (5 * length + 1) // 2
+    lat_bits = 5 * length // 2
+    lon_idx = _compact(code >> 1) >> (_BITS - lon_bits)
+    lat_idx = _compact(code) >> (_BITS - lat_bits)
+    return lat_idx, lon_idx, lat_bits, lon_bits
+
+def _fromCellIndexes(lat_idx, lon_idx, length):
+    lon_bits = (5 * length + 1) // 2
+    lat_bits = 5 * length // 2
+    code = (_spread(lon_idx << (_BITS - lon_bits)) << 1) | \
+        _spread(lat_idx << (_BITS - lat_bits))
+    return (_PAIRS[code >> 50] + _PAIRS[(code >> 40) & 1023] +
+            _PAIRS[(code >> 30) & 1023] + _PAIRS[(code >> 20) & 1023] +
+            _PAIRS[(code >> 10) & 1023] + _PAIRS[code & 1023])[:length]
+
+def _decode_int(geohash):
+    lat_idx, lon_idx, lat_bits, lon_bits = _cellIndexes(geohash)
+    lat_err = 90.0 / (1 << lat_bits)
+    lon_err = 180.0 / (1 << lon_bits)
+    return (-90.0 + (2 * lat_idx + 1) * lat_err,
+            -180.0 + (2 * lon_idx + 1) * lon_err, lat_err, lon_err)
+
+def decode_exactly(geohash):
+    """
+    Decode the geohash to its exact values, including the error
+    margins of the result.  Returns four float values: latitude,
+    longitude, the plus/minus error for latitude (as a positive
+    number) and the plus/minus error for longitude (as a positive
+    number).
+    """
+    if len(geohash) <= MAX_INT_PRECISION:
+        return _decode_int(geohash)
+    return _decode_bisect(geohash)
+
+def _decode_bisect(geohash):
+    """
+    Decode the geohash to its exact values, including the error
+    margins of the result.  Returns four float values: latitude,
+    longitude, the plus/minus error for latitude (as a positive
+    number) and the plus/minus error for longitude (as a positive
+    number).
+    """
+    lat_interval, lon_interval = (-90.0, 90.0), (-180.0, 180.0)
+    lat_err, lon_err = 90.0, 180.0
+    is_even = True
+    for c in geohash:
+        cd = __decodemap[c]
+        for mask in [16, 8, 4, 2, 1]:
+            if is_even: # adds longitude info
+                lon_err /= 2
+                if cd & mask:
+                    lon_interval = ((lon_interval[0]+lon_interval[1])/2, lon_interval[1])
+                else:
+                    lon_interval = (lon_interval[0], (lon_interval[0]+lon_interval[1])/2)
+            else:      # adds latitude info
+                lat_err /= 2
+                if cd & mask:
+                    lat_interval = ((lat_interval[0]+lat_interval[1])/2, lat_interval[1])
+                else:
+                    lat_interval = (lat_interval[0], (lat_interval[0]+lat_interval[1])/2)
+            is_even = not is_even
+    lat = (lat_interval[0] + lat_interval[1]) / 2
+    lon = (lon_interval[0] + lon_interval[1]) / 2
+    return lat, lon, lat_err, lon_err
+
+def decode(geohash):
+    """
+    Decode geohash, returning two strings with latitude and longitude
+    containing only relevant digits and with trailing zeroes removed.
+    """
+    lat, lon, lat_err, lon_err = decode_exactly(geohash)
+    # Format to the number of decimals that are known
+    lats = "%.*f" % (max(1, int(round(-log10(lat_err)))) - 1, lat)
+    lons = "%.*f" % (max(1, int(round(-log10(lon_err)))) - 1, lon)
+    if '.' in lats: lats = lats.rstrip('0')
+    if '.' in lons: lons = lons.rstrip('0')
+    return lats, lons
+
+def bounds(geohash):
+    """
+    Return the cell of the geohash as four float values: the south,
+    west, north and east edges.
+    """
+    lat, lon, lat_err, lon_err = decode_exactly(geohash)
+    return lat - lat_err, lon - lon_err, lat + lat_err, lon + lon_err
+
+def children(geohash):
+    """
+    Return the 32 geohashes one character longer than geohash, which
+    divide its cell, in sorted order.
+    """
+    return [geohash + c for c in __base32]
+
+def adjacent(geohash, dlat, dlon):
+    """
+    Return the geohash of the same length whose cell is dlat cells north
+    and dlon cells east of the cell of geohash. Longitudes wrap around the
+    antimeridian. Returns None if the cell would be beyond a pole.
+    Supports geohashes of 1 to 12 characters.
+    """
+    if not 0 < len(geohash) <= MAX_INT_PRECISION:
+        raise ValueError('Geohash length must be between 1 and {}'.format(MAX_INT_PRECISION))
+    lat_idx, lon_idx, lat_bits, lon_bits = _cellIndexes(geohash)
+    lat_idx += dlat
+    if lat_idx < 0 or lat_idx >= (1 << lat_bits):
+        return None
+    lon_idx = (lon_idx + dlon) % (1 << lon_bits)
+    return _fromCellIndexes(lat_idx, lon_idx, len(geohash))
+
+def neighbours(geohash):
+    """
+    Return the geohashes of the up to 8 cells surrounding the cell of
+    geohash, in the order north west to south east. Cells beyond a pole
+    are left out and at precision 1 a cell may be listed more than once
+    as longitudes wrap around.
+    """
+    result = []
+    for dlat in (1, 0, -1):
+        for dlon in (-1, 0, 1):
+            if dlat == 0 and dlon == 0:
+                continue
+            cell = adjacent(geohash, dlat, dlon)
+            if cell is not None:
+                result.append(cell)
+    return result
+
+def encode(latitude, longitude, precision=12):
+    """
+    Encode a position given in float arguments latitude, longitude to
+    a geohash which will have the character count precision.
+    """
+    if precision <= MAX_INT_PRECISION:
+        # A geohash is a prefix of every longer geohash of the same point
+        return _encode12(latitude, longitude)[:max(precision, 0)]
+    return _encode_bisect(latitude, longitude, precision)
+
+def _encode_bisect(latitude, longitude, precision):
+    lat_interval, lon_interval = (-90.0, 90.0), (-180.0, 180.0)
+    geohash = []
+    bits = [ 16, 8, 4, 2, 1 ]
+    bit = 0
+    ch = 0
+    even = True
+    while len(geohash) < precision:
+        if even:
+            mid = (lon_interval[0] + lon_interval[1]) / 2
+            if longitude > mid:
+                ch |= bits[bit]
+                lon_interval = (mid, lon_interval[1])
+            else:
+                lon_interval = (lon_interval[0], mid)
+        else:
+            mid = (lat_interval[0] + lat_interval[1]) / 2
+            if latitude > mid:
+                ch |= bits[bit]
+                lat_interval = (mid, lat_interval[1])
+            else:
+                lat_interval = (lat_interval[0], mid)
+        even = not even
+        if bit < 4:
+            bit += 1
+        else:
+            geohash += __base32[ch]
+            bit = 0
+            ch = 0
+    return ''.join(geohash)
+
+def _cellIndexArray(value, lo, width):
+    with np.errstate(invalid='ignore'):
+        f = (value - lo) / width
+        i = np.ceil(np.clip(f, 0, _CELLS)).astype(np.int64) - 1
+    i = np.clip(i, 0, _CELLS - 1)
+    # Correct the estimate with the exact cell boundaries as in _cellIndex
+    i = np.where((i > 0) & (value <= lo + i * width), i - 1, i)
+    i = np.where((i < _CELLS - 1) & (value > lo + (i + 1) * width), i + 1, i)
+    return np.where(np.isnan(value), 0, i)
+
+def _spreadArray(v):
+    v = v.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+def _compactArray(v):
+    v = v & np.uint64(0x5555555555555555)
+    v = (v | (v >> np.uint64(1))) & np.uint64(0x3333333333333333)
+    v = (v | (v >> np.uint64(2))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v >> np.uint64(4))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v >> np.uint64(8))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v >> np.uint64(16))) & np.uint64(0x00000000FFFFFFFF)
+    return v.astype(np.int64)
+
+if HAVE_NUMPY:
+    _NP_BASE32 = np.frombuffer(__base32.encode('ascii'), dtype=np.uint8)
+    _NP_DECODEMAP = np.full(128, -1, dtype=np.int64)
+    for i in range(len(__base32)):
+        _NP_DECODEMAP[ord(__base32[i])] = i
+    del i
+
+def encode_array(latitude, longitude, precision=12):
+    """
+    Encode arrays of latitudes and longitudes into an array of geohashes
+    of the given precision (1 to 12). Gives the same result as calling
+    encode for every point. Requires NumPy.
+    """
+    if not 0 < precision <= MAX_INT_PRECISION:
+        raise ValueError('Geohash precision must be between 1 and {}'.format(MAX_INT_PRECISION))
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    lat, lon = np.broadcast_arrays(latitude, longitude)
+    code = (_spreadArray(_cellIndexArray(lon.ravel(), -180.0, _LON_WIDTH)) << np.uint64(1)) | \
+        _spreadArray(_cellIndexArray(lat.ravel(), -90.0, _LAT_WIDTH))
+    chars = np.empty((code.size, precision), dtype=np.uint8)
+    for k in range(precision):
+        shift = np.uint64(5 * (MAX_INT_PRECISION - 1 - k))
+        chars[:, k] = _NP_BASE32[((code >> shift) & np.uint64(31)).astype(np.intp)]
+    result = chars.view('S{}'.format(precision)).ravel().astype('U{}'.format(precision))
+    return result.reshape(lat.shape)
+
+def decode_exactly_array(geohashes):
+    """
+    Decode an array of geohashes. Returns four float arrays: latitude,
+    longitude, and the plus/minus errors for latitude and longitude as in
+    decode_exactly. Invalid geohashes give NaN. Geohashes longer than 12
+    characters are decoded one by one. Requires NumPy.
+    """
+    geohashes = np.asarray(geohashes)
+    shape = geohashes.shape
+    if geohashes.dtype.kind != 'U':
+        geohashes = geohashes.astype('U')
+    geohashes = geohashes.ravel()
+    n = geohashes.size
+    lengths = np.char.str_len(geohashes) if n else np.zeros(0, dtype=np.int64)
+    width = max(MAX_INT_PRECISION, geohashes.dtype.itemsize // 4)
+    codepoints = geohashes.astype('U{}'.format(width)).view(np.uint32).reshape(n, width)
+    codepoints = codepoints[:, :MAX_INT_PRECISION]
+
+    values = _NP_DECODEMAP[np.minimum(codepoints, 127).astype(np.intp)]
+    values = np.where(codepoints >= 128, -1, values)
+    # Positions past the end of a geohash hold NUL and decode to -1 as well
+    inside = np.arange(MAX_INT_PRECISION) < lengths[:, None]
+    valid = np.all(~inside | (values >= 0), axis=1) & (lengths <= MAX_INT_PRECISION)
+    values = np.where(inside & (values >= 0), values, 0).astype(np.uint64)
+
+    code = np.zeros(n, dtype=np.uint64)
+    for k in range(MAX_INT_PRECISION):
+        code = (code << np.uint64(5)) | values[:, k]
+    lon_bits = (5 * lengths + 1) // 2
+    lat_bits = 5 * lengths // 2
+    lon_idx = _compactArray(code >> np.uint64(1)) >> (_BITS - lon_bits)
+    lat_idx = _compactArray(code) >> (_BITS - lat_bits)
+    lat_err = np.ldexp(90.0, -lat_bits)
+    lon_err = np.ldexp(180.0, -lon_bits)
+    lat = -90.0 + (2 * lat_idx + 1) * lat_err
+    lon = -180.0 + (2 * lon_idx + 1) * lon_err
+
+    lat = np.where(valid, lat, np.nan)
+    lon = np.where(valid, lon, np.nan)
+    lat_err = np.where(valid, lat_err, np.nan)
+    lon_err = np.where(valid, lon_err, np.nan)
+    for i in np.flatnonzero(lengths > MAX_INT_PRECISION):
+        try:
+            lat[i], lon[i], lat_err[i], lon_err[i] = _decode_bisect(geohashes[i])
+        except KeyError:
+            pass
+    return (lat.reshape(shape), lon.reshape(shape),
+            lat_err.reshape(shape), lon_err.reshape(shape))
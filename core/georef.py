@@ -0,0 +1,285 @@
+'''
+This is adapted from a C++ version of GeographicLib's GEOREF code with
+the following license.
+
+Copyright (c) Charles Karney (2015-2020) <charles@karney.com> and licensed
+under the MIT/X11 License.  For more information, see
+https://geographiclib.sourceforge.io/
+'''
+
+import math
+import sys
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+digits_ = "0123456789"
+lontile_ = "ABCDEFGHJKLMNPQRSTUVWXYZ"
+lattile_ = "ABCDEFGHJKLMM" # Repeat the last M for 90 degrees which rounds up - Prevents extra checks in the code
+degrees_ = "ABCDEFGHJKLMNPQ"
+tile_ = 15
+lonorig_ = -180
+latorig_ = -90
+base_ = 10
+baselen_ = 4
+maxprec_ = 11
+maxlen_ = baselen_ + 2 * maxprec_
+
+# Coordinates are handled as integer multiples of 1 / m_ degrees
+m_ = 60000000000
+# Divisor of the fraction of a degree for each precision
+pow10_ = [base_ ** (maxprec_ - prec) for prec in range(maxprec_ + 1)]
+# Character to value tables. The first occurrence wins as with str.find, so
+# the repeated M of lattile_ decodes as 11.
+def _values(s):
+    values = {}
+    for i, c in enumerate(s):
+        values.setdefault(c, i)
+    return values
+lontileValues_ = _values(lontile_)
+lattileValues_ = _values(lattile_)
+degreesValues_ = _values(degrees_)
+digitsValues_ = _values(digits_)
+
+class GeorefException(Exception):
+    pass
+
+def find_first_not_of(s, s_set):
+    for i, c in enumerate(s):
+        if c not in s_set:
+            return i
+    return(-1)
+
+def lookup(s, c):
+    r = s.find(c)
+    if r < 0:
+        return( -1 )
+    return(r)
+
+def encode(lat, lon, prec):
+    if lat > 90 or lat < -90:
+        raise GeorefException('Latitude not in -90 to 90 range')
+    if lon < -180 or lon > 360:
+        raise GeorefException('Longitude is out of range')
+    if lon >= 180: # make longitude in the range -180, 180
+        lon = lon - 360
+
+
+    if lat == 90:
+        lat = lat - sys.float_info.epsilon
+    prec = max(-1, min(int(maxprec_), prec))
+    if prec == 1:
+        prec = prec + 1  # Disallow prec = 1
+    ilon, x = divmod(math.floor(lon * m_) - lonorig_ * m_, m_)
+    ilat, y = divmod(math.floor(lat * m_) - latorig_ * m_, m_)
+    georef1 = lontile_[ilon // tile_] + lattile_[ilat // tile_]
+    if prec >= 0:
+        georef1 += degrees_[ilon % tile_] + degrees_[ilat % tile_]
+        if prec > 0:
+            d = pow10_[prec]
+            georef1 += '{:0{prec}d}{:0{prec}d}'.format(x // d, y // d, prec=prec)
+    return(georef1)
+
+def decode(georef, centerp=False):
+    if georef is None:
+        raise GeorefException('Invalid Georef string: None')
+    georef = georef.upper()
+    leng = len(georef)
+    if leng >= 3 and georef[0] == 'I' and georef[1] == 'N' and georef[2] == 'V':
+        raise GeorefException('Invalid Georef string')
+    if leng < baselen_ - 2 :
+        raise GeorefException('Georef must start with at least 2 letters: {}'.format(georef))
+    prec1 = int((2 + leng - baselen_) / 2 - 1)
+    k = lontileValues_.get(georef[0], -1)
+    if k < 0:
+        raise GeorefException('Bad longitude tile letter in georef: {}'.format(georef))
+    lon1 = k + lonorig_ // tile_
+    k = lattileValues_.get(georef[1], -1)
+    if k < 0:
+        raise GeorefException('Bad latitude tile letter in georef: {}'.format(georef))
+    lat1 = k + latorig_ // tile_
+    unit = 1
+    if leng > 2:
+        unit = unit * tile_
+        k = degreesValues_.get(georef[2], -1)
+        if k < 0:
+            raise GeorefException('Bad longitude degree letter in georef: {}'.format(georef))
+        lon1 = lon1 * tile_ + k
+        if leng < 4:
+            raise GeorefException('Missing latitude degree letter in georef: {}'.format(georef))
+        k = degreesValues_.get(georef[3], -1)
+        if k < 0:
+            raise GeorefException('Bad latitude degree letter in georef: {}'.format(georef))
+        lat1 = lat1 * tile_ + k
+        if prec1 > 0:
+            if find_first_not_of(georef[baselen_:], digitsValues_) != -1:
+                raise GeorefException('Non digits in trailing portion of georef: {}'.format(georef[baselen_:]))
+            if leng % 2:
+                raise GeorefException('Georef must end with an even number of digits: {}'.format(georef[baselen_:]))
+            if prec1 == 1:
+                raise GeorefException('Georef needs at least 4 digits for minutes: {}'.format(georef[baselen_:]))
+            if prec1 > maxprec_:
+                raise GeorefException('More than {} digits in georef: {}'.format(2*maxprec_, georef[baselen_:]))
+            if not (digitsValues_[georef[baselen_]] < 6 and digitsValues_[georef[baselen_ + prec1]] < 6):
+                raise GeorefException('Minutes terms in georef must be less than 60: {}'.format(georef[baselen_:]))
+            # The first digit is in base 6 and the others in base 10
+            m = 6 * base_ ** (prec1 - 1)
+            unit = unit * m
+            lon1 = m * lon1 + int(georef[baselen_:baselen_ + prec1])
+            lat1 = m * lat1 + int(georef[baselen_ + prec1:])
+    if centerp:
+        unit = unit * 2
+        lat1 = 2 * lat1 + 1
+        lon1 = 2 * lon1 + 1
+    # The integers are exact in a double, so this rounds like the division
+    # of doubles
+    lat = (tile_ * lat1) / unit
+    lon = (tile_ * lon1) / unit
+    prec = prec1
+    return(lat, lon, prec)
+
+if HAVE_NUMPY:
+    def _table(s):
+        return np.frombuffer(s.encode('ascii'), dtype=np.uint8).astype(np.uint32)
+    _NP_LONTILE = _table(lontile_)
+    _NP_LATTILE = _table(lattile_)
+    _NP_DEGREES = _table(degrees_)
+
+    def _valueTable(s):
+        values = np.full(128, -1, dtype=np.int64)
+        for c, i in _values(s).items():
+            values[ord(c)] = i
+        return values
+    _NP_LONTILE_VALUES = _valueTable(lontile_)
+    _NP_LATTILE_VALUES = _valueTable(lattile_)
+    _NP_DEGREES_VALUES = _valueTable(degrees_)
+    _NP_DIGITS_VALUES = _valueTable(digits_)
+
+def encodeArray(lat, lon, prec):
+    """Encode arrays of latitudes and longitudes with the same precision.
+    Returns an array with the same strings as encode and an empty string
+    where encode would raise an exception, and a mask of the valid rows.
+    Requires NumPy."""
+    lat, lon = np.broadcast_arrays(
+        np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+    shape = lat.shape
+    lat = lat.ravel()
+    lon = lon.ravel()
+    valid = (np.isfinite(lat) & np.isfinite(lon) & (lat <= 90) & (lat >= -90) &
+             (lon >= -180) & (lon <= 360))
+    lon = np.where(valid, lon, 0.0)
+    lat = np.where(valid, lat, 0.0)
+    lon = np.where(lon >= 180, lon - 360, lon)
+    lat = np.where(lat == 90, lat - sys.float_info.epsilon, lat)
+    prec = max(-1, min(int(maxprec_), prec))
+    if prec == 1:
+        prec = prec + 1  # Disallow prec = 1
+
+    # The products are below 2**53 so the integers are exact
+    x = (np.floor(lon * m_) - lonorig_ * m_).astype(np.int64)
+    y = (np.floor(lat * m_) - latorig_ * m_).astype(np.int64)
+    ilon, x = np.divmod(x, m_)
+    ilat, y = np.divmod(y, m_)
+    # A longitude just below 180 can round up to 180, for which encode fails
+    valid &= ilon < len(lontile_) * tile_
+    ilon = np.where(valid, ilon, 0)
+    ilat = np.where(valid, ilat, 0)
+
+    width = 2 + (2 if prec >= 0 else 0) + 2 * max(prec, 0)
+    chars = np.empty((lat.size, width), dtype=np.uint32)
+    chars[:, 0] = _NP_LONTILE[ilon // tile_]
+    chars[:, 1] = _NP_LATTILE[ilat // tile_]
+    if prec >= 0:
+        chars[:, 2] = _NP_DEGREES[ilon % tile_]
+        chars[:, 3] = _NP_DEGREES[ilat % tile_]
+        if prec > 0:
+            x //= pow10_[prec]
+            y //= pow10_[prec]
+            for c in range(prec - 1, -1, -1):
+                chars[:, baselen_ + c] = ord('0') + x % base_
+                x //= base_
+                chars[:, baselen_ + prec + c] = ord('0') + y % base_
+                y //= base_
+    chars[~valid] = 0
+    georefs = chars.view('U{}'.format(width)).ravel()
+    return georefs.reshape(shape), valid.reshape(shape)
+
+def decodeArray(georefs, centerp=False):
+    """Decode an array of GEOREF strings. Returns arrays of the latitudes,
+    longitudes and precisions decode gives, NaN and a precision of 0 where
+    decode would raise an exception, and a mask of the valid rows. Requires
+    NumPy."""
+    georefs = np.asarray(georefs)
+    if georefs.dtype.kind != 'U':
+        georefs = georefs.astype('U')
+    shape = georefs.shape
+    georefs = georefs.ravel()
+    n = georefs.size
+    width = max(georefs.dtype.itemsize // 4, baselen_)
+    leng = np.char.str_len(georefs) if n else np.zeros(0, dtype=np.int64)
+    c = georefs.astype('U{}'.format(width)).view(np.uint32).reshape(n, width).astype(np.int64)
+    c = np.where((c >= ord('a')) & (c <= ord('z')), c - 32, c)
+    # Non ASCII characters may change length with upper, leave them to decode
+    other = np.any(c > 127, axis=1)
+    c = np.where(c > 127, 0, c)
+
+    valid = (leng >= baselen_ - 2) & ~other
+    valid &= ~((leng >= 3) & (c[:, 0] == ord('I')) & (c[:, 1] == ord('N')) & (c[:, 2] == ord('V')))
+    k0 = _NP_LONTILE_VALUES[c[:, 0]]
+    k1 = _NP_LATTILE_VALUES[c[:, 1]]
+    k2 = _NP_DEGREES_VALUES[c[:, 2]]
+    k3 = _NP_DEGREES_VALUES[c[:, 3]]
+    valid &= (k0 >= 0) & (k1 >= 0)
+    valid &= (leng == 2) | ((leng >= 4) & (k2 >= 0) & (k3 >= 0))
+    prec1 = np.where(leng < 4, np.where(leng == 2, -1, 0), (leng - baselen_) // 2)
+
+    # The trailing digits
+    pos = np.arange(width)
+    digit = _NP_DIGITS_VALUES[c]
+    trailing = (pos >= baselen_) & (pos < leng[:, None])
+    digits = prec1 > 0
+    valid &= ~digits | (np.all(~trailing | (digit >= 0), axis=1) & (leng % 2 == 0) &
+                        (prec1 != 1) & (prec1 <= maxprec_))
+    p = np.where(valid & digits, prec1, 0)
+    latStart = np.minimum(baselen_ + p, width - 1)
+    firstLon = digit[:, baselen_] if width > baselen_ else np.zeros(n, dtype=np.int64)
+    firstLat = np.take_along_axis(digit, latStart[:, None], axis=1)[:, 0]
+    valid &= (p == 0) | ((firstLon < 6) & (firstLat < 6))
+
+    lon1 = k0 + lonorig_ // tile_
+    lat1 = k1 + latorig_ // tile_
+    unit = np.ones(n, dtype=np.int64)
+    degrees = leng > 2
+    lon1 = np.where(degrees, lon1 * tile_ + k2, lon1)
+    lat1 = np.where(degrees, lat1 * tile_ + k3, lat1)
+    unit = np.where(degrees, tile_, unit)
+    m = np.where(p > 0, 6 * base_ ** np.maximum(p - 1, 0), 1)
+    lonDigits = np.zeros(n, dtype=np.int64)
+    latDigits = np.zeros(n, dtype=np.int64)
+    for i in range(maxprec_):
+        inside = i < p
+        lonDigits = np.where(inside, lonDigits * base_ + digit[:, min(baselen_ + i, width - 1)], lonDigits)
+        latDigit = np.take_along_axis(digit, np.minimum(latStart + i, width - 1)[:, None], axis=1)[:, 0]
+        latDigits = np.where(inside, latDigits * base_ + latDigit, latDigits)
+    lon1 = m * lon1 + lonDigits
+    lat1 = m * lat1 + latDigits
+    unit = unit * m
+    if centerp:
+        unit = unit * 2
+        lat1 = 2 * lat1 + 1
+        lon1 = 2 * lon1 + 1
+    # The integers are exact in a double, so this rounds like decode
+    lat = np.where(valid, (tile_ * lat1) / unit, np.nan)
+    lon = np.where(valid, (tile_ * lon1) / unit, np.nan)
+    prec = np.where(valid, prec1, 0)
+
+    for i in np.flatnonzero(other):
+        try:
+            lat[i], lon[i], prec[i] = decode(str(georefs[i]), centerp)
+            valid[i] = True
+        except Exception:
+            pass
+    return lat.reshape(shape), lon.reshape(shape), prec.reshape(shape), valid.reshape(shape)
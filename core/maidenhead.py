@@ -0,0 +1,264 @@
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+
+def maidenGridCenter(maiden):
+    """
+        maiden is a string the is even and between 2 to 8 characters
+        It returns the center point of a maiden grid and throws an exception
+        on error
+    """
+    if not isinstance(maiden, str):
+        raise TypeError('Maidenhead locator must be a string')
+
+    maiden = maiden.strip().upper()
+
+    N = len(maiden)
+    if not 8 >= N >= 2 and N % 2 == 0:
+        raise ValueError('Maidenhead locator requires 2-8 characters, even number of characters')
+
+    Oa = ord('A')
+    lon = -180.
+    lat = -90.
+# %% first pair
+    isValid(maiden[0], 0)
+    isValid(maiden[1], 0)
+    lon += (ord(maiden[0])-Oa)*20
+    lat += (ord(maiden[1])-Oa)*10
+    if N == 2:
+        lon += 10
+        lat += 5
+# %% second pair
+    if N >= 4:
+        isValid(maiden[2], 1)
+        isValid(maiden[3], 1)
+        lon += int(maiden[2])*2
+        lat += int(maiden[3])*1
+    if N == 4:
+        lon += 1
+        lat += 0.5
+# %%
+    if N >= 6:
+        isValid(maiden[4], 2)
+        isValid(maiden[5], 2)
+        lon += (ord(maiden[4])-Oa) * 5./60
+        lat += (ord(maiden[5])-Oa) * 2.5/60
+    if N == 6:
+        lon += 5./120
+        lat += 2.5/120
+# %%
+    if N == 8:
+        lon += int(maiden[6]) * 5./600
+        lat += int(maiden[7]) * 2.5/600
+        lon += 5./1200
+        lat += 2.5/1200
+
+    return lat, lon
+
+def isValid(c, level):
+    if level == 0:
+        if not 'R' >= c >= 'A':
+            raise ValueError('Invalid maidenhead encoding')
+    if level == 1 or level == 3:
+        if not '9' >= c >= '0':
+            raise ValueError('Invalid maidenhead encoding')
+    if level == 2:
+        if not 'X' >= c >= 'A':
+            raise ValueError('Invalid maidenhead encoding')
+    return(True)
+
+def toMaiden(lat, lon=None,precision = 3):
+    """
+    Returns a maidenhead string for latitude, longitude at specified level.
+
+    Parameters
+    ----------
+
+    lat : float or tuple of float
+        latitude or tuple of latitude, longitude
+    lon : float, optional
+        longitude (if not given tuple)
+    precision : int, optional
+        level of precision (length of maidenhead grid string output)
+
+    Returns
+    -------
+
+    maiden : str
+        Maidenhead grid string of specified precision
+    """
+
+    if lon < -180.0 or lon > 180.0 or lat < -90.0 or lat > 90.0:
+        raise ValueError('Maidenhead: invalid latitude and longitude')
+    A = ord('A')
+    a = divmod(lon+180, 20)
+    b = divmod(lat+90, 10)
+    maiden = chr(A+int(a[0])) + chr(A+int(b[0]))
+    lon = a[1] / 2.
+    lat = b[1]
+    i = 1
+    while i < precision:
+        i += 1
+        a = divmod(lon, 1)
+        b = divmod(lat, 1)
+        if not (i % 2):
+            maiden += str(int(a[0])) + str(int(b[0]))
+            lon = 24 * a[1]
+            lat = 24 * b[1]
+        else:
+            maiden += chr(A+int(a[0])) + chr(A+int(b[0]))
+            lon = 10 * a[1]
+            lat = 10 * b[1]
+
+    if len(maiden) >= 6:
+        maiden = maiden[:4] + maiden[4:6].lower() + maiden[6:]
+
+    return maiden
+
+
+def toMaidenArray(lat, lon, precision=3):
+    """
+    Returns maidenhead strings for arrays of latitudes and longitudes. Gives
+    the same strings as toMaiden. Requires NumPy.
+
+    Parameters
+    ----------
+
+    lat : array_like of float
+        latitudes
+    lon : array_like of float
+        longitudes
+    precision : int, optional
+        level of precision (length of maidenhead grid string output)
+
+    Returns
+    -------
+
+    maiden : ndarray of str
+        Maidenhead grid strings of specified precision, empty where the
+        latitude or longitude is invalid
+    valid : ndarray of bool
+        True where the latitude and longitude are valid
+    """
+    lat, lon = np.broadcast_arrays(
+        np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+    shape = lat.shape
+    lat = lat.ravel()
+    lon = lon.ravel()
+    with np.errstate(invalid='ignore'):
+        valid = (lon >= -180.0) & (lon <= 180.0) & (lat >= -90.0) & (lat <= 90.0)
+    lon = np.where(valid, lon, 0.0)
+    lat = np.where(valid, lat, 0.0)
+
+    pairs = max(precision, 1)
+    chars = np.empty((lat.size, 2 * pairs), dtype=np.uint32)
+    A = ord('A')
+    a = np.divmod(lon + 180, 20)
+    b = np.divmod(lat + 90, 10)
+    chars[:, 0] = A + a[0]
+    chars[:, 1] = A + b[0]
+    lon = a[1] / 2.
+    lat = b[1]
+    for i in range(2, pairs + 1):
+        a = np.divmod(lon, 1)
+        b = np.divmod(lat, 1)
+        if not (i % 2):
+            first = ord('0')
+            lon = 24 * a[1]
+            lat = 24 * b[1]
+        else:
+            # The third pair is lower case
+            first = ord('a') if i == 3 else A
+            lon = 10 * a[1]
+            lat = 10 * b[1]
+        chars[:, 2 * i - 2] = first + a[0]
+        chars[:, 2 * i - 1] = first + b[0]
+
+    chars[~valid] = 0
+    maiden = chars.view('U{}'.format(2 * pairs)).ravel()
+    return maiden.reshape(shape), valid.reshape(shape)
+
+
+def maidenGridCenterArray(maiden):
+    """
+    Returns the center points of an array of maidenhead strings. Gives the
+    same coordinates as maidenGridCenter. Requires NumPy.
+
+    Parameters
+    ----------
+
+    maiden : array_like of str
+        maidenhead grid strings
+
+    Returns
+    -------
+
+    lat : ndarray of float
+        latitudes of the centers, NaN where the string is invalid
+    lon : ndarray of float
+        longitudes of the centers, NaN where the string is invalid
+    valid : ndarray of bool
+        True where the string is valid
+    """
+    maiden = np.asarray(maiden)
+    if maiden.dtype.kind != 'U':
+        maiden = maiden.astype('U')
+    shape = maiden.shape
+    maiden = maiden.ravel()
+    n = maiden.size
+    width = max(maiden.dtype.itemsize // 4, 8)
+    N = np.char.str_len(maiden) if n else np.zeros(0, dtype=np.int64)
+    c = maiden.astype('U{}'.format(width)).view(np.uint32).reshape(n, width).astype(np.int64)
+    c = np.where((c >= ord('a')) & (c <= ord('z')), c - 32, c)
+    Oa = ord('A')
+    O0 = ord('0')
+
+    def between(i, low, high):
+        return (c[:, i] >= ord(low)) & (c[:, i] <= ord(high))
+
+    # Odd lengths other than 1 are accepted by maidenGridCenter and give
+    # the corner of the last complete pair
+    valid = ((N >= 2) & (N <= 8)) | ((N % 2 == 1) & (N > 1))
+    valid &= between(0, 'A', 'R') & between(1, 'A', 'R')
+    valid &= (N < 4) | (between(2, '0', '9') & between(3, '0', '9'))
+    valid &= (N < 6) | (between(4, 'A', 'X') & between(5, 'A', 'X'))
+    valid &= (N != 8) | (between(6, '0', '9') & between(7, '0', '9'))
+    # Leave strings that need stripping, and non ASCII characters that may
+    # change with upper or be accepted by int, to maidenGridCenter
+    inside = np.arange(width) < N[:, None]
+    other = np.any(inside & ((c > 127) | (c == 32) | ((c >= 9) & (c <= 13)) |
+                             ((c >= 28) & (c <= 31))), axis=1)
+    valid &= ~other
+
+    lon = np.full(n, -180.)
+    lat = np.full(n, -90.)
+    lon = lon + (c[:, 0] - Oa) * 20
+    lat = lat + (c[:, 1] - Oa) * 10
+    lon = np.where(N == 2, lon + 10, lon)
+    lat = np.where(N == 2, lat + 5, lat)
+    lon = np.where(N >= 4, lon + (c[:, 2] - O0) * 2, lon)
+    lat = np.where(N >= 4, lat + (c[:, 3] - O0) * 1, lat)
+    lon = np.where(N == 4, lon + 1, lon)
+    lat = np.where(N == 4, lat + 0.5, lat)
+    lon = np.where(N >= 6, lon + (c[:, 4] - Oa) * 5. / 60, lon)
+    lat = np.where(N >= 6, lat + (c[:, 5] - Oa) * 2.5 / 60, lat)
+    lon = np.where(N == 6, lon + 5. / 120, lon)
+    lat = np.where(N == 6, lat + 2.5 / 120, lat)
+    lon = np.where(N == 8, lon + (c[:, 6] - O0) * 5. / 600, lon)
+    lat = np.where(N == 8, lat + (c[:, 7] - O0) * 2.5 / 600, lat)
+    lon = np.where(N == 8, lon + 5. / 1200, lon)
+    lat = np.where(N == 8, lat + 2.5 / 1200, lat)
+    lat = np.where(valid, lat, np.nan)
+    lon = np.where(valid, lon, np.nan)
+
+    for i in np.flatnonzero(other):
+        try:
+            lat[i], lon[i] = maidenGridCenter(str(maiden[i]))
+            valid[i] = True
+        except Exception:
+            pass
+    return lat.reshape(shape), lon.reshape(shape), valid.reshape(shape)
+
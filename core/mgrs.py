@@ -0,0 +1,1043 @@
+# -*- coding: utf-8 -*-
+"""
+***************************************************************************
+    mgrs.py
+    ---------------------
+    Date                 : August 2016, October 2019
+    Author               : Alex Bruy, Planet Federal
+    Copyright            : (C) 2016 Boundless, http://boundlessgeo.com
+                         : (C) 2019 Planet Inc, https://planet.com
+***************************************************************************
+*                                                                         *
+*   This program is free software; you can redistribute it and/or modify  *
+*   it under the terms of the GNU General Public License as published by  *
+*   the Free Software Foundation; either version 2 of the License, or     *
+*   (at your option) any later version.                                   *
+*                                                                         *
+***************************************************************************
+"""
+from builtins import str
+from builtins import range
+__author__ = 'Planet Federal'
+__date__ = 'October 2019'
+__copyright__ = '(C) 2019 Planet Inc, https://planet.com'
+
+# This will get replaced with a git SHA1 when you do a git archive
+__revision__ = '$Format:%H$'
+
+
+import sys
+import re
+import math
+import logging
+
+from . import tmerc
+from . import polarstereo
+from . import transformBackends
+
+if tmerc.HAVE_NUMPY:
+    import numpy as np
+
+# Transformation backends, see transformBackends.py
+BACKENDS = tuple(transformBackends.backendNames())
+
+log = logging.getLogger(__name__)
+
+BADLY_FORMED = \
+    'An MGRS string error: string too long, too short, or badly formed'
+
+# Whether to add the extra half-multiplier to UTM coords per precision,
+# added in geotrans3.8
+GEOTRANS_HALFMULTI = False
+
+ALPHABET = {l: c for c, l in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}
+
+# Optional zone, the three letters and the easting and northing digits
+_MGRS_RE = re.compile(r'(\d{0,2})([A-Za-z]{3})(\d{0,10})')
+
+ONEHT = 100000.0
+TWOMIL = 2000000.0
+
+MAX_PRECISION = 5         # Maximum precision of easting & northing
+MIN_EAST_NORTH = 0
+MAX_EAST_NORTH = 4000000
+
+# letter,
+# 2nd letter range - low,
+# 2nd letter range - high,
+# 3rd letter range - high (UPS),
+# false easting based on 2nd letter,
+# false northing based on 3rd letter
+UPS_CONSTANTS = {
+    0: (ALPHABET['A'], ALPHABET['J'], ALPHABET['Z'], ALPHABET['Z'],
+        800000.0, 800000.0),
+    1: (ALPHABET['B'], ALPHABET['A'], ALPHABET['R'], ALPHABET['Z'],
+        2000000.0, 800000.0),
+    2: (ALPHABET['Y'], ALPHABET['J'], ALPHABET['Z'], ALPHABET['P'],
+        800000.0, 1300000.0),
+    3: (ALPHABET['Z'], ALPHABET['A'], ALPHABET['J'], ALPHABET['P'],
+        2000000.0, 1300000.0)
+}
+
+# letter, minimum northing, upper latitude, lower latitude, northing offset
+LATITUDE_BANDS = [(ALPHABET['C'], 1100000.0, -72.0, -80.5, 0.0),
+                  (ALPHABET['D'], 2000000.0, -64.0, -72.0, 2000000.0),
+                  (ALPHABET['E'], 2800000.0, -56.0, -64.0, 2000000.0),
+                  (ALPHABET['F'], 3700000.0, -48.0, -56.0, 2000000.0),
+                  (ALPHABET['G'], 4600000.0, -40.0, -48.0, 4000000.0),
+                  (ALPHABET['H'], 5500000.0, -32.0, -40.0, 4000000.0),
+                  (ALPHABET['J'], 6400000.0, -24.0, -32.0, 6000000.0),
+                  (ALPHABET['K'], 7300000.0, -16.0, -24.0, 6000000.0),
+                  (ALPHABET['L'], 8200000.0, -8.0, -16.0, 8000000.0),
+                  (ALPHABET['M'], 9100000.0, 0.0, -8.0, 8000000.0),
+                  (ALPHABET['N'], 0.0, 8.0, 0.0, 0.0),
+                  (ALPHABET['P'], 800000.0, 16.0, 8.0, 0.0),
+                  (ALPHABET['Q'], 1700000.0, 24.0, 16.0, 0.0),
+                  (ALPHABET['R'], 2600000.0, 32.0, 24.0, 2000000.0),
+                  (ALPHABET['S'], 3500000.0, 40.0, 32.0, 2000000.0),
+                  (ALPHABET['T'], 4400000.0, 48.0, 40.0, 4000000.0),
+                  (ALPHABET['U'], 5300000.0, 56.0, 48.0, 4000000.0),
+                  (ALPHABET['V'], 6200000.0, 64.0, 56.0, 6000000.0),
+                  (ALPHABET['W'], 7000000.0, 72.0, 64.0, 6000000.0),
+                  (ALPHABET['X'], 7900000.0, 84.5, 72.0, 6000000.0)]
+
+# Lookup tables shared by the scalar and array functions, built once so that
+# every step of a conversion is a single indexed read.
+
+_LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# Easting/northing multiplier by precision
+_SCALES = (1.0e5, 1.0e4, 1.0e3, 1.0e2, 1.0e1, 1.0e0)
+
+# Latitude band letters, indexed by int((latitude + 80) / 8), X being 12
+# degrees high
+_BAND_LETTERS = tuple(band[0] for band in LATITUDE_BANDS)
+
+# Minimum northing and northing offset by latitude band letter
+_BAND_NORTHINGS = tuple(
+    next(((band[1], band[4]) for band in LATITUDE_BANDS if band[0] == letter),
+         None)
+    for letter in range(len(_LETTERS)))
+
+# 2nd letter low value, 2nd letter high value and pattern offset by zone,
+# from the set number (zone % 6) of the zone. Zone 61 is included because
+# toMgrs encodes 84N and 80S as UTM in the UPS "zone".
+_SET_GRID_VALUES = {
+    1: (ALPHABET['A'], ALPHABET['H'], 0.0),
+    2: (ALPHABET['J'], ALPHABET['R'], 500000.0),
+    3: (ALPHABET['S'], ALPHABET['Z'], 0.0),
+    4: (ALPHABET['A'], ALPHABET['H'], 500000.0),
+    5: (ALPHABET['J'], ALPHABET['R'], 0.0),
+    6: (ALPHABET['S'], ALPHABET['Z'], 500000.0)
+}
+_GRID_VALUES = tuple(_SET_GRID_VALUES[zone % 6 or 6] for zone in range(62))
+
+# 2nd letter by zone and 100 km column (int(easting / 100000) - 1), the
+# J-R set skips O
+_COLUMN_LETTERS = tuple(
+    tuple(low + col + (low == ALPHABET['J'] and low + col > ALPHABET['N'])
+          for col in range(len(_LETTERS)))
+    for low, _, _ in _GRID_VALUES)
+
+# Easting of the 100 km column by zone and 2nd letter, None if the letter is
+# not valid in the zone
+_COLUMN_EASTINGS = tuple(
+    tuple((letter - low + 1 - (low == ALPHABET['J'] and
+                               letter > ALPHABET['O'])) * ONEHT
+          if low <= letter <= high else None
+          for letter in range(len(_LETTERS)))
+    for low, high, _ in _GRID_VALUES)
+
+# 3rd letter by 100 km row (int(northing / 100000)), skipping I and O
+_ROW_LETTERS = tuple(ALPHABET[c] for c in _LETTERS if c not in 'IO')
+
+# Northing of the 100 km row by 3rd letter, None for letters that are not
+# valid in UTM
+_ROW_NORTHINGS = tuple(
+    _ROW_LETTERS.index(letter) * ONEHT
+    if letter in _ROW_LETTERS and letter <= ALPHABET['V'] else None
+    for letter in range(len(_LETTERS)))
+
+if tmerc.HAVE_NUMPY:
+    def _floatTable(table):
+        return np.array([np.nan if v is None else v for v in table])
+
+    _NP_GRID_VALUES = np.array(_GRID_VALUES)
+    _NP_BAND_LETTERS = np.array(_BAND_LETTERS)
+    _NP_BAND_NORTHINGS = np.array(
+        [(np.nan, np.nan) if v is None else v for v in _BAND_NORTHINGS])
+    _NP_COLUMN_LETTERS = np.array(_COLUMN_LETTERS)
+    _NP_COLUMN_EASTINGS = np.array([_floatTable(t) for t in _COLUMN_EASTINGS])
+    _NP_ROW_LETTERS = np.array(_ROW_LETTERS)
+    _NP_ROW_NORTHINGS = _floatTable(_ROW_NORTHINGS)
+
+
+class MgrsException(Exception):
+    pass
+
+
+def getBackend():
+    """ Returns the name of the transformation backend used when none is
+    passed to toMgrs/toWgs, choosing one if that has not happened yet
+    """
+    return transformBackends.getBackend()
+
+
+def setBackend(name):
+    """ Sets the transformation backend used by this process
+
+    @param name - one of BACKENDS, or None to choose automatically again
+    """
+    try:
+        transformBackends.setBackend(name)
+    except transformBackends.TransformBackendException as e:
+        raise MgrsException(str(e))
+
+
+def transformCacheInfo():
+    """ Returns the transformation cache statistics
+
+    @returns - dict with hits, misses, maxsize and currsize (entries held by
+    the calling thread)
+    """
+    return transformBackends.cacheInfo()
+
+
+def clearTransformCache():
+    """ Drops all cached transformation objects and resets the counters
+    """
+    transformBackends.clearCache()
+
+
+def _transform(x1, y1, epsg_src, epsg_dst, polar=False, backend=None):
+    # UPS always uses the built-in polar stereographic projection, which
+    # avoids the axis order differences of EPSG:32661/32761 between the
+    # GDAL and PROJ versions
+    if polar:
+        backend = 'native'
+    try:
+        return transformBackends.transform(x1, y1, epsg_src, epsg_dst,
+                                           backend=backend)
+    except transformBackends.TransformBackendException as e:
+        raise MgrsException(str(e))
+
+
+def toMgrs(latitude, longitude, precision=5, backend=None):
+    """ Converts geodetic (latitude and longitude) coordinates to an MGRS
+    coordinate string, according to the current ellipsoid parameters.
+
+    @param latitude - latitude value
+    @param longitude - longitude value
+    @param precision - precision level of MGRS string
+    @param backend - transformation backend, None for getBackend()
+    @returns - MGRS coordinate string
+    """
+
+    # To avoid precision issues, which appear when using more than
+    # 9 decimal places
+    # This may no longer be an issue for Python >= 3
+    if sys.version_info.major < 3:
+        latitude = round(latitude, 9)
+        longitude = round(longitude, 9)
+
+    if math.fabs(latitude) > 90:
+        raise MgrsException(
+            'Latitude outside of valid range (-90 to 90 degrees).')
+
+    if (longitude < -180) or (longitude > 360):
+        raise MgrsException(
+            'Longitude outside of valid range (-180 to 360 degrees).')
+
+    if (precision < 0) or (precision > MAX_PRECISION):
+        raise MgrsException('The precision must be between 0 and 5 inclusive.')
+
+    hemisphere, zone, epsg = _epsgForWgs(latitude, longitude)
+
+    x, y = _transform(longitude, latitude, 4326, epsg, polar=(zone == 61),
+                      backend=backend)
+
+    if (latitude < -80) or (latitude > 84):
+        # Convert to UPS
+        mgrs = _upsToMgrs(hemisphere, x, y, precision)
+    else:
+        # Convert to UTM
+        mgrs = _utmToMgrs(
+            zone, hemisphere, latitude, longitude, x, y, precision)
+
+    return mgrs
+
+
+def toWgs(mgrs, backend=None):
+    """ Converts an MGRS coordinate string to geodetic (latitude and longitude)
+    coordinates
+
+    @param mgrs - MGRS coordinate string
+    @param backend - transformation backend, None for getBackend()
+    @returns - tuple containning latitude and longitude values
+    """
+    zone, letters, easting, northing, precision = parse(mgrs)
+
+    utm = zone != 0
+    if utm:
+        zone, hemisphere, easting, northing = \
+            _mgrsToUtm(zone, letters, easting, northing)
+    else:
+        zone, hemisphere, easting, northing = \
+            _mgrsToUps(zone, letters, easting, northing)
+
+    epsg = _epsgForUtm(zone, hemisphere)
+
+    longitude, latitude = _transform(
+        easting, northing, epsg, 4326, polar=(not utm), backend=backend)
+
+    # Note y, x axis order for output
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug('%s -> e: %s, n: %s -> lat: %s, lon: %s',
+                  mgrs, easting, northing, latitude, longitude)
+
+    return latitude, longitude
+
+
+def parse(mgrs):
+    """ Breaks down an MGRS coordinate string into its component parts in a
+    single pass. White space is ignored and a missing zone (UPS) is zone 0.
+
+    @param mgrs - MGRS coordinate string
+    @returns - tuple containing UTM zone, MGRS letters (alphabet index, A is
+    0), easting and northing within the 100 km square and precision
+    """
+    if isinstance(mgrs, bytes):
+        mgrs = mgrs.decode()
+    elif not isinstance(mgrs, str):
+        raise MgrsException(BADLY_FORMED)
+
+    m = _MGRS_RE.fullmatch(''.join(mgrs.split()))
+    if m is None:
+        raise MgrsException(BADLY_FORMED)
+    zone, letters, digits = m.groups()
+
+    zone = int(zone) if zone else 0
+    if zone > 60:
+        raise MgrsException(BADLY_FORMED)
+
+    letters = [ALPHABET[c] for c in letters.upper()]
+    if ALPHABET['I'] in letters or ALPHABET['O'] in letters:
+        raise MgrsException(BADLY_FORMED)
+
+    count = len(digits)
+    if count % 2:
+        raise MgrsException(BADLY_FORMED)
+    precision = count // 2
+    if precision > 0:
+        multiplier = _SCALES[precision]
+        easting = float(digits[:precision]) * multiplier
+        northing = float(digits[precision:]) * multiplier
+        if GEOTRANS_HALFMULTI:
+            half_multi = multiplier * 0.5  # added in geotrans3.8
+            easting += half_multi
+            northing += half_multi
+    else:
+        easting = 0.0
+        northing = 0.0
+
+    return zone, letters, easting, northing, precision
+
+
+def tryParse(mgrs):
+    """ Same as parse but returns None instead of raising an exception for an
+    invalid MGRS coordinate string
+
+    @param mgrs - MGRS coordinate string
+    @returns - tuple containing UTM zone, MGRS letters, easting, northing and
+    precision or None
+    """
+    try:
+        return parse(mgrs)
+    except MgrsException:
+        return None
+
+
+# Distance in meters from a whole meter (or half meter) below which the
+# batch encoder leaves a row to toMgrs. The digits and letters of an MGRS
+# string are truncated eastings and northings, so only values this close to a
+# boundary can be affected by the last bits of the projection, which differ
+# slightly between the built-in engine and GDAL/PROJ.
+_ARRAY_EDGE_TOL = 1e-6
+
+
+def _requireNumpy():
+    if not tmerc.HAVE_NUMPY:
+        raise MgrsException('The MGRS array functions require NumPy.')
+
+
+def _nearEdge(values):
+    frac = values - np.floor(values)
+    return ((frac < _ARRAY_EDGE_TOL) | (frac > 1 - _ARRAY_EDGE_TOL) |
+            (np.abs(frac - 0.5) < _ARRAY_EDGE_TOL))
+
+
+def _gridDigits(values):
+    values = np.fmod(values + 1e-8, 100000.0)
+    values = np.where(values >= 99999.5, 99999.0, values)
+    return np.trunc(values).astype(np.int64)
+
+
+def _letterSkip(letters, *skips):
+    """ Applies the letter skipping steps of _upsToMgrs in order,
+    where each step is a (letter, increment) pair
+    """
+    for letter, increment in skips:
+        letters = letters + np.where(letters > letter, increment, 0)
+    return letters
+
+
+def toMgrsArray(latitude, longitude, precision=5, backend=None):
+    """ Converts arrays of geodetic coordinates to MGRS coordinate strings.
+    The result is identical to calling toMgrs on every point. Rows that toMgrs
+    rejects give an empty string.
+
+    @param latitude - array of latitude values
+    @param longitude - array of longitude values
+    @param precision - precision level of MGRS strings
+    @param backend - transformation backend for the rows left to toMgrs
+    @returns - NumPy array of MGRS coordinate strings
+    """
+    _requireNumpy()
+    if (precision < 0) or (precision > MAX_PRECISION):
+        raise MgrsException('The precision must be between 0 and 5 inclusive.')
+
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    latitude, longitude = np.broadcast_arrays(latitude, longitude)
+    shape = latitude.shape
+    lat = latitude.ravel()
+    lon = longitude.ravel()
+
+    valid = (np.abs(lat) <= 90) & (lon >= -180) & (lon <= 360)
+    polar = valid & ((lat < -80) | (lat > 84))
+    utm = valid & (lat > -80) & (lat < 84)
+    # At exactly 84N and 80S _epsgForWgs picks UPS while toMgrs encodes as
+    # UTM, leave those to toMgrs
+    scalar = valid & ~polar & ~utm
+
+    width = 5 + 2 * precision
+    buf = np.zeros((lat.size, width), dtype=np.uint8)
+    powers = 10 ** np.arange(4, 4 - precision, -1, dtype=np.int64)
+
+    def fill(rows, zone, letters, easting, northing):
+        if zone is None:
+            buf[rows, 0:2] = ord(' ')
+        else:
+            buf[rows, 0] = ord('0') + zone // 10
+            buf[rows, 1] = ord('0') + zone % 10
+        for i, letter in enumerate(letters):
+            buf[rows, 2 + i] = ord('A') + letter
+        e = _gridDigits(easting)
+        n = _gridDigits(northing)
+        for i, p in enumerate(powers):
+            buf[rows, 5 + i] = ord('0') + e // p % 10
+            buf[rows, 5 + precision + i] = ord('0') + n // p % 10
+
+    # UTM
+    rows = np.flatnonzero(utm)
+    if rows.size:
+        la = lat[rows]
+        lo = lon[rows]
+        zone = np.where(lo < 180, np.trunc(31 + (lo / 6.0)),
+                        np.trunc((lo / 6) - 29)).astype(np.int64)
+        zone[zone > 60] = 1
+        zone[(56.0 <= la) & (la < 64.0) & (3.0 <= lo) & (lo < 12.0)] = 32
+        svalbard = (72.0 <= la) & (la < 84.0)
+        for lo_min, lo_max, z in ((0.0, 9.0, 31), (9.0, 21.0, 33),
+                                  (21.0, 33.0, 35), (33.0, 42.0, 37)):
+            zone[svalbard & (lo_min <= lo) & (lo < lo_max)] = z
+
+        easting, northing = tmerc.toUtmArray(la, lo, zone, la >= 0)
+        column = np.trunc((easting / ONEHT) - 1).astype(np.int64)
+        edge = _nearEdge(easting + 1e-8) | _nearEdge(northing + 1e-8) | \
+            (column < 0) | (column >= len(_LETTERS))
+        scalar[rows[edge]] = True
+        keep = ~edge
+        rows = rows[keep]
+        la = la[keep]
+        zone = zone[keep]
+        column = column[keep]
+        easting = easting[keep]
+        northing = northing[keep]
+
+        patternOffset = _NP_GRID_VALUES[zone, 2]
+
+        band = np.trunc(((la + 80.0) / 8.0) + 1.0e-12).astype(np.int64)
+        letter0 = _NP_BAND_LETTERS[np.minimum(band, len(_BAND_LETTERS) - 1)]
+
+        cycles = np.maximum(np.floor(northing / TWOMIL), 0)
+        northing = northing - cycles * TWOMIL
+        northing = np.where(northing >= TWOMIL, northing - TWOMIL, northing)
+        northing = np.where(northing < 0, northing + TWOMIL, northing)
+        northing = northing + patternOffset
+        northing = np.where(northing >= TWOMIL, northing - TWOMIL, northing)
+
+        letter2 = _NP_ROW_LETTERS[np.trunc(northing / ONEHT).astype(np.int64)]
+        letter1 = _NP_COLUMN_LETTERS[zone, column]
+
+        fill(rows, zone, (letter0, letter1, letter2), easting, northing)
+
+    # UPS
+    rows = np.flatnonzero(polar)
+    if rows.size:
+        north = lat[rows] >= 0
+        easting, northing = polarstereo.toUpsArray(lat[rows], lon[rows], north)
+        edge = _nearEdge(easting + 1e-8) | _nearEdge(northing + 1e-8)
+        scalar[rows[edge]] = True
+        keep = ~edge
+        rows = rows[keep]
+        north = north[keep]
+        easting = easting[keep]
+        northing = northing[keep]
+
+        east = easting >= TWOMIL
+        letter0 = np.where(north, np.where(east, ALPHABET['Z'], ALPHABET['Y']),
+                           np.where(east, ALPHABET['B'], ALPHABET['A']))
+        ups = np.array([UPS_CONSTANTS[i] for i in range(4)])
+        idx = np.where(north, letter0 - 22, letter0)
+        ltr2LowValue = ups[idx, 1].astype(np.int64)
+        falseEasting = ups[idx, 4]
+        falseNorthing = ups[idx, 5]
+
+        letter2 = _NP_ROW_LETTERS[
+            np.trunc((northing - falseNorthing) / ONEHT).astype(np.int64)]
+        letter1 = ltr2LowValue + \
+            np.trunc((easting - falseEasting) / ONEHT).astype(np.int64)
+        letter1 = np.where(
+            east,
+            _letterSkip(letter1, (ALPHABET['C'], 2), (ALPHABET['H'], 1),
+                        (ALPHABET['L'], 3)),
+            _letterSkip(letter1, (ALPHABET['L'], 3), (ALPHABET['U'], 2)))
+
+        fill(rows, None, (letter0, letter1, letter2), easting, northing)
+
+    result = buf.view('S{0}'.format(width)).ravel().astype(
+        'U{0}'.format(width))
+    for i in np.flatnonzero(scalar):
+        try:
+            result[i] = toMgrs(float(lat[i]), float(lon[i]), precision,
+                               backend=backend)
+        except Exception:
+            result[i] = ''
+
+    return result.reshape(shape)
+
+
+def toWgsArray(mgrs, exact=False, backend=None):
+    """ Converts an array of MGRS coordinate strings to geodetic coordinates.
+    Strings that toWgs rejects give NaN.
+
+    The strings are parsed and the grid squares resolved in bulk. By default
+    the eastings and northings are then projected with the array version of
+    the built-in engine, which agrees with toWgs to within a few nanometers.
+    With exact set, every point is projected like toWgs does, so the result is
+    bitwise identical to calling toWgs on every string.
+
+    @param mgrs - array or sequence of MGRS coordinate strings
+    @param exact - project every point with the same backend as toWgs
+    @param backend - transformation backend, None for getBackend()
+    @returns - tuple containing arrays of latitude and longitude values
+    """
+    _requireNumpy()
+    values = np.asarray(mgrs, dtype=object)
+    shape = values.shape
+    values = values.ravel()
+    count = values.size
+
+    zone = np.zeros(count, dtype=np.int64)
+    letters = np.zeros((count, 3), dtype=np.int64)
+    easting = np.zeros(count)
+    northing = np.zeros(count)
+    valid = np.zeros(count, dtype=bool)
+    for i, s in enumerate(values):
+        parsed = tryParse(s)
+        if parsed is not None:
+            zone[i], letters[i], easting[i], northing[i], _ = parsed
+            valid[i] = True
+
+    letter0 = letters[:, 0]
+    letter1 = letters[:, 1]
+    letter2 = letters[:, 2]
+
+    # UTM
+    utm = valid & (zone > 0)
+    gridIndex = np.where(valid, zone, 0)
+    gridEasting = _NP_COLUMN_EASTINGS[gridIndex, letter1]
+    rowLetterNorthing = _NP_ROW_NORTHINGS[letter2]
+    minNorthing = _NP_BAND_NORTHINGS[letter0, 0]
+    northingOffset = _NP_BAND_NORTHINGS[letter0, 1]
+    utm &= ~(np.isnan(gridEasting) | np.isnan(rowLetterNorthing) |
+             np.isnan(minNorthing))
+    patternOffset = _NP_GRID_VALUES[gridIndex, 2]
+
+    gridNorthing = rowLetterNorthing - patternOffset
+    gridNorthing += np.where(gridNorthing < 0, TWOMIL, 0.0)
+    gridNorthing += northingOffset
+    gridNorthing += np.where(gridNorthing < minNorthing, TWOMIL, 0.0)
+    utmEasting = easting + gridEasting
+    utmNorthing = northing + gridNorthing
+
+    # UPS
+    ups = valid & (zone == 0) & np.isin(letter0, (ALPHABET['A'], ALPHABET['B'],
+                                                  ALPHABET['Y'], ALPHABET['Z']))
+    constants = np.array([UPS_CONSTANTS[i] for i in range(4)])
+    idx = np.where(letter0 >= ALPHABET['Y'], letter0 - 22, letter0) & 3
+    ltr2LowValue = constants[idx, 1].astype(np.int64)
+    ups &= (letter1 >= ltr2LowValue) & (letter1 <= constants[idx, 2]) & \
+        (letter2 <= constants[idx, 3])
+
+    gridNorthing = letter2 * ONEHT + constants[idx, 5]
+    gridNorthing -= np.where(letter2 > ALPHABET['I'], ONEHT, 0.0)
+    gridNorthing -= np.where(letter2 > ALPHABET['O'], ONEHT, 0.0)
+    gridEasting = (letter1 - ltr2LowValue) * ONEHT + constants[idx, 4]
+    fromA = ltr2LowValue == ALPHABET['A']
+    gridEasting -= np.where(~fromA & (letter1 > ALPHABET['L']), 300000.0, 0.0)
+    gridEasting -= np.where(~fromA & (letter1 > ALPHABET['U']), 200000.0, 0.0)
+    gridEasting -= np.where(fromA & (letter1 > ALPHABET['C']), 200000.0, 0.0)
+    gridEasting -= np.where(fromA & (letter1 > ALPHABET['I']), ONEHT, 0.0)
+    gridEasting -= np.where(fromA & (letter1 > ALPHABET['L']), 300000.0, 0.0)
+    upsEasting = easting + gridEasting
+    upsNorthing = northing + gridNorthing
+
+    latitude = np.full(count, np.nan)
+    longitude = np.full(count, np.nan)
+    north = letter0 >= ALPHABET['N']
+    if exact:
+        for i in np.flatnonzero(utm | ups):
+            hemisphere = 'N' if north[i] else 'S'
+            if utm[i]:
+                longitude[i], latitude[i] = _transform(
+                    float(utmEasting[i]), float(utmNorthing[i]),
+                    _epsgForUtm(int(zone[i]), hemisphere), 4326,
+                    backend=backend)
+            else:
+                longitude[i], latitude[i] = _transform(
+                    float(upsEasting[i]), float(upsNorthing[i]),
+                    _epsgForUtm(0, hemisphere), 4326, polar=True)
+    else:
+        rows = np.flatnonzero(utm)
+        latitude[rows], longitude[rows] = tmerc.fromUtmArray(
+            utmEasting[rows], utmNorthing[rows], zone[rows], north[rows])
+        rows = np.flatnonzero(ups)
+        latitude[rows], longitude[rows] = polarstereo.fromUpsArray(
+            upsEasting[rows], upsNorthing[rows], north[rows])
+
+    # Leave the remaining well formed strings to toWgs for its error checks
+    for i in np.flatnonzero(valid & ~(utm | ups)):
+        try:
+            latitude[i], longitude[i] = toWgs(values[i], backend=backend)
+        except Exception:
+            pass
+
+    return latitude.reshape(shape), longitude.reshape(shape)
+
+
+def _upsToMgrs(hemisphere, easting, northing, precision):
+    """ Converts UPS (hemisphere, easting, and northing) coordinates
+    to an MGRS coordinate string.
+
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @param easting - easting/X in meters
+    @param northing - northing/Y in meters
+    @param precision - precision level of MGRS string
+    @returns - MGRS coordinate string
+    """
+    if hemisphere not in ['N', 'S']:
+        raise MgrsException('Invalid hemisphere ("N" or "S").')
+
+    if (easting < MIN_EAST_NORTH) or (easting > MAX_EAST_NORTH):
+        raise MgrsException(
+            'Easting outside of valid range (100,000 to 900,000 meters '
+            'for UTM, 0 to 4,000,000 meters for UPS).')
+
+    if (northing < MIN_EAST_NORTH) or (northing > MAX_EAST_NORTH):
+        raise MgrsException(
+            'Northing outside of valid range (0 to 10,000,000 meters for UTM, '
+            '0 to 4,000,000 meters for UPS).')
+
+    if (precision < 0) or (precision > MAX_PRECISION):
+        raise MgrsException('The precision must be between 0 and 5 inclusive.')
+
+    letters = [None, None, None]
+    if hemisphere == 'N':
+        if easting >= TWOMIL:
+            letters[0] = ALPHABET['Z']
+        else:
+            letters[0] = ALPHABET['Y']
+
+        idx = letters[0] - 22
+        ltr2LowValue = UPS_CONSTANTS[idx][1]
+        falseEasting = UPS_CONSTANTS[idx][4]
+        falseNorthing = UPS_CONSTANTS[idx][5]
+    else:
+        if easting >= TWOMIL:
+            letters[0] = ALPHABET['B']
+        else:
+            letters[0] = ALPHABET['A']
+
+        ltr2LowValue = UPS_CONSTANTS[letters[0]][1]
+        falseEasting = UPS_CONSTANTS[letters[0]][4]
+        falseNorthing = UPS_CONSTANTS[letters[0]][5]
+
+    gridNorthing = northing
+    gridNorthing = gridNorthing - falseNorthing
+
+    letters[2] = int(gridNorthing / ONEHT)
+
+    if letters[2] > ALPHABET['H']:
+        letters[2] = letters[2] + 1
+
+    if letters[2] > ALPHABET['N']:
+        letters[2] = letters[2] + 1
+
+    gridEasting = easting
+    gridEasting = gridEasting - falseEasting
+    letters[1] = ltr2LowValue + int(gridEasting / ONEHT)
+
+    if easting < TWOMIL:
+        if letters[1] > ALPHABET['L']:
+            letters[1] = letters[1] + 3
+
+        if letters[1] > ALPHABET['U']:
+            letters[1] = letters[1] + 2
+    else:
+        if letters[1] > ALPHABET['C']:
+            letters[1] = letters[1] + 2
+
+        if letters[1] > ALPHABET['H']:
+            letters[1] = letters[1] + 1
+
+        if letters[1] > ALPHABET['L']:
+            letters[1] = letters[1] + 3
+
+    return _mgrsString(0, letters, easting, northing, precision)
+
+
+def _mgrsToUps(zone, letters, easting, northing):
+    """ Converts parsed MGRS coordinates to UPS projection (zone, hemisphere,
+    easting and northing) coordinates
+
+    @param zone - UTM zone, 0 for UPS
+    @param letters - MGRS coordinate string letters
+    @param easting - easting within the 100 km square
+    @param northing - northing within the 100 km square
+    @returns - tuple containing UTM zone, hemisphere, easting and northing
+    """
+    if zone != 0:
+        raise MgrsException(BADLY_FORMED)
+
+    if letters[0] >= ALPHABET['Y']:
+        hemisphere = 'N'
+
+        idx = letters[0] - 22
+        ltr2LowValue = UPS_CONSTANTS[idx][1]
+        ltr2HighValue = UPS_CONSTANTS[idx][2]
+        ltr3HighValue = UPS_CONSTANTS[idx][3]
+        falseEasting = UPS_CONSTANTS[idx][4]
+        falseNorthing = UPS_CONSTANTS[idx][5]
+    else:
+        hemisphere = 'S'
+
+        ltr2LowValue = UPS_CONSTANTS[letters[0]][1]
+        ltr2HighValue = UPS_CONSTANTS[letters[0]][2]
+        ltr3HighValue = UPS_CONSTANTS[letters[0]][3]
+        falseEasting = UPS_CONSTANTS[letters[0]][4]
+        falseNorthing = UPS_CONSTANTS[letters[0]][5]
+
+    # Check that the second letter of the MGRS string is within the range
+    # of valid second letter values. Also check that the third letter is valid
+    invalid = [
+        ALPHABET['D'],
+        ALPHABET['E'],
+        ALPHABET['M'],
+        ALPHABET['N'],
+        ALPHABET['V'],
+        ALPHABET['W']
+    ]
+    if (letters[1] < ltr2LowValue) \
+            or (letters[1] > ltr2HighValue) \
+            or (letters[1] in [invalid]) \
+            or (letters[2] > ltr3HighValue):
+        raise MgrsException(BADLY_FORMED)
+
+    gridNorthing = float(letters[2] * ONEHT + falseNorthing)
+    if letters[2] > ALPHABET['I']:
+        gridNorthing = gridNorthing - ONEHT
+
+    if letters[2] > ALPHABET['O']:
+        gridNorthing = gridNorthing - ONEHT
+
+    gridEasting = float((letters[1] - ltr2LowValue) * ONEHT + falseEasting)
+    if ltr2LowValue != ALPHABET['A']:
+        if letters[1] > ALPHABET['L']:
+            gridEasting = gridEasting - 300000.0
+
+        if letters[1] > ALPHABET['U']:
+            gridEasting = gridEasting - 200000.0
+    else:
+        if letters[1] > ALPHABET['C']:
+            gridEasting = gridEasting - 200000.0
+
+        if letters[1] > ALPHABET['I']:
+            gridEasting = gridEasting - ONEHT
+
+        if letters[1] > ALPHABET['L']:
+            gridEasting = gridEasting - 300000.0
+
+    easting += gridEasting
+    northing += gridNorthing
+
+    return zone, hemisphere, easting, northing
+
+
+def _utmToMgrs(zone, hemisphere, latitude, longitude,
+               easting, northing, precision):
+    """ Calculates an MGRS coordinate string based on the UTM zone, latitude,
+    easting and northing values.
+
+    @param zone - UTM zone number
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @param latitude - latitude value
+    @param longitude - longitude value
+    @param easting - easting/X in meters
+    @param northing - northing/Y in meters
+    @param precision - precision level of MGRS string
+    @returns - MGRS coordinate string
+    """
+    # FIXME: do we really need this?
+    # Special check for rounding to (truncated) eastern edge of zone 31V
+    # if (zone == 31) \
+    #         and (((latitude >= 56.0) and (latitude < 64.0))
+    #              and ((longitude >= 3.0) or (easting >= 500000.0))):
+    #    # Reconvert to UTM zone 32
+    #    override = 32
+    #    lat = int(latitude)
+    #    lon = int(longitude)
+    #    if zone == 1 and override == 60:
+    #        zone = override
+    #    elif zone == 60 and override == 1:
+    #        zone = override
+    #    elif (lat > 71) and (lon > -1) and (lon < 42):
+    #        if (zone - 2 <= override) and (override <= zone + 2):
+    #            zone = override
+    #        else:
+    #            raise MgrsException('Zone outside of valid range (1 to 60) '
+    #                                'and within 1 of "natural" zone')
+    #    elif (zone - 1 <= override) and (override <= zone + 1):
+    #        zone = override
+    #    else:
+    #        raise MgrsException('Zone outside of valid range (1 to 60) and '
+    #                            'within 1 of "natural" zone')
+    #
+    #    epsg = _epsgForUtm(zone, hemisphere)
+    #
+    #    src = osr.SpatialReference()
+    #    src.ImportFromEPSG(4326)
+    #    dst = osr.SpatialReference()
+    #    dst.ImportFromEPSG(epsg)
+    #    ct = osr.CoordinateTransformation(src, dst)
+    #    x, y, z = ct.TransformPoint(longitude, latitude)
+
+    if latitude <= 0.0 and northing == 1.0e7:
+        latitude = 0
+        northing = 0
+
+    patternOffset = _GRID_VALUES[zone][2]
+
+    letters = [_latitudeLetter(latitude), None, None]
+
+    while northing >= TWOMIL:
+        northing = northing - TWOMIL
+
+    northing += patternOffset
+    if northing >= TWOMIL:
+        northing = northing - TWOMIL
+
+    letters[2] = _ROW_LETTERS[int(northing / ONEHT)]
+
+    if ((letters[0] == ALPHABET['V']) and (zone == 31)) \
+            and (easting == 500000.0):
+        easting = easting - 1.0  # Substract 1 meter
+
+    letters[1] = _COLUMN_LETTERS[zone][int((easting / ONEHT) - 1)]
+
+    return _mgrsString(zone, letters, easting, northing, precision)
+
+
+def _mgrsToUtm(zone, letters, easting, northing):
+    """ Converts parsed MGRS coordinates to UTM projection (zone, hemisphere,
+    easting and northing) coordinates.
+
+    @param zone - UTM zone
+    @param letters - MGRS coordinate string letters
+    @param easting - easting within the 100 km square
+    @param northing - northing within the 100 km square
+    @returns - tuple containing UTM zone, hemisphere, easting, northing
+    """
+    if zone == 0:
+        raise MgrsException(BADLY_FORMED)
+
+    if letters == ALPHABET['X'] and zone in [32, 34, 36]:
+        raise MgrsException(BADLY_FORMED)
+
+    if letters[0] < ALPHABET['N']:
+        hemisphere = 'S'
+    else:
+        hemisphere = 'N'
+
+    # Check that the second letter of the MGRS string is within the range
+    # of valid second letter values. Also check that the third letter and
+    # the latitude band are valid
+    gridEasting = _COLUMN_EASTINGS[zone][letters[1]]
+    rowLetterNorthing = _ROW_NORTHINGS[letters[2]]
+    band = _BAND_NORTHINGS[letters[0]]
+    if gridEasting is None or rowLetterNorthing is None or band is None:
+        raise MgrsException(BADLY_FORMED)
+
+    patternOffset = _GRID_VALUES[zone][2]
+    minNorthing, northingOffset = band
+
+    gridNorthing = rowLetterNorthing - patternOffset
+    if gridNorthing < 0:
+        gridNorthing += TWOMIL
+
+    gridNorthing += northingOffset
+
+    if gridNorthing < minNorthing:
+        gridNorthing += TWOMIL
+
+    easting += gridEasting
+    northing += gridNorthing
+
+    return zone, hemisphere, easting, northing
+
+
+def _mgrsString(zone, letters, easting, northing, precision):
+    """ Constructs an MGRS string from its component parts
+    @param zone - UTM zone
+    @param letters - MGRS coordinate string letters
+    @param easting - easting value
+    @param northing - northing value
+    @param precision - precision level of MGRS string
+    @returns - MGRS coordinate string
+    """
+    if zone:
+        tmp = str(zone)
+        mgrs = tmp.zfill(3 - len(tmp))
+    else:
+        mgrs = '  '
+
+    mgrs += ''.join(_LETTERS[letter] for letter in letters)
+
+    easting = math.fmod(easting + 1e-8, 100000.0)
+    if easting >= 99999.5:
+        easting = 99999.0
+    mgrs += str(int(easting)).rjust(5, '0')[:precision]
+
+    northing = math.fmod(northing + 1e-8, 100000.0)
+    if northing >= 99999.5:
+        northing = 99999.0
+    mgrs += str(int(northing)).rjust(5, '0')[:precision]
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug('mgrs: %s', mgrs)
+
+    return mgrs
+
+
+def _epsgForWgs(latitude, longitude):
+    """ Returns corresponding UTM or UPS EPSG code from WGS84 coordinates
+    @param latitude - latitude value
+    @param longitude - longitude value
+    @returns - tuple containing hemisphere, UTM zone and EPSG code
+    """
+
+    if math.fabs(latitude) > 90:
+        raise MgrsException(
+            'Latitude outside of valid range (-90 to 90 degrees).')
+
+    if longitude < -180 or longitude > 360:
+        return MgrsException(
+            'Longitude outside of valid range (-180 to 360 degrees).')
+
+    # hemisphere
+    if latitude < 0:
+        hemisphere = 'S'
+    else:
+        hemisphere = 'N'
+
+    # UTM zone
+    if latitude <= -80 or latitude >= 84:
+        # Coordinates falls under UPS system
+        zone = 61
+    else:
+        # Coordinates falls under UTM system
+        if longitude < 180:
+            zone = int(31 + (longitude / 6.0))
+        else:
+            zone = int((longitude / 6) - 29)
+
+        if zone > 60:
+            zone = 1
+
+        # Handle UTM special cases
+        if 56.0 <= latitude < 64.0 and 3.0 <= longitude < 12.0:
+            zone = 32
+
+        if 72.0 <= latitude < 84.0:
+            if 0.0 <= longitude < 9.0:
+                zone = 31
+            elif 9.0 <= longitude < 21.0:
+                zone = 33
+            elif 21.0 <= longitude < 33.0:
+                zone = 35
+            elif 33.0 <= longitude < 42.0:
+                zone = 37
+
+    # North or South hemisphere
+    if latitude >= 0:
+        ns = 600
+    else:
+        ns = 700
+
+    return hemisphere, zone, 32000 + ns + zone
+
+
+def _epsgForUtm(zone, hemisphere):
+    """ Returen EPSG code for given UTM zone and hemisphere
+
+    @param zone - UTM zone
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @returns - corresponding EPSG code
+    """
+    if hemisphere not in ['N', 'S']:
+        raise MgrsException('Invalid hemisphere ("N" or "S").')
+
+    if zone < 0 or zone > 60:
+        raise MgrsException('UTM zone ouside valid range.')
+
+    if hemisphere == 'N':
+        ns = 600
+    else:
+        ns = 700
+
+    if zone == 0:
+        zone = 61
+
+    return 32000 + ns + zone
+
+
+def _latitudeLetter(latitude):
+    """ Returns the latitude band letter for given latitude
+
+    @param latitude - latitude value
+    @returns - latitude band letter
+    """
+    if -80.5 < latitude < 84.5:
+        idx = int(((latitude + 80.0) / 8.0) + 1.0e-12)
+        return _BAND_LETTERS[min(idx, len(_BAND_LETTERS) - 1)]
@@ -59,6 +59,13 @@
 
 import re
 import math
+from decimal import Decimal
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
 
 # A separator used to break the code into two parts to aid memorability.
 SEPARATOR_ = '+'
@@ -581,3 +588,359 @@ class CodeArea(object):
 
     def latlng(self):
         return [self.latitudeCenter, self.longitudeCenter]
+
+
+"""
+ Batch versions of encode and decode working on NumPy arrays. They give the
+ same results as calling encode and decode for every element, but do the
+ digit arithmetic with integer arrays and look up character values in a
+ table. They are only available if NumPy is installed.
+"""
+
+# int(round(x, 6)) rounds x up to the next integer if it is less than
+# 0.0000005 below it. _HALF_MICRO is that distance as a double and
+# _HALF_MICRO_BELOW tells whether the double is below the decimal value.
+_HALF_MICRO = 5e-7
+_HALF_MICRO_BELOW = Decimal(_HALF_MICRO) < Decimal('0.0000005')
+
+# Dekker split of 1e14 for the exact product in _round14Array
+_SPLITTER = 134217729.0
+_E14 = 1e14
+_E14_HI = _SPLITTER * _E14 - (_SPLITTER * _E14 - _E14)
+_E14_LO = _E14 - _E14_HI
+
+if HAVE_NUMPY:
+    _NP_ALPHABET = np.frombuffer(CODE_ALPHABET_.encode('ascii'), dtype=np.uint8)
+    # Character code to digit value, -1 for characters not in the alphabet
+    _NP_VALUES = np.full(128, -1, dtype=np.int64)
+    for i, c in enumerate(CODE_ALPHABET_):
+        _NP_VALUES[ord(c)] = i
+        _NP_VALUES[ord(c.lower())] = i
+    del i, c
+
+
+def _truncRound6Array(x):
+    """ Array version of int(round(x, 6)) for x >= 0 """
+    f = np.floor(x)
+    d = (f + 1) - x
+    up = (d < _HALF_MICRO) | ((d == _HALF_MICRO) & _HALF_MICRO_BELOW)
+    return f.astype(np.int64) + up
+
+
+def _round14Array(x):
+    """ Array version of round(x, 14) giving identical results.
+
+    A value of 64 or more is its own rounding as doubles are further apart
+    than 1e-14 there. Below that x * 1e14 is computed exactly as the sum of
+    two doubles, rounded half to even and converted back with one correctly
+    rounded division like round does.
+    """
+    with np.errstate(invalid='ignore'):
+        p = x * _E14
+        c = _SPLITTER * x
+        xhi = c - (c - x)
+        xlo = x - xhi
+        e = ((xhi * _E14_HI - p) + xhi * _E14_LO + xlo * _E14_HI) + xlo * _E14_LO
+        r = np.rint(p)
+        f = p - r
+        adj = np.where((f == 0.5) & (e > 0), 1.0, 0.0)
+        adj = np.where((f == -0.5) & (e < 0), -1.0, adj)
+        # p is an odd integer and e is exactly one half
+        tie = (f == 0) & (np.abs(e) == 0.5) & (np.fmod(r, 2) != 0)
+        adj = np.where(tie, np.sign(e), adj)
+        result = (r + adj) / _E14
+        result = np.where(result == 0, np.copysign(0.0, x), result)
+        return np.where(np.abs(x) >= 64, x, result)
+
+
+def _normalizeLongitudeArray(longitude):
+    """ Array version of normalizeLongitude for finite longitudes """
+    # normalizeLongitude adds or subtracts 360 one step at a time, so do the
+    # same to get the same rounding
+    lng = longitude
+    for _ in range(4):
+        lng = np.where(lng < -LONGITUDE_MAX_, lng + 360, lng)
+        lng = np.where(lng >= LONGITUDE_MAX_, lng - 360, lng)
+    far = (lng < -LONGITUDE_MAX_) | (lng >= LONGITUDE_MAX_)
+    for i in np.flatnonzero(far):
+        lng[i] = normalizeLongitude(float(longitude[i]))
+    return lng
+
+
+def encodeArray(latitude, longitude, codeLength=PAIR_CODE_LENGTH_):
+    """
+    Encode arrays of latitudes and longitudes into an array of Open Location
+    Codes. Gives the same codes as encode, except that latitudes or
+    longitudes that are NaN or infinite give an empty string.
+    """
+    if codeLength < 2 or (codeLength < PAIR_CODE_LENGTH_ and
+                          codeLength % 2 == 1):
+        raise ValueError('Invalid Open Location Code length - ' +
+                         str(codeLength))
+    codeLength = min(codeLength, MAX_DIGIT_COUNT_)
+    latitude, longitude = np.broadcast_arrays(
+        np.asarray(latitude, dtype=np.float64), np.asarray(longitude, dtype=np.float64))
+    shape = latitude.shape
+    latitude = latitude.ravel()
+    longitude = longitude.ravel()
+    valid = np.isfinite(latitude) & np.isfinite(longitude)
+
+    # clipLatitude, written so that NaN behaves as with min and max
+    lat = np.where(latitude > -LATITUDE_MAX_, latitude, -LATITUDE_MAX_)
+    lat = np.where(lat < LATITUDE_MAX_, lat, LATITUDE_MAX_)
+    lat = np.where(lat == LATITUDE_MAX_,
+                   lat - computeLatitudePrecision(codeLength), lat)
+    lng = _normalizeLongitudeArray(np.where(valid, longitude, 0.0))
+    lat = np.where(valid, lat, 0.0)
+
+    latVal = _truncRound6Array((lat + LATITUDE_MAX_) * FINAL_LAT_PRECISION_)
+    lngVal = _truncRound6Array((lng + LONGITUDE_MAX_) * FINAL_LNG_PRECISION_)
+
+    n = latitude.size
+    digits = np.empty((n, MAX_DIGIT_COUNT_), dtype=np.intp)
+    if codeLength > PAIR_CODE_LENGTH_:
+        for i in range(MAX_DIGIT_COUNT_ - 1, PAIR_CODE_LENGTH_ - 1, -1):
+            digits[:, i] = (latVal % GRID_ROWS_) * GRID_COLUMNS_ + lngVal % GRID_COLUMNS_
+            latVal //= GRID_ROWS_
+            lngVal //= GRID_COLUMNS_
+    else:
+        latVal //= pow(GRID_ROWS_, GRID_CODE_LENGTH_)
+        lngVal //= pow(GRID_COLUMNS_, GRID_CODE_LENGTH_)
+    for i in range(PAIR_CODE_LENGTH_ - 2, -1, -2):
+        digits[:, i] = latVal % ENCODING_BASE_
+        digits[:, i + 1] = lngVal % ENCODING_BASE_
+        latVal //= ENCODING_BASE_
+        lngVal //= ENCODING_BASE_
+
+    if codeLength >= SEPARATOR_POSITION_:
+        width = codeLength + 1
+        chars = np.empty((n, width), dtype=np.uint8)
+        chars[:, :SEPARATOR_POSITION_] = _NP_ALPHABET[digits[:, :SEPARATOR_POSITION_]]
+        chars[:, SEPARATOR_POSITION_] = ord(SEPARATOR_)
+        chars[:, SEPARATOR_POSITION_ + 1:] = _NP_ALPHABET[digits[:, SEPARATOR_POSITION_:codeLength]]
+    else:
+        width = SEPARATOR_POSITION_ + 1
+        chars = np.empty((n, width), dtype=np.uint8)
+        chars[:, :codeLength] = _NP_ALPHABET[digits[:, :codeLength]]
+        chars[:, codeLength:SEPARATOR_POSITION_] = ord(PADDING_CHARACTER_)
+        chars[:, SEPARATOR_POSITION_] = ord(SEPARATOR_)
+    chars[~valid] = 0
+    codes = chars.view('S{}'.format(width)).ravel().astype('U{}'.format(width))
+    return codes.reshape(shape)
+
+
+class CodeAreaArray(object):
+    """
+     Arrays of the coordinates of decoded Open Location Codes with the same
+     attributes as CodeArea. Invalid codes have NaN coordinates and a code
+     length of 0.
+    """
+
+    def __init__(self, latitudeLo, longitudeLo, latitudeHi, longitudeHi,
+                 codeLength):
+        self.latitudeLo = latitudeLo
+        self.longitudeLo = longitudeLo
+        self.latitudeHi = latitudeHi
+        self.longitudeHi = longitudeHi
+        self.codeLength = codeLength
+        self.latitudeCenter = np.minimum(
+            latitudeLo + (latitudeHi - latitudeLo) / 2, LATITUDE_MAX_)
+        self.longitudeCenter = np.minimum(
+            longitudeLo + (longitudeHi - longitudeLo) / 2, LONGITUDE_MAX_)
+
+
+def _isFullArray(codes, lengths):
+    """ Array version of isFull for a matrix of character codes """
+    n, width = codes.shape
+    pos = np.arange(width)
+    inside = pos < lengths[:, None]
+    isSep = codes == ord(SEPARATOR_)
+    isPad = codes == ord(PADDING_CHARACTER_)
+    values = _NP_VALUES[np.minimum(codes, 127).astype(np.intp)]
+    values = np.where(codes > 127, -1, values)
+
+    # The separator must be the only one and at position 8 for a full code
+    valid = (isSep.sum(axis=1) == 1) & (lengths > 1)
+    sep = np.argmax(isSep, axis=1)
+    valid &= sep == SEPARATOR_POSITION_
+    valid &= np.all(~inside | isSep | isPad | (values >= 0), axis=1)
+    valid &= lengths - sep - 1 != 1
+
+    # A single group of an even number of padding characters, not at the
+    # start, and then the separator must be the last character
+    hasPad = isPad.any(axis=1)
+    pad = np.argmax(isPad, axis=1)
+    rpad = width - np.argmax(isPad[:, ::-1], axis=1)
+    inGroup = (pos >= pad[:, None]) & (pos < rpad[:, None])
+    padOk = ((pad != 0) & ((rpad - pad) % 2 == 0) &
+             np.all(~inGroup | isPad, axis=1) & (lengths == sep + 1))
+    valid &= ~hasPad | padOk
+
+    # The first characters must not give a latitude >= 90 or a longitude
+    # >= 180
+    valid &= values[:, 0] * ENCODING_BASE_ < LATITUDE_MAX_ * 2
+    if width > 1:
+        valid &= values[:, 1] * ENCODING_BASE_ < LONGITUDE_MAX_ * 2
+    return valid, values, hasPad, pad
+
+
+def decodeArray(codes):
+    """
+    Decode an array of Open Location Codes. Returns a CodeAreaArray with the
+    same values decode would give for every code, NaN for invalid codes.
+    """
+    codes = np.asarray(codes)
+    shape = codes.shape
+    if codes.dtype.kind != 'U':
+        codes = codes.astype('U')
+    codes = codes.ravel()
+    n = codes.size
+    width = max(codes.dtype.itemsize // 4, 2)
+    lengths = np.char.str_len(codes) if n else np.zeros(0, dtype=np.int64)
+    chars = codes.astype('U{}'.format(width)).view(np.uint32).reshape(n, width)
+    valid, values, hasPad, pad = _isFullArray(chars, lengths)
+
+    # The significant digits are those before the padding, or those before
+    # and after the separator
+    count = np.where(hasPad, pad, lengths - 1)
+    count = np.where(valid, np.minimum(count, MAX_DIGIT_COUNT_), 0)
+    k = np.arange(MAX_DIGIT_COUNT_)
+    source = np.where(k < SEPARATOR_POSITION_, k, k + 1)
+    source = np.minimum(source, width - 1)
+    digits = np.where(k < count[:, None], values[:, source], 0)
+    digits = np.maximum(digits, 0)
+
+    normalLat = np.zeros(n, dtype=np.int64)
+    normalLng = np.zeros(n, dtype=np.int64)
+    pairs = np.minimum(count, PAIR_CODE_LENGTH_) // 2
+    for j in range(PAIR_CODE_LENGTH_ // 2):
+        pv = ENCODING_BASE_ ** (PAIR_CODE_LENGTH_ // 2 - 1 - j)
+        normalLat += digits[:, 2 * j] * pv
+        normalLng += digits[:, 2 * j + 1] * pv
+    normalLat -= LATITUDE_MAX_ * PAIR_PRECISION_
+    normalLng -= LONGITUDE_MAX_ * PAIR_PRECISION_
+    pv = ENCODING_BASE_ ** (PAIR_CODE_LENGTH_ // 2 - np.maximum(pairs, 1))
+    latPrecision = pv / PAIR_PRECISION_
+    lngPrecision = pv / PAIR_PRECISION_
+
+    gridLat = np.zeros(n, dtype=np.int64)
+    gridLng = np.zeros(n, dtype=np.int64)
+    grid = np.maximum(count - PAIR_CODE_LENGTH_, 0)
+    for j in range(GRID_CODE_LENGTH_):
+        gridLat += (digits[:, PAIR_CODE_LENGTH_ + j] // GRID_COLUMNS_) * GRID_ROWS_ ** (GRID_CODE_LENGTH_ - 1 - j)
+        gridLng += (digits[:, PAIR_CODE_LENGTH_ + j] % GRID_COLUMNS_) * GRID_COLUMNS_ ** (GRID_CODE_LENGTH_ - 1 - j)
+    rowpv = GRID_ROWS_ ** (GRID_CODE_LENGTH_ - np.maximum(grid, 1))
+    colpv = GRID_COLUMNS_ ** (GRID_CODE_LENGTH_ - np.maximum(grid, 1))
+    latPrecision = np.where(grid > 0, rowpv / FINAL_LAT_PRECISION_, latPrecision)
+    lngPrecision = np.where(grid > 0, colpv / FINAL_LNG_PRECISION_, lngPrecision)
+
+    lat = normalLat / PAIR_PRECISION_ + gridLat / FINAL_LAT_PRECISION_
+    lng = normalLng / PAIR_PRECISION_ + gridLng / FINAL_LNG_PRECISION_
+    latitudeLo = _round14Array(lat)
+    longitudeLo = _round14Array(lng)
+    latitudeHi = _round14Array(lat + latPrecision)
+    longitudeHi = _round14Array(lng + lngPrecision)
+
+    def finish(a):
+        return np.where(valid, a, np.nan).reshape(shape)
+    return CodeAreaArray(finish(latitudeLo), finish(longitudeLo),
+                         finish(latitudeHi), finish(longitudeHi),
+                         count.reshape(shape))
+
+
+# Resolution in degrees of the area recovered for each padding length
+_RECOVER_RESOLUTIONS = [pow(20, 2 - (paddingLength / 2))
+                        for paddingLength in range(SEPARATOR_POSITION_ + 1)]
+
+
+def _isShortArray(codes, lengths):
+    """ Array version of isShort for a matrix of character codes """
+    n, width = codes.shape
+    pos = np.arange(width)
+    inside = pos < lengths[:, None]
+    isSep = codes == ord(SEPARATOR_)
+    values = _NP_VALUES[np.minimum(codes, 127).astype(np.intp)]
+    values = np.where(codes > 127, -1, values)
+
+    # One separator at an even position before position 8, no padding and
+    # not a single character after the separator
+    valid = isSep.sum(axis=1) == 1
+    sep = np.argmax(isSep, axis=1)
+    valid &= (sep < SEPARATOR_POSITION_) & (sep % 2 == 0) & (lengths > 1)
+    valid &= np.all(~inside | isSep | (values >= 0), axis=1)
+    valid &= lengths - sep - 1 != 1
+    return valid, sep
+
+
+def recoverNearestArray(codes, referenceLatitude, referenceLongitude):
+    """
+    Recover the nearest matching full codes of an array of short codes, each
+    with its own reference location or with a single one for all of them.
+    Gives the same codes as recoverNearest, except that codes that are
+    neither short nor full, or short codes with a NaN or infinite reference
+    location, give an empty string.
+    """
+    codes = np.asarray(codes)
+    if codes.dtype.kind != 'U':
+        codes = codes.astype('U')
+    codes, referenceLatitude, referenceLongitude = np.broadcast_arrays(
+        codes, np.asarray(referenceLatitude, dtype=np.float64),
+        np.asarray(referenceLongitude, dtype=np.float64))
+    shape = codes.shape
+    codes = codes.ravel()
+    referenceLatitude = referenceLatitude.ravel()
+    referenceLongitude = referenceLongitude.ravel()
+    n = codes.size
+    width = max(codes.dtype.itemsize // 4, 2)
+    lengths = np.char.str_len(codes) if n else np.zeros(0, dtype=np.int64)
+    chars = codes.astype('U{}'.format(width)).view(np.uint32).reshape(n, width)
+
+    full = _isFullArray(chars, lengths)[0]
+    short, sep = _isShortArray(chars, lengths)
+    short &= np.isfinite(referenceLatitude) & np.isfinite(referenceLongitude)
+
+    # Ensure that latitude and longitude are valid.
+    refLat = np.where(short, referenceLatitude, 0.0)
+    refLat = np.minimum(LATITUDE_MAX_, np.maximum(-LATITUDE_MAX_, refLat))
+    refLng = _normalizeLongitudeArray(np.where(short, referenceLongitude, 0.0))
+
+    # Pad the short codes with the start of the code of the reference
+    # location and decode them
+    paddingLength = np.where(short, SEPARATOR_POSITION_ - sep, 0)
+    reference = encodeArray(refLat, refLng)
+    refChars = reference.view(np.uint32).reshape(n, SEPARATOR_POSITION_ + 3)
+    k = np.arange(SEPARATOR_POSITION_ + width)
+    fromCode = k - paddingLength[:, None]
+    padded = np.where(
+        fromCode < 0,
+        refChars[:, np.minimum(k, SEPARATOR_POSITION_)],
+        np.take_along_axis(chars, np.clip(fromCode, 0, width - 1), axis=1))
+    padded = np.where(fromCode < width, padded, 0).astype(np.uint32)
+    padded = padded.view('U{}'.format(SEPARATOR_POSITION_ + width)).ravel()
+    codeArea = decodeArray(np.where(short, padded, ''))
+    short &= codeArea.codeLength > 0
+
+    # Move the area one cell if it is more than half a cell away from the
+    # reference location, keeping it within -90 to 90 degrees
+    resolution = np.take(_RECOVER_RESOLUTIONS, paddingLength)
+    halfResolution = resolution / 2.0
+    latitudeCenter = codeArea.latitudeCenter
+    longitudeCenter = codeArea.longitudeCenter
+    latitudeCenter = np.where(
+        (refLat + halfResolution < latitudeCenter) &
+        (latitudeCenter - resolution >= -LATITUDE_MAX_),
+        latitudeCenter - resolution,
+        np.where((refLat - halfResolution > latitudeCenter) &
+                 (latitudeCenter + resolution <= LATITUDE_MAX_),
+                 latitudeCenter + resolution, latitudeCenter))
+    longitudeCenter = np.where(
+        refLng + halfResolution < longitudeCenter, longitudeCenter - resolution,
+        np.where(refLng - halfResolution > longitudeCenter,
+                 longitudeCenter + resolution, longitudeCenter))
+
+    result = np.where(full, np.char.upper(codes), '').astype(
+        'U{}'.format(max(width, MAX_DIGIT_COUNT_ + 1)))
+    for codeLength in np.unique(codeArea.codeLength[short]).tolist():
+        rows = short & (codeArea.codeLength == codeLength)
+        result[rows] = encodeArray(latitudeCenter[rows], longitudeCenter[rows], codeLength)
+    return result.reshape(shape)
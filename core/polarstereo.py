@@ -0,0 +1,141 @@
+"""
+Native Universal Polar Stereographic (UPS) projection on the WGS 84
+ellipsoid.
+
+This is the ellipsoidal polar stereographic projection (EPSG method 9810,
+variant A) with the UPS parameters: a scale factor of 0.994 at the pole and a
+false easting and northing of 2,000,000 m. It gives the same results as
+transforming between EPSG:4326 and EPSG:32661/32761 without having to create a
+CRS or a transformation object.
+
+The *Array functions take and return NumPy arrays and are only available if
+NumPy is installed.
+"""
+import math
+
+from .tmerc import (WGS84_A, _e, _conformalTau, _geographicTau,
+                    _conformalTauArray, _geographicTauArray, HAVE_NUMPY)
+
+if HAVE_NUMPY:
+    import numpy as np
+
+# UPS constants
+UPS_K0 = 0.994
+UPS_FALSE_EASTING = 2000000.0
+UPS_FALSE_NORTHING = 2000000.0
+
+# Ratio between rho and t (Snyder 21-33 with k0 = 0.994)
+_C = math.sqrt(math.pow(1 + _e, 1 + _e) * math.pow(1 - _e, 1 - _e))
+_RHO = 2 * WGS84_A * UPS_K0 / _C
+
+
+def _tFromTaup(taup):
+    """ Returns tan(pi/4 - chi/2) for tan(chi) = taup without cancellation
+    """
+    h = math.hypot(1.0, taup)
+    if taup < 0:
+        return h - taup
+    return 1.0 / (h + taup)
+
+
+def toUps(latitude, longitude, hemisphere):
+    """ Projects geodetic coordinates to UPS. This gives the same result as
+    transforming from EPSG:4326 to EPSG:32661 or EPSG:32761.
+
+    @param latitude - latitude in degrees
+    @param longitude - longitude in degrees
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @returns - tuple containing easting and northing in meters
+    """
+    north = hemisphere == 'N'
+    lat = latitude if north else -latitude
+    if lat >= 90:
+        rho = 0.0
+    elif lat <= -90:
+        rho = math.inf
+    else:
+        rho = _RHO * _tFromTaup(_conformalTau(math.tan(math.radians(lat))))
+    lam = math.radians(longitude)
+    easting = UPS_FALSE_EASTING + rho * math.sin(lam)
+    if north:
+        northing = UPS_FALSE_NORTHING - rho * math.cos(lam)
+    else:
+        northing = UPS_FALSE_NORTHING + rho * math.cos(lam)
+    return easting, northing
+
+
+def fromUps(easting, northing, hemisphere):
+    """ Converts UPS easting and northing into geodetic coordinates.
+
+    @param easting - easting in meters
+    @param northing - northing in meters
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @returns - tuple containing latitude and longitude in degrees
+    """
+    north = hemisphere == 'N'
+    dx = easting - UPS_FALSE_EASTING
+    dy = northing - UPS_FALSE_NORTHING
+    if not north:
+        dy = -dy
+    rho = math.hypot(dx, dy)
+    if rho == 0:
+        latitude = 90.0
+        longitude = 0.0
+    else:
+        t = rho / _RHO
+        taup = (1 / t - t) / 2
+        latitude = math.degrees(math.atan(_geographicTau(taup)))
+        longitude = math.degrees(math.atan2(dx, -dy))
+    if not north:
+        latitude = -latitude
+    return latitude, longitude
+
+
+def toUpsArray(latitude, longitude, north):
+    """ Projects arrays of geodetic coordinates to UPS.
+
+    @param latitude - array of latitudes in degrees
+    @param longitude - array of longitudes in degrees
+    @param north - boolean array (or scalar), True for the north pole aspect
+        (EPSG:32661) and False for the south pole aspect (EPSG:32761)
+    @returns - tuple containing arrays of eastings and northings in meters
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    longitude = np.asarray(longitude, dtype=np.float64)
+    sign = np.where(north, 1.0, -1.0)
+    lat = latitude * sign
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        taup = _conformalTauArray(np.tan(np.radians(lat)))
+        h = np.hypot(1.0, taup)
+        t = np.where(taup < 0, h - taup, 1.0 / (h + taup))
+        t = np.where(lat >= 90, 0.0, np.where(lat <= -90, np.inf, t))
+        rho = _RHO * t
+        lam = np.radians(longitude)
+        easting = UPS_FALSE_EASTING + rho * np.sin(lam)
+        northing = UPS_FALSE_NORTHING - sign * rho * np.cos(lam)
+    return easting, northing
+
+
+def fromUpsArray(easting, northing, north):
+    """ Converts arrays of UPS eastings and northings into geodetic
+    coordinates.
+
+    @param easting - array of eastings in meters
+    @param northing - array of northings in meters
+    @param north - boolean array (or scalar), True for the north pole aspect
+        (EPSG:32661) and False for the south pole aspect (EPSG:32761)
+    @returns - tuple containing arrays of latitudes and longitudes in degrees
+    """
+    easting = np.asarray(easting, dtype=np.float64)
+    northing = np.asarray(northing, dtype=np.float64)
+    sign = np.where(north, 1.0, -1.0)
+    dx = easting - UPS_FALSE_EASTING
+    dy = (northing - UPS_FALSE_NORTHING) * sign
+    rho = np.hypot(dx, dy)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        t = rho / _RHO
+        taup = (1 / t - t) / 2
+        latitude = np.degrees(np.arctan(_geographicTauArray(taup)))
+    latitude = np.where(rho == 0, 90.0, latitude) * sign
+    longitude = np.where(rho == 0, 0.0, np.degrees(np.arctan2(dx, -dy)))
+    return latitude, longitude
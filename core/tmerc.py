@@ -0,0 +1,285 @@
+"""
+Native Transverse Mercator projection on the WGS 84 ellipsoid.
+
+This implements the Kruger series to 6th order in the third flattening as
+described by C. F. F. Karney, "Transverse Mercator with an accuracy of a few
+nanometers", J. Geodesy 85(8), 475-485 (2011). Within the UTM zones the
+error is in the order of nanometers, so it gives the same results as the
+PROJ etmerc/tmerc implementation used by GDAL, pyproj and QGIS without
+having to create a CRS or a transformation object.
+
+The *Array functions take and return NumPy arrays and are only available if
+NumPy is installed.
+"""
+import math
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# WGS 84 ellipsoid
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+
+# UTM constants
+UTM_K0 = 0.9996
+UTM_FALSE_EASTING = 500000.0
+UTM_FALSE_NORTHING_SOUTH = 10000000.0
+
+_e2 = WGS84_F * (2 - WGS84_F)
+_e = math.sqrt(_e2)
+_e2m = 1 - _e2
+_n = WGS84_F / (2 - WGS84_F)
+_n2 = _n * _n
+_n3 = _n2 * _n
+_n4 = _n3 * _n
+_n5 = _n4 * _n
+_n6 = _n5 * _n
+
+# Rectifying radius
+_A = WGS84_A / (1 + _n) * (1 + _n2 / 4 + _n4 / 64 + _n6 / 256)
+
+# Series coefficients for the forward projection (alpha) and the inverse
+# projection (beta) indexed from 1 to 6.
+_ALPHA = (
+    0,
+    _n / 2 - 2 * _n2 / 3 + 5 * _n3 / 16 + 41 * _n4 / 180 - 127 * _n5 / 288 + 7891 * _n6 / 37800,
+    13 * _n2 / 48 - 3 * _n3 / 5 + 557 * _n4 / 1440 + 281 * _n5 / 630 - 1983433 * _n6 / 1935360,
+    61 * _n3 / 240 - 103 * _n4 / 140 + 15061 * _n5 / 26880 + 167603 * _n6 / 181440,
+    49561 * _n4 / 161280 - 179 * _n5 / 168 + 6601661 * _n6 / 7257600,
+    34729 * _n5 / 80640 - 3418889 * _n6 / 1995840,
+    212378941 * _n6 / 319334400)
+
+_BETA = (
+    0,
+    _n / 2 - 2 * _n2 / 3 + 37 * _n3 / 96 - _n4 / 360 - 81 * _n5 / 512 + 96199 * _n6 / 604800,
+    _n2 / 48 + _n3 / 15 - 437 * _n4 / 1440 + 46 * _n5 / 105 - 1118711 * _n6 / 3870720,
+    17 * _n3 / 480 - 37 * _n4 / 840 - 209 * _n5 / 4480 + 5569 * _n6 / 90720,
+    4397 * _n4 / 161280 - 11 * _n5 / 504 - 830251 * _n6 / 7257600,
+    4583 * _n5 / 161280 - 108847 * _n6 / 3991680,
+    20648693 * _n6 / 638668800)
+
+
+def _conformalTau(tau):
+    """ Returns tan of the conformal latitude for tau = tan(latitude)
+    """
+    tau1 = math.hypot(1.0, tau)
+    sig = math.sinh(_e * math.atanh(_e * tau / tau1))
+    return math.hypot(1.0, sig) * tau - sig * tau1
+
+
+def _geographicTau(taup):
+    """ Inverse of _conformalTau solved with Newton's method
+
+    @param taup - tan of the conformal latitude
+    @returns - tan of the geographic latitude
+    """
+    tau = taup / _e2m
+    for _ in range(5):
+        tau1 = math.hypot(1.0, tau)
+        taupa = _conformalTau(tau)
+        dtau = ((taup - taupa) * (1 + _e2m * tau * tau) /
+                (_e2m * tau1 * math.hypot(1.0, taupa)))
+        tau += dtau
+        if abs(dtau) < 1e-14 * max(1.0, abs(tau)):
+            break
+    return tau
+
+
+def forward(latitude, longitude, lon0, k0=UTM_K0):
+    """ Projects geodetic coordinates to Transverse Mercator x, y without any
+    false easting or northing.
+
+    @param latitude - latitude in degrees
+    @param longitude - longitude in degrees
+    @param lon0 - central meridian in degrees
+    @param k0 - scale factor on the central meridian
+    @returns - tuple containing x and y in meters
+    """
+    lam = math.radians(math.remainder(longitude - lon0, 360.0))
+    phi = math.radians(latitude)
+    if abs(latitude) >= 90:
+        xip = math.copysign(math.pi / 2, latitude)
+        etap = 0.0
+    else:
+        tau = math.tan(phi)
+        taup = _conformalTau(tau)
+        xip = math.atan2(taup, math.cos(lam))
+        etap = math.asinh(math.sin(lam) / math.hypot(taup, math.cos(lam)))
+
+    xi = xip
+    eta = etap
+    for j in range(1, 7):
+        xi += _ALPHA[j] * math.sin(2 * j * xip) * math.cosh(2 * j * etap)
+        eta += _ALPHA[j] * math.cos(2 * j * xip) * math.sinh(2 * j * etap)
+
+    return k0 * _A * eta, k0 * _A * xi
+
+
+def inverse(x, y, lon0, k0=UTM_K0):
+    """ Converts Transverse Mercator x, y (without any false easting or
+    northing) back to geodetic coordinates.
+
+    @param x - x in meters
+    @param y - y in meters
+    @param lon0 - central meridian in degrees
+    @param k0 - scale factor on the central meridian
+    @returns - tuple containing latitude and longitude in degrees
+    """
+    xi = y / (k0 * _A)
+    eta = x / (k0 * _A)
+    xip = xi
+    etap = eta
+    for j in range(1, 7):
+        xip -= _BETA[j] * math.sin(2 * j * xi) * math.cosh(2 * j * eta)
+        etap -= _BETA[j] * math.cos(2 * j * xi) * math.sinh(2 * j * eta)
+
+    s = math.sinh(etap)
+    r = math.hypot(s, math.cos(xip))
+    if r == 0:
+        return math.copysign(90.0, xip), lon0
+    taup = math.sin(xip) / r
+    tau = _geographicTau(taup)
+    latitude = math.degrees(math.atan(tau))
+    longitude = math.degrees(math.atan2(s, math.cos(xip))) + lon0
+    if longitude >= 180:
+        longitude -= 360
+    elif longitude < -180:
+        longitude += 360
+    return latitude, longitude
+
+
+def utmCentralMeridian(zone):
+    """ Returns the central meridian in degrees of a UTM zone
+    """
+    return zone * 6.0 - 183.0
+
+
+def toUtm(latitude, longitude, zone, hemisphere):
+    """ Projects geodetic coordinates into the given UTM zone. This gives the
+    same result as transforming from EPSG:4326 to EPSG:326zz/327zz.
+
+    @param latitude - latitude in degrees
+    @param longitude - longitude in degrees
+    @param zone - UTM zone number (1 - 60)
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @returns - tuple containing easting and northing in meters
+    """
+    x, y = forward(latitude, longitude, utmCentralMeridian(zone))
+    x += UTM_FALSE_EASTING
+    if hemisphere == 'S':
+        y += UTM_FALSE_NORTHING_SOUTH
+    return x, y
+
+
+def fromUtm(easting, northing, zone, hemisphere):
+    """ Converts UTM easting and northing in the given zone into geodetic
+    coordinates.
+
+    @param easting - easting in meters
+    @param northing - northing in meters
+    @param zone - UTM zone number (1 - 60)
+    @param hemisphere - hemisphere either 'N' or 'S'
+    @returns - tuple containing latitude and longitude in degrees
+    """
+    if hemisphere == 'S':
+        northing -= UTM_FALSE_NORTHING_SOUTH
+    return inverse(easting - UTM_FALSE_EASTING, northing,
+                   utmCentralMeridian(zone))
+
+
+def _conformalTauArray(tau):
+    tau1 = np.hypot(1.0, tau)
+    sig = np.sinh(_e * np.arctanh(_e * tau / tau1))
+    return np.hypot(1.0, sig) * tau - sig * tau1
+
+
+def _geographicTauArray(taup):
+    tau = taup / _e2m
+    for _ in range(5):
+        tau1 = np.hypot(1.0, tau)
+        taupa = _conformalTauArray(tau)
+        tau = tau + ((taup - taupa) * (1 + _e2m * tau * tau) /
+                     (_e2m * tau1 * np.hypot(1.0, taupa)))
+    return tau
+
+
+def forwardArray(latitude, longitude, lon0, k0=UTM_K0):
+    """ Array version of forward. lon0 may be a scalar or an array.
+    """
+    latitude = np.asarray(latitude, dtype=np.float64)
+    dlon = np.asarray(longitude, dtype=np.float64) - lon0
+    dlon = np.where(dlon > 180, dlon - 360,
+                    np.where(dlon < -180, dlon + 360, dlon))
+    lam = np.radians(dlon)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        taup = _conformalTauArray(np.tan(np.radians(latitude)))
+        xip = np.arctan2(taup, np.cos(lam))
+        etap = np.arcsinh(np.sin(lam) / np.hypot(taup, np.cos(lam)))
+    pole = np.abs(latitude) >= 90
+    xip = np.where(pole, np.copysign(math.pi / 2, latitude), xip)
+    etap = np.where(pole, 0.0, etap)
+
+    xi = xip
+    eta = etap
+    for j in range(1, 7):
+        xi = xi + _ALPHA[j] * np.sin(2 * j * xip) * np.cosh(2 * j * etap)
+        eta = eta + _ALPHA[j] * np.cos(2 * j * xip) * np.sinh(2 * j * etap)
+
+    return k0 * _A * eta, k0 * _A * xi
+
+
+def inverseArray(x, y, lon0, k0=UTM_K0):
+    """ Array version of inverse. lon0 may be a scalar or an array.
+    """
+    xi = np.asarray(y, dtype=np.float64) / (k0 * _A)
+    eta = np.asarray(x, dtype=np.float64) / (k0 * _A)
+    xip = xi
+    etap = eta
+    for j in range(1, 7):
+        xip = xip - _BETA[j] * np.sin(2 * j * xi) * np.cosh(2 * j * eta)
+        etap = etap - _BETA[j] * np.cos(2 * j * xi) * np.sinh(2 * j * eta)
+
+    s = np.sinh(etap)
+    r = np.hypot(s, np.cos(xip))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tau = _geographicTauArray(np.sin(xip) / r)
+    latitude = np.where(r == 0, np.copysign(90.0, xip),
+                        np.degrees(np.arctan(tau)))
+    longitude = np.degrees(np.arctan2(s, np.cos(xip))) + lon0
+    longitude = np.where(longitude >= 180, longitude - 360,
+                         np.where(longitude < -180, longitude + 360, longitude))
+    return latitude, longitude
+
+
+def toUtmArray(latitude, longitude, zone, north):
+    """ Projects arrays of geodetic coordinates into UTM.
+
+    @param latitude - array of latitudes in degrees
+    @param longitude - array of longitudes in degrees
+    @param zone - UTM zone number or array of zone numbers
+    @param north - boolean array (or scalar), True for the northern hemisphere
+    @returns - tuple containing arrays of eastings and northings in meters
+    """
+    x, y = forwardArray(latitude, longitude, utmCentralMeridian(np.asarray(zone)))
+    x = x + UTM_FALSE_EASTING
+    y = np.where(north, y, y + UTM_FALSE_NORTHING_SOUTH)
+    return x, y
+
+
+def fromUtmArray(easting, northing, zone, north):
+    """ Converts arrays of UTM eastings and northings into geodetic
+    coordinates.
+
+    @param easting - array of eastings in meters
+    @param northing - array of northings in meters
+    @param zone - UTM zone number or array of zone numbers
+    @param north - boolean array (or scalar), True for the northern hemisphere
+    @returns - tuple containing arrays of latitudes and longitudes in degrees
+    """
+    northing = np.asarray(northing, dtype=np.float64)
+    northing = np.where(north, northing, northing - UTM_FALSE_NORTHING_SOUTH)
+    return inverseArray(np.asarray(easting, dtype=np.float64) - UTM_FALSE_EASTING,
+                        northing, utmCentralMeridian(np.asarray(zone)))
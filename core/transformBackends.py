@@ -0,0 +1,575 @@
+"""
+Pluggable backends for transforming points between WGS 84 (EPSG:4326) and the
+UTM (EPSG:326zz/327zz) and UPS (EPSG:32661/32761) projections.
+
+The same transformation can be done by GDAL (osgeo.osr), pyproj, QGIS
+(QgsCoordinateTransform) or the built-in engines in tmerc.py and
+polarstereo.py. Every backend implements the TransformBackend interface and
+is imported only when it is first used. The backend used by default is
+chosen on first use by calibrate(), which times every available backend on a
+fixed set of points and picks the fastest one that reproduces the reference
+coordinates within ACCURACY_TOLERANCE. For compatibility with mgrs.py the
+MGRSPY_USE_NATIVE env var forces the built-in engine and MGRSPY_USE_PROJ
+skips GDAL, in which case no calibration is done.
+
+This module does not need QGIS, so it can be used from worker processes.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from . import tmerc
+from . import polarstereo
+
+log = logging.getLogger(__name__)
+
+# Maximum error in meters of a backend on the reference points
+ACCURACY_TOLERANCE = 0.001
+
+# Number of times the reference points are transformed in both directions
+# when timing a backend
+CALIBRATION_ROUNDS = 50
+
+# Large enough for every UTM zone in both hemispheres and both directions,
+# so converting a global data set does not keep recreating transformations.
+TRANSFORM_CACHE_SIZE = 256
+
+# latitude, longitude, EPSG code, easting, northing computed with PROJ 9
+REFERENCE_POINTS = (
+    (46.2, 6.1, 32632, 276260.616277, 5120357.748035),
+    (-33.9, 18.4, 32734, 259583.221660, 6245888.045441),
+    (40.7, -74.0, 32618, 584482.352282, 4505935.869447),
+    (-0.5, 179.9, 32760, 822823.962553, 9944663.622434),
+    (0.0, -177.0, 32601, 500000.000000, 0.000000),
+    (64.1, -21.9, 32627, 456137.554112, 7108467.417017),
+    (78.2, 15.6, 32633, 513696.945417, 8680760.053196),
+    (-77.8, 166.7, 32758, 540098.858946, 1363368.868891),
+    (85.0, 30.0, 32661, 2277728.695691, 1518959.788343),
+    (-85.0, -120.0, 32761, 1518959.788343, 1722271.304309),
+    (89.9, -45.0, 32661, 1992149.428794, 1992149.428794),
+    (-80.5, 100.0, 32761, 3040992.578568, 1816444.921681))
+
+# Meters per degree of latitude, used to express errors of the inverse
+# transformation in meters
+_METERS_PER_DEGREE = 111320.0
+
+
+class TransformBackendException(Exception):
+    pass
+
+
+class TransformBackend(object):
+    """ Interface of a transformation backend.
+
+    load() imports whatever the backend needs and raises ImportError if that
+    is not installed. create() returns a function taking x, y in the source
+    CRS and returning x, y in the destination CRS, always in easting/northing
+    or longitude/latitude order. createArray() returns the same for NumPy
+    arrays of coordinates, by default calling the function of create() for
+    every point.
+    """
+    name = None
+
+    def load(self):
+        pass
+
+    def create(self, epsg_src, epsg_dst):
+        raise NotImplementedError
+
+    def createArray(self, epsg_src, epsg_dst):
+        import numpy as np
+        point_transform = self.create(epsg_src, epsg_dst)
+
+        def transform(x, y):
+            x = np.asarray(x, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            x2 = np.empty(x.shape)
+            y2 = np.empty(y.shape)
+            for i, (xi, yi) in enumerate(zip(x.tolist(), y.tolist())):
+                x2[i], y2[i] = point_transform(xi, yi)
+            return x2, y2
+        return transform
+
+
+class OsrBackend(TransformBackend):
+    name = 'osr'
+
+    def load(self):
+        from osgeo import osr
+        self.osr = osr
+
+    def _srs(self, epsg):
+        srs = self.osr.SpatialReference()
+        # With osgeo.osr linked against PROJ 6+ the axis order of the CRS
+        # definition is honored unless told otherwise
+        # See GDAL/OGR migration guide for 2.4 to 3.0
+        # https://github.com/OSGeo/gdal/blob/master/gdal/MIGRATION_GUIDE.TXT
+        if hasattr(srs, 'SetAxisMappingStrategy'):
+            srs.SetAxisMappingStrategy(self.osr.OAMS_TRADITIONAL_GIS_ORDER)
+        srs.ImportFromEPSG(epsg)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug('EPSG:%s%s%s', epsg, os.linesep, srs.ExportToPrettyWkt())
+        return srs
+
+    def create(self, epsg_src, epsg_dst):
+        ct = self.osr.CoordinateTransformation(
+            self._srs(epsg_src), self._srs(epsg_dst))
+
+        def transform(x, y):
+            x2, y2, _ = ct.TransformPoint(x, y)
+            return x2, y2
+        return transform
+
+    def createArray(self, epsg_src, epsg_dst):
+        import numpy as np
+        ct = self.osr.CoordinateTransformation(
+            self._srs(epsg_src), self._srs(epsg_dst))
+
+        def transform(x, y):
+            x = np.asarray(x, dtype=np.float64)
+            y = np.asarray(y, dtype=np.float64)
+            if not x.size:
+                return x.copy(), y.copy()
+            points = np.array(ct.TransformPoints(np.column_stack((x, y)).tolist()))
+            return points[:, 0], points[:, 1]
+        return transform
+
+
+class PyprojBackend(TransformBackend):
+    name = 'pyproj'
+    version = 0
+
+    def load(self):
+        try:
+            from pyproj import Transformer, __version__ as pyproj_ver
+            if float(pyproj_ver[:3]) < 2.2:
+                raise ImportError('Unsupported pyproj version (need >= 2.2)')
+            self.Transformer = Transformer
+            self.version = 2
+        except ImportError:
+            from pyproj import Proj, transform, __version__ as pyproj_ver
+            if float(pyproj_ver[:3]) < 1.9 or int(pyproj_ver[4]) < 5:
+                raise ImportError('Unsupported pyproj version (need >= 1.9.5)')
+            self.Proj = Proj
+            self.transform = transform
+            self.version = 1
+
+    def create(self, epsg_src, epsg_dst):
+        if self.version == 1:
+            proj_src = self.Proj(init='epsg:{0}'.format(epsg_src))
+            proj_dst = self.Proj(init='epsg:{0}'.format(epsg_dst))
+            pyproj_transform = self.transform
+            return lambda x, y: pyproj_transform(proj_src, proj_dst, x, y)
+        return self.Transformer.from_crs(
+            epsg_src, epsg_dst, always_xy=True).transform
+
+    def createArray(self, epsg_src, epsg_dst):
+        # pyproj transforms whole arrays in one call
+        import numpy as np
+        point_transform = self.create(epsg_src, epsg_dst)
+
+        def transform(x, y):
+            x2, y2 = point_transform(np.asarray(x, dtype=np.float64),
+                                     np.asarray(y, dtype=np.float64))
+            return np.asarray(x2, dtype=np.float64), np.asarray(y2, dtype=np.float64)
+        return transform
+
+
+class QgisBackend(TransformBackend):
+    """ QgsCoordinateTransform with a default transform context. The
+    project is not used, since calibration and conversions often run in
+    processing worker threads, which must not touch the project.
+    """
+    name = 'qgis'
+
+    def load(self):
+        from qgis.core import (QgsCoordinateReferenceSystem,
+                               QgsCoordinateTransform,
+                               QgsCoordinateTransformContext, QgsPointXY)
+        self.QgsCoordinateReferenceSystem = QgsCoordinateReferenceSystem
+        self.QgsCoordinateTransform = QgsCoordinateTransform
+        self.QgsCoordinateTransformContext = QgsCoordinateTransformContext
+        self.QgsPointXY = QgsPointXY
+
+    def create(self, epsg_src, epsg_dst):
+        ct = self.QgsCoordinateTransform(
+            self.QgsCoordinateReferenceSystem('EPSG:{0}'.format(epsg_src)),
+            self.QgsCoordinateReferenceSystem('EPSG:{0}'.format(epsg_dst)),
+            self.QgsCoordinateTransformContext())
+        QgsPointXY = self.QgsPointXY
+
+        def transform(x, y):
+            pt = ct.transform(QgsPointXY(x, y))
+            return pt.x(), pt.y()
+        return transform
+
+
+class NativeBackend(TransformBackend):
+    """ The built-in Transverse Mercator and polar stereographic engines.
+    Only supports WGS 84 to and from UTM and UPS.
+    """
+    name = 'native'
+
+    @staticmethod
+    def _projection(epsg):
+        if epsg in (32661, 32761):
+            return None, 'N' if epsg == 32661 else 'S'
+        if 32601 <= epsg <= 32660 or 32701 <= epsg <= 32760:
+            return epsg % 100, 'N' if epsg < 32700 else 'S'
+        raise TransformBackendException(
+            'EPSG:{0} is not supported by the native backend.'.format(epsg))
+
+    def create(self, epsg_src, epsg_dst):
+        if epsg_src == 4326:
+            zone, hemisphere = self._projection(epsg_dst)
+            if zone is None:
+                return lambda x, y: polarstereo.toUps(y, x, hemisphere)
+            return lambda x, y: tmerc.toUtm(y, x, zone, hemisphere)
+        elif epsg_dst == 4326:
+            zone, hemisphere = self._projection(epsg_src)
+            if zone is None:
+                def transform(x, y):
+                    lat, lon = polarstereo.fromUps(x, y, hemisphere)
+                    return lon, lat
+            else:
+                def transform(x, y):
+                    lat, lon = tmerc.fromUtm(x, y, zone, hemisphere)
+                    return lon, lat
+            return transform
+        raise TransformBackendException(
+            'The native backend only transforms to and from EPSG:4326.')
+
+    def createArray(self, epsg_src, epsg_dst):
+        if not tmerc.HAVE_NUMPY:
+            return TransformBackend.createArray(self, epsg_src, epsg_dst)
+        if epsg_src == 4326:
+            zone, hemisphere = self._projection(epsg_dst)
+            north = hemisphere == 'N'
+            if zone is None:
+                return lambda x, y: polarstereo.toUpsArray(y, x, north)
+            return lambda x, y: tmerc.toUtmArray(y, x, zone, north)
+        elif epsg_dst == 4326:
+            zone, hemisphere = self._projection(epsg_src)
+            north = hemisphere == 'N'
+            if zone is None:
+                def transform(x, y):
+                    lat, lon = polarstereo.fromUpsArray(x, y, north)
+                    return lon, lat
+            else:
+                def transform(x, y):
+                    lat, lon = tmerc.fromUtmArray(x, y, zone, north)
+                    return lon, lat
+            return transform
+        raise TransformBackendException(
+            'The native backend only transforms to and from EPSG:4326.')
+
+
+class TransformCache(object):
+    """ Bounded LRU cache of transformation functions keyed by
+    (backend, epsg_src, epsg_dst, array).
+
+    Neither osr.CoordinateTransformation, pyproj transformers nor
+    QgsCoordinateTransform may be shared between threads, so every thread
+    keeps its own entries. The hit and miss counters are shared by all
+    threads.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _entries(self):
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            local.entries = OrderedDict()
+            local.generation = self._generation
+        return local.entries
+
+    def get(self, key, factory):
+        entries = self._entries()
+        ct = entries.get(key)
+        if ct is not None:
+            entries.move_to_end(key)
+            with self._lock:
+                self.hits += 1
+            return ct
+
+        ct = factory(*key)
+        entries[key] = ct
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        with self._lock:
+            self.misses += 1
+        return ct
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self.maxsize,
+            'currsize': len(self._entries())
+        }
+
+
+# Registered backends in order of preference
+_backends = OrderedDict()
+# Backend name: True if it could be loaded, False if not
+_loaded = {}
+_backend = None
+_backend_lock = threading.Lock()
+_transform_cache = TransformCache(TRANSFORM_CACHE_SIZE)
+
+
+def registerBackend(backend):
+    """ Adds a backend, or replaces the one with the same name
+
+    @param backend - TransformBackend instance
+    """
+    _backends[backend.name] = backend
+    _loaded.pop(backend.name, None)
+    _transform_cache.clear()
+
+
+for _b in (OsrBackend(), PyprojBackend(), QgisBackend(), NativeBackend()):
+    registerBackend(_b)
+
+
+def backendNames():
+    """ Returns the names of all registered backends in order of preference
+    """
+    return list(_backends)
+
+
+def isAvailable(name):
+    """ Returns True if the backend is registered and can be loaded
+    """
+    available = _loaded.get(name)
+    if available is None:
+        if name not in _backends:
+            raise TransformBackendException(
+                'Unknown transformation backend: {0}'.format(name))
+        try:
+            _backends[name].load()
+            available = True
+        except ImportError as e:
+            log.debug('Backend %s not available: %s', name, e)
+            available = False
+        _loaded[name] = available
+    return available
+
+
+def availableBackends():
+    """ Returns the names of the backends that can be loaded
+    """
+    return [name for name in _backends if isAvailable(name)]
+
+
+def _createTransform(name, epsg_src, epsg_dst, array=False):
+    if not isAvailable(name):
+        raise TransformBackendException(
+            'Transformation backend {0} is not available.'.format(name))
+    if array:
+        return _backends[name].createArray(epsg_src, epsg_dst)
+    return _backends[name].create(epsg_src, epsg_dst)
+
+
+def transformer(epsg_src, epsg_dst, backend=None):
+    """ Returns a cached function transforming x, y from one CRS to another
+
+    @param epsg_src - EPSG code of the source CRS
+    @param epsg_dst - EPSG code of the destination CRS
+    @param backend - backend name, None for getBackend()
+    @returns - function taking x, y and returning a tuple with x, y
+    """
+    if backend is None:
+        backend = _backend or getBackend()
+    return _transform_cache.get(
+        (backend, epsg_src, epsg_dst), _createTransform)
+
+
+def transform(x, y, epsg_src, epsg_dst, backend=None):
+    """ Transforms a point from one CRS to another. Coordinates are always in
+    x (easting, longitude), y (northing, latitude) order.
+
+    @param x - x coordinate in the source CRS
+    @param y - y coordinate in the source CRS
+    @param epsg_src - EPSG code of the source CRS
+    @param epsg_dst - EPSG code of the destination CRS
+    @param backend - backend name, None for getBackend()
+    @returns - tuple containing x and y in the destination CRS
+    """
+    return transformer(epsg_src, epsg_dst, backend)(x, y)
+
+
+def arrayTransformer(epsg_src, epsg_dst, backend=None):
+    """ Returns a cached function transforming NumPy arrays of x, y from one
+    CRS to another
+
+    @param epsg_src - EPSG code of the source CRS
+    @param epsg_dst - EPSG code of the destination CRS
+    @param backend - backend name, None for getBackend()
+    @returns - function taking arrays of x, y and returning a tuple with
+        arrays of x, y
+    """
+    if backend is None:
+        backend = _backend or getBackend()
+    return _transform_cache.get(
+        (backend, epsg_src, epsg_dst, True), _createTransform)
+
+
+def transformArrays(x, y, epsg_src, epsg_dst, backend=None):
+    """ Transforms arrays of points from one CRS to another with a single
+    call to the backend. Coordinates are always in x (easting, longitude),
+    y (northing, latitude) order. Requires NumPy.
+
+    @param x - array of x coordinates in the source CRS
+    @param y - array of y coordinates in the source CRS
+    @param epsg_src - EPSG code of the source CRS
+    @param epsg_dst - EPSG code of the destination CRS
+    @param backend - backend name, None for getBackend()
+    @returns - tuple containing arrays of x and y in the destination CRS
+    """
+    return arrayTransformer(epsg_src, epsg_dst, backend)(x, y)
+
+
+def _logMessage(msg):
+    try:
+        from qgis.core import Qgis, QgsMessageLog
+        QgsMessageLog.logMessage(msg, 'Lat Lon Tools', level=Qgis.Info)
+    except ImportError:
+        log.info(msg)
+
+
+def _calibrateBackend(name, rounds):
+    """ Returns the largest error in meters on the reference points and the
+    number of seconds taken to transform them rounds times in both directions
+    """
+    forward = [(_createTransform(name, 4326, epsg), lon, lat)
+               for lat, lon, epsg, _, _ in REFERENCE_POINTS]
+    inverse = [(_createTransform(name, epsg, 4326), e, n)
+               for _, _, epsg, e, n in REFERENCE_POINTS]
+
+    error = 0.0
+    for (func, lon, lat), (_, _, _, e, n) in zip(forward, REFERENCE_POINTS):
+        x, y = func(lon, lat)
+        error = max(error, abs(x - e), abs(y - n))
+    for (func, e, n), (lat, lon, _, _, _) in zip(inverse, REFERENCE_POINTS):
+        x, y = func(e, n)
+        # Longitude is undefined at the poles and may wrap around
+        dlon = (x - lon + 180.0) % 360.0 - 180.0
+        error = max(error, abs(y - lat) * _METERS_PER_DEGREE,
+                    abs(dlon) * _METERS_PER_DEGREE * math.cos(math.radians(lat)))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for func, x, y in forward:
+            func(x, y)
+        for func, x, y in inverse:
+            func(x, y)
+    return error, time.perf_counter() - start
+
+
+def calibrate(apply=True, tolerance=ACCURACY_TOLERANCE,
+              rounds=CALIBRATION_ROUNDS):
+    """ Times every available backend on the reference points and checks its
+    accuracy. The results are written to the QGIS log, or to the Python log
+    outside of QGIS.
+
+    @param apply - pin the fastest backend within tolerance with setBackend
+    @param tolerance - maximum error in meters on the reference points
+    @param rounds - number of times the reference points are transformed
+    @returns - tuple with the name of the fastest accurate backend and a list
+        of dicts with name, error (meters), seconds and pointsPerSecond for
+        every available backend
+    """
+    results = []
+    for name in availableBackends():
+        try:
+            error, seconds = _calibrateBackend(name, rounds)
+        except Exception as e:
+            _logMessage('Transformation backend {0} failed calibration: '
+                        '{1}'.format(name, e))
+            continue
+        points = 2 * len(REFERENCE_POINTS) * rounds
+        results.append({
+            'name': name,
+            'error': error,
+            'seconds': seconds,
+            'pointsPerSecond': points / seconds if seconds else float('inf')
+        })
+
+    accurate = [r for r in results if r['error'] <= tolerance]
+    best = min(accurate, key=lambda r: r['seconds'])['name'] \
+        if accurate else 'native'
+    for r in results:
+        _logMessage(
+            'Transformation backend {0}: {1:.0f} points/s, max error '
+            '{2:.2e} m{3}'.format(
+                r['name'], r['pointsPerSecond'], r['error'],
+                '' if r['error'] <= tolerance else ' (rejected)'))
+    _logMessage('Using transformation backend {0}'.format(best))
+    if apply:
+        setBackend(best)
+    return best, results
+
+
+def _defaultBackend():
+    if os.environ.get('MGRSPY_USE_NATIVE', None) is not None:
+        return 'native'
+    if os.environ.get('MGRSPY_USE_PROJ', None) is not None:
+        return 'pyproj' if isAvailable('pyproj') else 'native'
+    best, _ = calibrate(apply=False)
+    return best
+
+
+def getBackend():
+    """ Returns the name of the backend used when none is given, choosing
+    one if that has not happened yet
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _defaultBackend()
+    return _backend
+
+
+def setBackend(name):
+    """ Pins the backend used when none is given for this process
+
+    @param name - backend name, or None to choose one again on next use
+    """
+    global _backend
+    if name is not None and not isAvailable(name):
+        raise TransformBackendException(
+            'Transformation backend {0} is not available.'.format(name))
+    with _backend_lock:
+        _backend = name
+
+
+def cacheInfo():
+    """ Returns the transformation cache statistics
+
+    @returns - dict with hits, misses, maxsize and currsize (entries held by
+    the calling thread)
+    """
+    return _transform_cache.info()
+
+
+def clearCache():
+    """ Drops all cached transformations and resets the counters
+    """
+    _transform_cache.clear()
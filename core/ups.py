@@ -0,0 +1,93 @@
+import re
+import math
+from collections import namedtuple
+from . import transformBackends
+
+class UpsException(Exception):
+    pass
+
+# The accepted UPS formats, tried in this order from the start of the
+# string:
+#   letter eastingmE northingmN e.g. Z 2426773mE 1530125mN
+#   letter easting northing     e.g. Z 2426773 1530125
+#   letter eastingEnorthingN    e.g. Z2426773E1530125N
+_UPS_GRAMMAR = re.compile(
+    r'^(?:(?P<letter1>[ABYZ])\s+(?P<easting1>\d+\.?\d*)\s*M\s*E\s+(?P<northing1>\d+\.?\d*)\s*M\s*N'
+    r'|(?P<letter2>[ABYZ])\s+(?P<easting2>\d+\.?\d*)\s+(?P<northing2>\d+\.?\d*)'
+    r'|(?P<letter3>[ABYZ])(?P<easting3>\d+\.?\d*)E(?P<northing3>\d+\.?\d*)N)')
+
+UpsCoordinate = namedtuple('UpsCoordinate', ['letter', 'easting', 'northing'])
+
+def tryParse(ups_str):
+    """ Parses a UPS coordinate string with a single match of the UPS
+    grammar
+
+    @param ups_str - UPS coordinate string
+    @returns - UpsCoordinate with the letter, easting and northing or None if
+        the string is not a valid UPS coordinate
+    """
+    try:
+        m = _UPS_GRAMMAR.match(ups_str.strip().upper())
+    except (AttributeError, TypeError):
+        return(None)
+    if m is None:
+        return(None)
+    last = m.lastindex
+    letter, easting, northing = m.group(last - 2, last - 1, last)
+    return(UpsCoordinate(letter, float(easting), float(northing)))
+
+def upsParse(ups_str):
+    ups = tryParse(ups_str)
+    if ups is None:
+        raise UpsException('Invalid UPS Coordinate')
+    return(ups)
+
+def ups2LatLon(ups):
+    """ Converts a UPS coordinate string, or a UpsCoordinate returned by
+    tryParse, to a WGS 84 (lat, lon) tuple
+    """
+    if isinstance(ups, UpsCoordinate):
+        letter, easting, northing = ups
+    else:
+        letter, easting, northing = upsParse(ups)
+    if letter == 'A' or letter == 'B':
+        hemisphere = 'S'
+    else:
+        hemisphere = 'N'
+    epsg = 32661 if hemisphere == 'N' else 32761
+    lon, lat = transformBackends.transform(easting, northing, epsg, 4326)
+    return(lat, lon)
+
+def isUps(ups):
+    return(tryParse(ups) is not None)
+
+
+def latLon2Ups(lat, lon, precision=0, format=0):
+    if lon < -180 or lon > 360:
+        return("")
+    if lat < 83.5 and lat > -79.5:
+        return("")
+    if lat > 90 or lat < -90:
+        return("")
+    if lon > 180:
+        lon -= 360
+    if lat >= 83.5:
+        hemisphere = 'N'
+        if lon < 0:
+            letter = 'Y'
+        else:
+            letter = 'Z'
+    else:
+        hemisphere = 'S'
+        if lon < 0:
+            letter = 'A'
+        else:
+            letter = 'B'
+    epsg = 32661 if hemisphere == 'N' else 32761
+    upsx, upsy = transformBackends.transform(lon, lat, 4326, epsg)
+    if format == 0:
+        msg = '{} {:.{prec}f}mE {:.{prec}f}mN'.format(letter, upsx, upsy, prec=precision)
+    else:
+        msg = '{}{:.{prec}f}E{:.{prec}f}N'.format(letter, upsx, upsy, prec=precision)
+
+    return(msg)
@@ -0,0 +1,260 @@
+import re
+import math
+from collections import namedtuple
+from . import transformBackends
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:
+    HAVE_NUMPY = False
+
+# Output formats of latLon2Utm as % templates taking the easting and
+# northing, with the zone, hemisphere and precision filled in by
+# utmTemplate
+_UTM_FORMATS = (
+    '{0}{1} %.{2}f %.{2}f',
+    '%.{2}f,%.{2}f,{0}{1}',
+    '%.{2}fmE,%.{2}fmN,{0}{1}',
+    '%.{2}fmE,%.{2}fmN,{0},{1}')
+
+class UtmException(Exception):
+    pass
+
+# The accepted UTM formats, tried in this order from the start of the
+# string:
+#   zone hemisphere easting northing     e.g. 13N 278501 4486692
+#   easting,northing,zone hemisphere     e.g. 278501,4486692,13N
+#   eastingmE,northingmN,zone hemisphere e.g. 278501mE,4486692mN,13N
+#   eastingmE,northingmN,zone,hemisphere e.g. 278501mE,4486692mN,13,N
+_UTM_GRAMMAR = re.compile(
+    r'(?:(?P<zone1>\d+)\s*(?P<hemisphere1>[NS])\s+(?P<easting1>\d+\.?\d*)\s+(?P<northing1>\d+\.?\d*)'
+    r'|(?P<easting2>\d+\.?\d*)\s*,\s*(?P<northing2>\d+\.?\d*)\s*,\s*(?P<zone2>\d+)\s*(?P<hemisphere2>[NS])'
+    r'|(?P<easting3>\d+\.?\d*)\s*M\s*E\s*,\s*(?P<northing3>\d+\.?\d*)\s*M\s*N\s*,\s*(?P<zone3>\d+)\s*(?P<hemisphere3>[NS])'
+    r'|(?P<easting4>\d+\.?\d*)\s*M\s*E\s*,\s*(?P<northing4>\d+\.?\d*)\s*M\s*N\s*,\s*(?P<zone4>\d+)\s*,\s*(?P<hemisphere4>[NS]))')
+
+UtmCoordinate = namedtuple('UtmCoordinate', ['zone', 'hemisphere', 'easting', 'northing'])
+
+def tryParse(utm_str):
+    """ Parses a UTM coordinate string with a single match of the UTM
+    grammar
+
+    @param utm_str - UTM coordinate string
+    @returns - UtmCoordinate with the zone, hemisphere, easting and northing
+        or None if the string is not a valid UTM coordinate
+    """
+    try:
+        m = _UTM_GRAMMAR.match(utm_str.strip().upper())
+    except (AttributeError, TypeError):
+        return(None)
+    if m is None:
+        return(None)
+    last = m.lastindex
+    if last == 4:
+        zone, hemisphere, easting, northing = m.group(1, 2, 3, 4)
+    else:
+        easting, northing, zone, hemisphere = m.group(last - 3, last - 2, last - 1, last)
+    zone = int(zone)
+    if zone < 1 or zone > 60:
+        return(None)
+    return(UtmCoordinate(zone, hemisphere, float(easting), float(northing)))
+
+def utmParse(utm_str):
+    utm = tryParse(utm_str)
+    if utm is None:
+        raise UtmException('Invalid UTM Coordinate')
+    return(utm)
+
+def utm2LatLon(utm):
+    """ Converts a UTM coordinate string, or a UtmCoordinate returned by
+    tryParse, to a WGS 84 (lat, lon) tuple
+    """
+    if isinstance(utm, UtmCoordinate):
+        zone, hemisphere, easting, northing = utm
+    else:
+        zone, hemisphere, easting, northing = utmParse(utm)
+    lon, lat = transformBackends.transform(
+        easting, northing, utmEpsgCode(hemisphere, zone), 4326)
+    return(lat, lon)
+
+def isUtm(utm):
+    return(tryParse(utm) is not None)
+
+def latLon2UtmZone(lat, lon):
+    if lon < -180 or lon > 360:
+        raise UtmException('Invalid longitude')
+    if lat > 84.5 or lat < -80.5:
+        raise UtmException('Invalid latitude')
+    if lon < 180:
+        zone = int(31 + (lon / 6.0))
+    else:
+        zone = int((lon / 6) - 29)
+
+    if zone > 60:
+        zone = 1
+    # Handle UTM special cases
+    if 56.0 <= lat < 64.0 and 3.0 <= lon < 12.0:
+        zone = 32
+
+    if 72.0 <= lat < 84.0:
+        if 0.0 <= lon < 9.0:
+            zone = 31
+        elif 9.0 <= lon < 21.0:
+            zone = 33
+        elif 21.0 <= lon < 33.0:
+            zone = 35
+        elif 33.0 <= lon < 42.0:
+            zone = 37
+
+    if lat < 0:
+        hemisphere = 'S'
+    else:
+        hemisphere = 'N'
+    return(zone, hemisphere)
+
+def latLon2UtmParameters(lat, lon):
+    zone, hemisphere = latLon2UtmZone(lat, lon)
+    utmx, utmy = transformBackends.transform(
+        lon, lat, 4326, utmEpsgCode(hemisphere, zone))
+    return(zone, hemisphere, utmx, utmy)
+
+def utmTemplate(zone, hemisphere, precision, format=0):
+    """ Returns the % template formatting an easting and northing in the
+    given zone like latLon2Utm
+    """
+    return _UTM_FORMATS[format if format in (0, 1, 2) else 3].format(zone, hemisphere, precision)
+
+def latLon2Utm(lat, lon, precision, format=0):
+    try:
+        zone, hemisphere, utmx, utmy = latLon2UtmParameters(lat, lon)
+        msg = utmTemplate(zone, hemisphere, precision, format) % (utmx, utmy)
+    except Exception:
+        msg = ''
+    return(msg)
+
+def utmEpsgCode(hemisphere, zone):
+    if hemisphere == 'N':
+        return(32600 + zone)
+    return(32700 + zone)
+
+def utmGetEpsg(hemisphere, zone):
+    return('EPSG:{}'.format(utmEpsgCode(hemisphere, zone)))
+
+def latLon2UtmZoneArray(lat, lon):
+    """ Array version of latLon2UtmZone. Requires NumPy.
+
+    @param lat - array of latitudes
+    @param lon - array of longitudes
+    @returns - tuple of arrays of the zone numbers, True for the northern
+        hemisphere and True where latLon2UtmZone accepts the point
+    """
+    lat, lon = np.broadcast_arrays(
+        np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+    valid = (np.isfinite(lat) & np.isfinite(lon) & (lon >= -180) & (lon <= 360) &
+             (lat <= 84.5) & (lat >= -80.5))
+    lat = np.where(valid, lat, 0.0)
+    lon = np.where(valid, lon, 0.0)
+    zone = np.where(lon < 180, np.trunc(31 + (lon / 6.0)),
+                    np.trunc((lon / 6) - 29)).astype(np.int64)
+    zone[zone > 60] = 1
+    # Handle UTM special cases
+    zone[(56.0 <= lat) & (lat < 64.0) & (3.0 <= lon) & (lon < 12.0)] = 32
+    svalbard = (72.0 <= lat) & (lat < 84.0)
+    for lon_min, lon_max, z in ((0.0, 9.0, 31), (9.0, 21.0, 33),
+                                (21.0, 33.0, 35), (33.0, 42.0, 37)):
+        zone[svalbard & (lon_min <= lon) & (lon < lon_max)] = z
+    return zone, lat >= 0, valid
+
+def _epsgGroups(zone, north, valid):
+    """ Yields the EPSG code and row indices of every UTM zone and
+    hemisphere present in the valid rows
+    """
+    epsg = np.where(north, 32600, 32700) + zone
+    epsg = np.where(valid, epsg, 0)
+    order = np.argsort(epsg, kind='stable')
+    codes, starts = np.unique(epsg[order], return_index=True)
+    ends = np.append(starts[1:], order.size)
+    for code, start, end in zip(codes.tolist(), starts.tolist(), ends.tolist()):
+        if code:
+            yield code, order[start:end]
+
+def latLon2UtmParametersArray(lat, lon):
+    """ Array version of latLon2UtmParameters. The points are grouped by
+    zone and hemisphere and every group is transformed with one call.
+    Requires NumPy.
+
+    @param lat - array of latitudes
+    @param lon - array of longitudes
+    @returns - tuple of arrays of the zone numbers, True for the northern
+        hemisphere, eastings, northings and True where the point is valid.
+        Eastings and northings are NaN for invalid points.
+    """
+    lat, lon = np.broadcast_arrays(
+        np.asarray(lat, dtype=np.float64), np.asarray(lon, dtype=np.float64))
+    shape = lat.shape
+    lat = lat.ravel()
+    lon = lon.ravel()
+    zone, north, valid = latLon2UtmZoneArray(lat, lon)
+    utmx = np.full(lat.size, np.nan)
+    utmy = np.full(lat.size, np.nan)
+    for epsg, rows in _epsgGroups(zone, north, valid):
+        utmx[rows], utmy[rows] = transformBackends.transformArrays(
+            lon[rows], lat[rows], 4326, epsg)
+    return (zone.reshape(shape), north.reshape(shape), utmx.reshape(shape),
+            utmy.reshape(shape), valid.reshape(shape))
+
+def latLon2UtmArray(lat, lon, precision, format=0):
+    """ Array version of latLon2Utm giving an empty string for invalid
+    points. Requires NumPy.
+
+    @param lat - array of latitudes
+    @param lon - array of longitudes
+    @param precision - number of decimal digits of the easting and northing
+    @param format - output format as in latLon2Utm
+    @returns - array of UTM strings
+    """
+    zone, north, utmx, utmy, valid = latLon2UtmParametersArray(lat, lon)
+    shape = zone.shape
+    zone = zone.ravel()
+    north = north.ravel()
+    utmx = utmx.ravel()
+    utmy = utmy.ravel()
+    msgs = [''] * zone.size
+    for epsg, rows in _epsgGroups(zone, north, valid.ravel()):
+        template = utmTemplate(epsg % 100, 'N' if epsg < 32700 else 'S', precision, format)
+        for i, x, y in zip(rows.tolist(), utmx[rows].tolist(), utmy[rows].tolist()):
+            msgs[i] = template % (x, y)
+    return np.array(msgs, dtype=str).reshape(shape)
+
+def utm2LatLonArray(utms):
+    """ Converts an array of UTM strings to latitudes and longitudes. The
+    strings are parsed with tryParse and grouped by zone and hemisphere so
+    every group is transformed with one call. Requires NumPy.
+
+    @param utms - array or sequence of UTM strings
+    @returns - tuple of arrays of latitudes, longitudes and True where the
+        string is valid. Latitudes and longitudes are NaN for invalid strings.
+    """
+    values = np.asarray(utms, dtype=object)
+    shape = values.shape
+    values = values.ravel()
+    count = values.size
+    zone = np.zeros(count, dtype=np.int64)
+    north = np.zeros(count, dtype=bool)
+    easting = np.zeros(count)
+    northing = np.zeros(count)
+    valid = np.zeros(count, dtype=bool)
+    for i, s in enumerate(values.tolist()):
+        utm = tryParse(s)
+        if utm is None:
+            continue
+        zone[i], hemisphere, easting[i], northing[i] = utm
+        north[i] = hemisphere == 'N'
+        valid[i] = True
+    lat = np.full(count, np.nan)
+    lon = np.full(count, np.nan)
+    for epsg, rows in _epsgGroups(zone, north, valid):
+        lon[rows], lat[rows] = transformBackends.transformArrays(
+            easting[rows], northing[rows], epsg, 4326)
+    return lat.reshape(shape), lon.reshape(shape), valid.reshape(shape)
+
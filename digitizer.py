@@ -5,13 +5,14 @@ from qgis.PyQt.QtCore import QSize, QSettings, QTextCodec
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QDialog, QMenu
 from qgis.PyQt.uic import loadUiType
-from qgis.core import Qgis, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsVectorDataProvider, QgsGeometry, QgsPointXY, QgsJsonUtils, QgsWkbTypes, QgsProject, QgsVectorLayerUtils
+from qgis.core import Qgis, QgsCoordinateReferenceSystem, QgsVectorDataProvider, QgsGeometry, QgsPointXY, QgsJsonUtils, QgsWkbTypes, QgsVectorLayerUtils
 from qgis.gui import QgsProjectionSelectionDialog
 from .util import epsg4326, parseDMSString
+from . import transformCache
 # import traceback
 
-from . import mgrs
-from . import olc
+from .core import mgrs
+from .core import olc
 from .utm import utm2Point
 
 FORM_CLASS, _ = loadUiType(os.path.join(
@@ -149,7 +150,7 @@ class DigitizerWidget(QDialog, FORM_CLASS):
                 if self.inputProjection == 2:  # Project CRS
                     srcCrs = self.canvas.mapSettings().destinationCrs()
                 else:
-                    srcCrs = QgsCoordinateReferenceSystem(self.inputCustomCRS)
+                    srcCrs = transformCache.crsFromString(self.inputCustomCRS)
         except Exception:
             # traceback.print_exc()
             self.iface.messageBar().pushMessage("", "Invalid Coordinate", level=Qgis.Warning, duration=2)
@@ -158,7 +159,7 @@ class DigitizerWidget(QDialog, FORM_CLASS):
         caps = layer.dataProvider().capabilities()
         if caps & QgsVectorDataProvider.AddFeatures:
             destCRS = layer.crs()  # Get the CRS of the layer we are adding a point toWgs
-            transform = QgsCoordinateTransform(srcCrs, destCRS, QgsProject.instance())
+            transform = transformCache.coordinateTransform(srcCrs, destCRS)
             # Transform the input coordinate projection to the layer CRS
             x, y = transform.transform(float(lon), float(lat))
             geom = QgsGeometry.fromPointXY(QgsPointXY(x, y))
@@ -15,14 +15,16 @@ from qgis.core import (
     QgsProcessingParameterFeatureSource,
     QgsProcessingParameterFeatureSink)
 
-from . import mgrs
-from .util import epsg4326, parseDMSString
-from . import olc
-from . import geohash
+from .core import mgrs
+from .util import epsg4326, tryParseDMSString
+from .core import olc
+from .core import geohash
+from .batchconvert import decodeField
+from .core.convert import Decoder
 from .utm import isUtm, utm2Point
-from .maidenhead import maidenGridCenter
+from .core.maidenhead import maidenGridCenter
 from .ups import ups2Point
-from . import georef
+from .core import georef
 # import traceback
 
 
@@ -121,6 +123,17 @@ class Field2GeomAlgorithm(QgsProcessingAlgorithm):
         total = 100.0 / source.featureCount() if source.featureCount() else 0
         failed = 0
 
+        batchDecoder = None
+        if field_type >= 3 or input_crs == epsg4326:
+            batchDecoder = Decoder(field_type).batch
+        if batchDecoder is not None:
+            failed = decodeField(source, sink, field1_name, batchDecoder, feedback, total,
+                                 field2_name if field_type == 0 else None)
+            if failed > 0:
+                msg = "{} out of {} features were invalid".format(failed, source.featureCount())
+                feedback.pushInfo(msg)
+            return {self.PrmOutputLayer: dest_id}
+
         iterator = source.getFeatures()
         for cnt, feature in enumerate(iterator):
             if feedback.isCanceled():
@@ -131,13 +144,19 @@ class Field2GeomAlgorithm(QgsProcessingAlgorithm):
                     attr_x = feature[field2_name].strip()
                     if input_crs == epsg4326:
                         text = '{} {}'.format(attr1, attr_x)
-                        lat, lon = parseDMSString(text, 0)
+                        lat, lon, error = tryParseDMSString(text, 0)
+                        if error is not None:
+                            failed += 1
+                            continue
                     else:
                         lat = float(attr1)
                         lon = float(attr_x)
                 elif field_type == 1:  # Lat (y), Lon (x)
                     if input_crs == epsg4326:
-                        lat, lon = parseDMSString(attr1, 0)
+                        lat, lon, error = tryParseDMSString(attr1, 0)
+                        if error is not None:
+                            failed += 1
+                            continue
                     else:
                         coords = re.split(r'[\s,;:]+', attr1, 1)
                         if len(coords) < 2:
@@ -146,7 +165,10 @@ class Field2GeomAlgorithm(QgsProcessingAlgorithm):
                         lon = float(coords[1])
                 elif field_type == 2:  # Lon (x), Lat (y)
                     if input_crs == epsg4326:
-                        lat, lon = parseDMSString(attr1, 1)
+                        lat, lon, error = tryParseDMSString(attr1, 1)
+                        if error is not None:
+                            failed += 1
+                            continue
                     else:
                         coords = re.split(r'[\s,;:]+', attr1, 1)
                         if len(coords) < 2:
@@ -154,8 +176,7 @@ class Field2GeomAlgorithm(QgsProcessingAlgorithm):
                         lon = float(coords[0])
                         lat = float(coords[1])
                 elif field_type == 3:  # MGRS
-                    m = re.sub(r'\s+', '', str(attr1))  # Remove all white space
-                    lat, lon = mgrs.toWgs(m)
+                    lat, lon = mgrs.toWgs(str(attr1))
                 elif field_type == 4:  # Plus codes
                     coord = olc.decode(attr1)
                     lat = coord.latitudeCenter
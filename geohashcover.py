@@ -0,0 +1,197 @@
+import os
+
+from qgis.PyQt.QtCore import QVariant, QUrl
+from qgis.PyQt.QtGui import QIcon
+from qgis.core import (
+    QgsFields, QgsField, QgsFeature, QgsGeometry, QgsRectangle,
+    QgsWkbTypes, QgsFeatureSink, QgsCoordinateTransform, QgsCsException)
+
+from qgis.core import (
+    QgsProcessing,
+    QgsProcessingException,
+    QgsProcessingAlgorithm,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterString,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterFeatureSink)
+
+from .core import geohash
+from .util import epsg4326
+
+
+def coverCells(geom, precision, isCanceled=None):
+    """
+    Generate the smallest set of geohash cells, of at most precision
+    characters, that cover a polygon geometry in EPSG:4326. A cell that is
+    completely inside the polygon is returned as a whole. A cell crossing
+    the polygon boundary is divided into its 32 children until precision is
+    reached. The cells are generated in sorted order, depth first, so only
+    the current path of the search is kept in memory.
+
+    When isCanceled returns True the generation stops early and the cells
+    already generated are an incomplete cover; the caller has to check for
+    cancellation once the generator is done.
+    """
+    bbox = geom.boundingBox()
+    engine = QgsGeometry.createGeometryEngine(geom.constGet())
+    engine.prepareGeometry()
+
+    stack = geohash.children('')
+    stack.reverse()
+    count = 0
+    while stack:
+        code = stack.pop()
+        count += 1
+        if isCanceled and count % 1000 == 0 and isCanceled():
+            return
+        south, west, north, east = geohash.bounds(code)
+        rect = QgsRectangle(west, south, east, north)
+        if not bbox.intersects(rect):
+            continue
+        cell = QgsGeometry.fromRect(rect)
+        if engine.contains(cell.constGet()):
+            yield code, rect
+        elif engine.intersects(cell.constGet()):
+            if len(code) < precision:
+                children = geohash.children(code)
+                children.reverse()
+                stack.extend(children)
+            elif not engine.touches(cell.constGet()):
+                yield code, rect
+
+
+class GeohashCoverAlgorithm(QgsProcessingAlgorithm):
+    """
+    Algorithm to cover the polygons of a layer with geohash cells.
+    """
+    PrmInputLayer = 'InputLayer'
+    PrmPrecision = 'Precision'
+    PrmOutputType = 'OutputType'
+    PrmFieldName = 'FieldName'
+    PrmOutputLayer = 'OutputLayer'
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInputLayer,
+                'Input polygon vector layer',
+                [QgsProcessing.TypeVectorPolygon])
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PrmPrecision,
+                'Maximum geohash precision',
+                type=QgsProcessingParameterNumber.Integer,
+                defaultValue=6,
+                optional=False,
+                minValue=1,
+                maxValue=geohash.MAX_INT_PRECISION)
+        )
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.PrmOutputType,
+                'Output',
+                options=['Geohash cell polygons', 'Geohash code table without geometry'],
+                defaultValue=0,
+                optional=False)
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.PrmFieldName,
+                'Geohash field name',
+                defaultValue='geohash')
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutputLayer,
+                'Output layer')
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInputLayer, context)
+        precision = self.parameterAsInt(parameters, self.PrmPrecision, context)
+        outputType = self.parameterAsInt(parameters, self.PrmOutputType, context)
+        field_name = self.parameterAsString(parameters, self.PrmFieldName, context).strip()
+
+        fieldsout = QgsFields(source.fields())
+        if fieldsout.append(QgsField(field_name, QVariant.String)) is False:
+            msg = "Geohash field name must be unique. There is already a field named '{}'".format(field_name)
+            feedback.reportError(msg)
+            raise QgsProcessingException(msg)
+
+        if outputType == 0:
+            wkbType = QgsWkbTypes.Polygon
+        else:
+            wkbType = QgsWkbTypes.NoGeometry
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutputLayer,
+            context, fieldsout, wkbType, epsg4326)
+
+        layerCRS = source.sourceCrs()
+        if layerCRS != epsg4326:
+            transform = QgsCoordinateTransform(layerCRS, epsg4326, context.transformContext())
+
+        total = 100.0 / source.featureCount() if source.featureCount() else 0
+        cellCount = 0
+        failed = 0
+
+        iterator = source.getFeatures()
+        for cnt, feature in enumerate(iterator):
+            if feedback.isCanceled():
+                break
+            geom = feature.geometry()
+            if geom.isEmpty():
+                continue
+            if layerCRS != epsg4326:
+                try:
+                    geom.transform(transform)
+                except QgsCsException:
+                    failed += 1
+                    continue
+            attributes = feature.attributes()
+            # The cells are written as they are generated so memory use does
+            # not grow with the size of the cover
+            for code, rect in coverCells(geom, precision, feedback.isCanceled):
+                f = QgsFeature()
+                if outputType == 0:
+                    f.setGeometry(QgsGeometry.fromRect(rect))
+                f.setAttributes(attributes + [code])
+                sink.addFeature(f, QgsFeatureSink.FastInsert)
+                cellCount += 1
+            if feedback.isCanceled():
+                feedback.pushInfo('Canceled: the cover of the last polygon written is incomplete')
+                break
+            feedback.setProgress(int(cnt * total))
+
+        if failed > 0:
+            msg = "{} out of {} features could not be covered".format(failed, source.featureCount())
+            feedback.pushInfo(msg)
+        feedback.pushInfo('{} geohash cells'.format(cellCount))
+        return {self.PrmOutputLayer: dest_id}
+
+    def name(self):
+        return 'geohashcover'
+
+    def icon(self):
+        return QIcon(os.path.dirname(__file__) + '/images/geom2field.svg')
+
+    def displayName(self):
+        return 'Cover polygons with geohash cells'
+
+    def helpUrl(self):
+        file = os.path.dirname(__file__) + '/index.html'
+        if not os.path.exists(file):
+            return ''
+        return QUrl.fromLocalFile(file).toString(QUrl.FullyEncoded)
+
+    def shortHelpString(self):
+        file = os.path.dirname(__file__) + '/doc/geohashcover.help'
+        if not os.path.exists(file):
+            return ''
+        with open(file) as helpf:
+            help = helpf.read()
+        return help
+
+    def createInstance(self):
+        return GeohashCoverAlgorithm()
@@ -0,0 +1,200 @@
+import os
+import math
+
+from qgis.PyQt.QtCore import QVariant, QUrl
+from qgis.PyQt.QtGui import QIcon
+from qgis.core import QgsField, QgsFeature, QgsFeatureSink, QgsCoordinateTransform
+
+from qgis.core import (
+    QgsProcessing,
+    QgsProcessingException,
+    QgsProcessingUtils,
+    QgsProcessingAlgorithm,
+    QgsProcessingParameterNumber,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterFeatureSink)
+
+from .core import geohash
+from .util import epsg4326
+
+# Mean earth radius in meters
+EARTH_RADIUS = 6371008.8
+_METERS_PER_DEGREE = EARTH_RADIUS * math.pi / 180.0
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """ Returns the great circle distance in meters between two points
+    """
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def prefixLength(distance, maxLatitude):
+    """ Returns the longest geohash length whose cells are at least distance
+    meters high and wide everywhere up to maxLatitude, so any point within
+    distance of a point is in its cell or one of the 8 neighbouring cells.
+    Returns 0 if even single character cells are too small.
+
+    @param distance - distance in meters
+    @param maxLatitude - largest absolute latitude in degrees of the points
+    """
+    coslat = math.cos(math.radians(min(abs(maxLatitude), 90.0)))
+    for length in range(geohash.MAX_INT_PRECISION, 0, -1):
+        height = 180.0 / (1 << (5 * length // 2)) * _METERS_PER_DEGREE
+        width = 360.0 / (1 << ((5 * length + 1) // 2)) * _METERS_PER_DEGREE * coslat
+        if height >= distance and width >= distance:
+            return length
+    return 0
+
+
+class GeohashJoinAlgorithm(QgsProcessingAlgorithm):
+    """
+    Algorithm to join the points of one layer to the points of another
+    layer within a distance.
+    """
+    PrmInputLayer = 'InputLayer'
+    PrmJoinLayer = 'JoinLayer'
+    PrmDistance = 'Distance'
+    PrmOutputLayer = 'OutputLayer'
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInputLayer,
+                'Input point vector layer',
+                [QgsProcessing.TypeVectorPoint])
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmJoinLayer,
+                'Point layer to join',
+                [QgsProcessing.TypeVectorPoint])
+        )
+        self.addParameter(
+            QgsProcessingParameterNumber(
+                self.PrmDistance,
+                'Distance in meters',
+                type=QgsProcessingParameterNumber.Double,
+                defaultValue=1000.0,
+                optional=False,
+                minValue=0.0)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutputLayer,
+                'Output layer')
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInputLayer, context)
+        join_source = self.parameterAsSource(parameters, self.PrmJoinLayer, context)
+        distance = self.parameterAsDouble(parameters, self.PrmDistance, context)
+
+        fieldsout = QgsProcessingUtils.combineFields(source.fields(), join_source.fields())
+        if fieldsout.append(QgsField('distance', QVariant.Double)) is False:
+            msg = "Field names must be unique. There is already a field named 'distance'"
+            feedback.reportError(msg)
+            raise QgsProcessingException(msg)
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutputLayer,
+            context, fieldsout, source.wkbType(), source.sourceCrs())
+
+        layerCRS = source.sourceCrs()
+        joinCRS = join_source.sourceCrs()
+        transform = None
+        join_transform = None
+        if layerCRS != epsg4326:
+            transform = QgsCoordinateTransform(layerCRS, epsg4326, context.transformContext())
+        if joinCRS != epsg4326:
+            join_transform = QgsCoordinateTransform(joinCRS, epsg4326, context.transformContext())
+
+        extent = source.sourceExtent()
+        if transform is not None:
+            extent = transform.transformBoundingBox(extent)
+        maxLatitude = max(abs(extent.yMinimum()), abs(extent.yMaximum())) + distance / _METERS_PER_DEGREE
+        length = prefixLength(distance, maxLatitude)
+        feedback.pushInfo('Using geohash cells of length {}'.format(length))
+
+        # Bucket the join layer by geohash
+        buckets = {}
+        for feature in join_source.getFeatures():
+            if feedback.isCanceled():
+                return {self.PrmOutputLayer: dest_id}
+            try:
+                pt = feature.geometry().asPoint()
+                if join_transform is not None:
+                    pt = join_transform.transform(pt)
+            except Exception:
+                continue
+            cell = geohash.encode(pt.y(), pt.x(), length)
+            buckets.setdefault(cell, []).append((pt.y(), pt.x(), feature.attributes()))
+
+        total = 100.0 / source.featureCount() if source.featureCount() else 0
+        candidates = 0
+        matches = 0
+
+        for cnt, feature in enumerate(source.getFeatures()):
+            if feedback.isCanceled():
+                break
+            try:
+                pt = feature.geometry().asPoint()
+                if transform is not None:
+                    pt = transform.transform(pt)
+            except Exception:
+                continue
+            lat = pt.y()
+            lon = pt.x()
+            cell = geohash.encode(lat, lon, length)
+            if length:
+                # At coarse lengths the neighbours can repeat as longitudes wrap
+                cells = set(geohash.neighbours(cell))
+                cells.add(cell)
+            else:
+                cells = [cell]
+            for c in cells:
+                bucket = buckets.get(c)
+                if not bucket:
+                    continue
+                candidates += len(bucket)
+                for join_lat, join_lon, join_attributes in bucket:
+                    d = haversine(lat, lon, join_lat, join_lon)
+                    if d <= distance:
+                        matches += 1
+                        f = QgsFeature()
+                        f.setGeometry(feature.geometry())
+                        f.setAttributes(feature.attributes() + join_attributes + [d])
+                        sink.addFeature(f, QgsFeatureSink.FastInsert)
+            if cnt % 100 == 0:
+                feedback.setProgress(int(cnt * total))
+
+        feedback.pushInfo('{} candidate pairs checked, {} within {} meters'.format(candidates, matches, distance))
+        return {self.PrmOutputLayer: dest_id}
+
+    def name(self):
+        return 'geohashjoin'
+
+    def icon(self):
+        return QIcon(os.path.dirname(__file__) + '/images/geom2field.svg')
+
+    def displayName(self):
+        return 'Join points within a distance'
+
+    def helpUrl(self):
+        file = os.path.dirname(__file__) + '/index.html'
+        if not os.path.exists(file):
+            return ''
+        return QUrl.fromLocalFile(file).toString(QUrl.FullyEncoded)
+
+    def shortHelpString(self):
+        file = os.path.dirname(__file__) + '/doc/geohashjoin.help'
+        if not os.path.exists(file):
+            return ''
+        with open(file) as helpf:
+            help = helpf.read()
+        return help
+
+    def createInstance(self):
+        return GeohashJoinAlgorithm()
@@ -2,7 +2,7 @@ import os
 
 from qgis.PyQt.QtCore import QVariant, QCoreApplication, QUrl
 from qgis.PyQt.QtGui import QIcon
-from qgis.core import QgsFields, QgsField, QgsFeature, QgsCoordinateTransform, QgsProject
+from qgis.core import QgsFields, QgsField, QgsFeature, QgsCoordinateTransform
 
 from qgis.core import (
     QgsProcessing,
@@ -16,14 +16,16 @@ from qgis.core import (
     QgsProcessingParameterFeatureSource,
     QgsProcessingParameterFeatureSink)
 
-from . import mgrs
-from .util import epsg4326, convertDD2DMS, formatDmsString
+from .core import mgrs
+from .util import epsg4326, coordFormatter, dmsFormatter
+from .batchconvert import encodePoints
+from .core.convert import Encoder
 from .utm import latLon2Utm
-from . import olc
-from . import geohash
-from .maidenhead import toMaiden
+from .core import olc
+from .core import geohash
+from .core.maidenhead import toMaiden
 from .ups import latLon2Ups
-from . import georef
+from .core import georef
 
 def tr(string):
     return QCoreApplication.translate('Processing', string)
@@ -244,7 +246,12 @@ class Geom2FieldAlgorithm(QgsProcessingAlgorithm):
         elif crsType == 1:  # Layer CRS
             outCRS = layerCRS
         elif crsType == 2:  # Project CRS
-            outCRS = QgsProject.instance().crs()
+            project = context.project()
+            if project is None:
+                msg = "Project CRS requires a project"
+                feedback.reportError(msg)
+                raise QgsProcessingException(msg)
+            outCRS = project.crs()
         else:
             outCRS = crsOther
 
@@ -264,32 +271,47 @@ class Geom2FieldAlgorithm(QgsProcessingAlgorithm):
             context, fieldsout, source.wkbType(), layerCRS)
 
         if layerCRS != outCRS:
-            transform = QgsCoordinateTransform(layerCRS, outCRS, QgsProject.instance())
+            transform = QgsCoordinateTransform(layerCRS, outCRS, context.transformContext())
+        else:
+            transform = None
 
         total = 100.0 / source.featureCount() if source.featureCount() else 0
 
+        batchEncoder = Encoder(
+            outputFormat, dmsPrecision=dmsPrecision, plusCodesLength=plusCodesLength,
+            geohashPrecision=geohashPrecision, maidenPrecision=maidenPrecision,
+            georefPrecision=georefPrecision).batch
+        if batchEncoder is not None:
+            encodePoints(source, sink, transform, batchEncoder, feedback, total)
+            return {self.PrmOutputLayer: dest_id}
+
+        # The DMS formats are set up once for all the features
+        if wgs84Format == 1:  # DMS
+            dms_mode = 0
+        elif wgs84Format == 2:  # D M.MM
+            dms_mode = 2
+        else:  # DDMMSS
+            dms_mode = 1
+        formatLat = coordFormatter(True, dms_mode, dmsPrecision, use_dms_space, dms_pad_with_space)
+        formatLon = coordFormatter(False, dms_mode, dmsPrecision, use_dms_space, dms_pad_with_space)
+        formatPair = dmsFormatter(dms_mode, dmsPrecision, coordOrder, delimiter, use_dms_space, dms_pad_with_space)
+
         iterator = source.getFeatures()
         for cnt, feature in enumerate(iterator):
             if feedback.isCanceled():
                 break
             try:
                 pt = feature.geometry().asPoint()
-                if layerCRS != outCRS:
+                if transform is not None:
                     pt = transform.transform(pt)
                 if outputFormat == 0:  # Two fields for coordinates
                     if outCRS == epsg4326:
                         if wgs84Format == 0:  # Decimal Degrees
                             msg = '{:.{prec}f}'.format(pt.y(), prec=decimalPrecision)
                             msg2 = '{:.{prec}f}'.format(pt.x(), prec=decimalPrecision)
-                        elif wgs84Format == 1:  # DMS
-                            msg = convertDD2DMS(pt.y(), True, 0, dmsPrecision, use_dms_space, dms_pad_with_space)
-                            msg2 = convertDD2DMS(pt.x(), False, 0, dmsPrecision, use_dms_space, dms_pad_with_space)
-                        elif wgs84Format == 2:  # D M.MM
-                            msg = convertDD2DMS(pt.y(), True, 2, dmsPrecision, use_dms_space, dms_pad_with_space)
-                            msg2 = convertDD2DMS(pt.x(), False, 2, dmsPrecision, use_dms_space, dms_pad_with_space)
-                        else:  # DDMMSS
-                            msg = convertDD2DMS(pt.y(), True, 1, dmsPrecision, use_dms_space, dms_pad_with_space)
-                            msg2 = convertDD2DMS(pt.x(), False, 1, dmsPrecision, use_dms_space, dms_pad_with_space)
+                        else:  # DMS, D M.MM or DDMMSS
+                            msg = formatLat(pt.y())
+                            msg2 = formatLon(pt.x())
                     else:
                         msg = '{:.{prec}f}'.format(pt.y(), prec=decimalPrecision)
                         msg2 = '{:.{prec}f}'.format(pt.x(), prec=decimalPrecision)
@@ -300,12 +322,8 @@ class Geom2FieldAlgorithm(QgsProcessingAlgorithm):
                                 msg = '{:.{prec}f}{}{:.{prec}f}'.format(pt.y(), delimiter, pt.x(), prec=decimalPrecision)
                             else:
                                 msg = '{:.{prec}f}{}{:.{prec}f}'.format(pt.x(), delimiter, pt.y(), prec=decimalPrecision)
-                        elif wgs84Format == 1:  # DMS
-                            msg = formatDmsString(pt.y(), pt.x(), 0, dmsPrecision, coordOrder, delimiter, use_dms_space, dms_pad_with_space)
-                        elif wgs84Format == 2:  # D M.MM
-                            msg = formatDmsString(pt.y(), pt.x(), 2, dmsPrecision, coordOrder, delimiter, use_dms_space, dms_pad_with_space)
-                        else:  # DDMMSS
-                            msg = formatDmsString(pt.y(), pt.x(), 1, dmsPrecision, coordOrder, delimiter, use_dms_space, dms_pad_with_space)
+                        else:  # DMS, D M.MM or DDMMSS
+                            msg = formatPair(pt.y(), pt.x())
                     else:
                         if coordOrder == 0:
                             msg = '{:.{prec}f}{}{:.{prec}f}'.format(pt.y(), delimiter, pt.x(), prec=decimalPrecision)
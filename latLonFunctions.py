@@ -1,19 +1,19 @@
 import re
-from qgis.core import QgsPointXY, QgsGeometry, QgsExpression, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+from qgis.core import QgsPointXY, QgsGeometry, QgsExpression, QgsCoordinateReferenceSystem
 from qgis.utils import qgsfunction
 # from qgis.gui import *
-from . import mgrs as mg
+from .core import mgrs as mg
 from .utm import latLon2Utm, utm2Point, latLon2UtmZone, utmGetEpsg, latLon2UtmParameters
-from . import olc
+from .core import olc
 from .util import formatDmsString
+from . import transformCache
 # import traceback
 
 group_name = 'Lat Lon Tools'
 epsg4326 = QgsCoordinateReferenceSystem("EPSG:4326")
 
 def transform_coords(y, x, crs):
-    coord_crs = QgsCoordinateReferenceSystem(crs)
-    transform = QgsCoordinateTransform(coord_crs, epsg4326, QgsProject.instance())
+    transform = transformCache.coordinateTransform(crs, epsg4326)
     pt = transform.transform(x, y)
     return(pt.y(), pt.x())
 
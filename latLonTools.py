@@ -1,7 +1,7 @@
 from qgis.PyQt.QtCore import Qt, QTimer, QUrl
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction, QMenu, QApplication, QToolButton
-from qgis.core import Qgis, QgsCoordinateTransform, QgsVectorLayer, QgsRectangle, QgsPoint, QgsPointXY, QgsGeometry, QgsWkbTypes, QgsProject, QgsApplication
+from qgis.core import Qgis, QgsVectorLayer, QgsRectangle, QgsPoint, QgsPointXY, QgsGeometry, QgsWkbTypes, QgsApplication
 from qgis.gui import QgsRubberBand
 import processing
 
@@ -12,6 +12,7 @@ from .settings import SettingsWidget, settings
 from .provider import LatLonToolsProvider
 from .util import epsg4326
 from .captureExtent import getExtentString
+from . import transformCache
 import os
 
 
@@ -33,6 +34,7 @@ class LatLonTools:
 
     def initGui(self):
         '''Initialize Lot Lon Tools GUI.'''
+        transformCache.connectProject()
         # Initialize the Settings Dialog box
         self.settingsDialog = SettingsWidget(self, self.iface, self.iface.mainWindow())
 
@@ -191,6 +193,7 @@ class LatLonTools:
 
     def unload(self):
         '''Unload LatLonTools from the QGIS interface'''
+        transformCache.disconnectProject()
         self.zoomToDialog.removeMarker()
         self.multiZoomDialog.removeMarkers()
         if self.mapTool:
@@ -369,7 +372,7 @@ class LatLonTools:
 
     def zoomTo(self, src_crs, lat, lon):
         canvas_crs = self.canvas.mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(src_crs, canvas_crs, QgsProject.instance())
+        transform = transformCache.coordinateTransform(src_crs, canvas_crs)
         x, y = transform.transform(float(lon), float(lat))
 
         rect = QgsRectangle(x, y, x, y)
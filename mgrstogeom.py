@@ -1,5 +1,4 @@
 import os
-import re
 
 from qgis.PyQt.QtCore import QUrl
 from qgis.PyQt.QtGui import QIcon
@@ -14,7 +13,7 @@ from qgis.core import (
     QgsProcessingParameterFeatureSource,
     QgsProcessingParameterFeatureSink)
 
-from . import mgrs
+from .core import mgrs
 
 
 class MGRStoLayerlgorithm(QgsProcessingAlgorithm):
@@ -71,8 +70,7 @@ class MGRStoLayerlgorithm(QgsProcessingAlgorithm):
                 break
             m = feature[mgrsfieldname]
             try:
-                m = re.sub(r'\s+', '', str(m))  # Remove all white space
-                lat, lon = mgrs.toWgs(m)
+                lat, lon = mgrs.toWgs(str(m))
             except Exception:
                 # traceback.print_exc()
                 badFeatures += 1
@@ -6,16 +6,17 @@ from qgis.PyQt.QtWidgets import QDockWidget, QHeaderView, QAbstractItemView, QFi
 from qgis.PyQt.uic import loadUiType
 from qgis.PyQt.QtCore import Qt, QVariant, pyqtSlot
 from qgis.core import (
-    QgsCoordinateTransform, QgsVectorLayer,
+    QgsVectorLayer,
     QgsField, QgsFeature, QgsGeometry, QgsPointXY,
     QgsPalLayerSettings, QgsVectorLayerSimpleLabeling, QgsProject, Qgis)
 from qgis.gui import QgsVertexMarker
 from .captureCoordinate  import CaptureCoordinate
-from .util import epsg4326, parseDMSStringSingle, parseDMSString
+from .util import epsg4326, tryParseDMSStringSingle, parseDMSString
+from . import transformCache
 from .utm import utm2Point
 from .settings import CoordOrder
-from . import mgrs
-from . import olc
+from .core import mgrs
+from .core import olc
 
 FORM_CLASS, _ = loadUiType(os.path.join(
     os.path.dirname(__file__), 'ui/multiZoomDialog.ui'))
@@ -239,8 +240,12 @@ class MultiZoomWidget(QDockWidget, FORM_CLASS):
                     try:
                         parts = [x.strip() for x in line.split(',')]
                         if len(parts) >= 2:
-                            lat = parseDMSStringSingle(parts[0])
-                            lon = parseDMSStringSingle(parts[1])
+                            lat, error = tryParseDMSStringSingle(parts[0])
+                            if error is not None:
+                                continue
+                            lon, error = tryParseDMSStringSingle(parts[1])
+                            if error is not None:
+                                continue
                             label = ''
                             data = []
                             if len(parts) >= 3:
@@ -340,7 +345,7 @@ class MultiZoomWidget(QDockWidget, FORM_CLASS):
                         self.iface.messageBar().pushMessage("", "Invalid Coordinate.", level=Qgis.Warning, duration=3)
                         return
                     srcCrs = self.settings.multiZoomToCRS()
-                    transform = QgsCoordinateTransform(srcCrs, epsg4326, QgsProject.instance())
+                    transform = transformCache.coordinateTransform(srcCrs, epsg4326)
                     if self.settings.multiCoordOrder == CoordOrder.OrderYX:
                         lon, lat = transform.transform(float(parts[1]), float(parts[0]))
                     else:
@@ -353,7 +358,7 @@ class MultiZoomWidget(QDockWidget, FORM_CLASS):
                     lat, lon = parseDMSString(str, self.settings.multiCoordOrder)
                 else:
                     srcCrs = self.settings.multiZoomToCRS()
-                    transform = QgsCoordinateTransform(srcCrs, epsg4326, QgsProject.instance())
+                    transform = transformCache.coordinateTransform(srcCrs, epsg4326)
                     if self.settings.multiCoordOrder == CoordOrder.OrderYX:
                         lon, lat = transform.transform(float(parts[1]), float(parts[0]))
                     else:
@@ -411,7 +416,7 @@ class MultiZoomWidget(QDockWidget, FORM_CLASS):
 
     def canvasPointXY(self, lat, lon):
         canvasCrs = self.canvas.mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(epsg4326, canvasCrs, QgsProject.instance())
+        transform = transformCache.coordinateTransform(epsg4326, canvasCrs)
         x, y = transform.transform(float(lon), float(lat))
         pt = QgsPointXY(x, y)
         return pt
@@ -1,24 +1,29 @@
 import os
+from itertools import islice
 
 from qgis.PyQt.QtCore import QVariant, QUrl
 from qgis.PyQt.QtGui import QIcon
 from qgis.core import (
     QgsFields, QgsField,
     QgsFeature, QgsGeometry, QgsPointXY,
-    QgsCoordinateReferenceSystem, QgsCoordinateTransform,
-    QgsProject, QgsWkbTypes)
+    QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsWkbTypes,
+    QgsFeatureRequest, QgsSpatialIndex)
 
 from qgis.core import (
     QgsProcessing,
     QgsProcessingException,
     QgsProcessingAlgorithm,
     QgsProcessingParameterString,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterPoint,
     QgsProcessingParameterNumber,
     QgsProcessingParameterField,
     QgsProcessingParameterFeatureSource,
     QgsProcessingParameterFeatureSink)
 
-from . import olc
+from .core import olc
+from .batchconvert import BATCH_SIZE, encodePoints, decodeField
+from .core.convert import plusCodesCenters
 
 
 class ToPlusCodesAlgorithm(QgsProcessingAlgorithm):
@@ -83,10 +88,18 @@ class ToPlusCodesAlgorithm(QgsProcessingAlgorithm):
         # If the layer is not EPSG:4326 we need to convert it.
         epsg4326 = QgsCoordinateReferenceSystem('EPSG:4326')
         if layerCRS != epsg4326:
-            transform = QgsCoordinateTransform(layerCRS, epsg4326, QgsProject.instance())
+            transform = QgsCoordinateTransform(layerCRS, epsg4326, context.transformContext())
+        else:
+            transform = None
 
         total = 100.0 / source.featureCount() if source.featureCount() else 0
 
+        if olc.HAVE_NUMPY:
+            encodePoints(
+                source, sink, transform,
+                lambda lat, lon: olc.encodeArray(lat, lon, plusCodesLength), feedback, total)
+            return {self.PrmOutputLayer: dest_id}
+
         iterator = source.getFeatures()
         for cnt, feature in enumerate(iterator):
             if feedback.isCanceled():
@@ -183,7 +196,11 @@ class PlusCodes2Layerlgorithm(QgsProcessingAlgorithm):
         total = 100.0 / featureCount if featureCount else 0
         badFeatures = 0
 
-        iterator = source.getFeatures()
+        if olc.HAVE_NUMPY:
+            badFeatures = decodeField(source, sink, pluscodesfieldname, plusCodesCenters, feedback, total)
+            iterator = []
+        else:
+            iterator = source.getFeatures()
         for cnt, feature in enumerate(iterator):
             if feedback.isCanceled():
                 break
@@ -235,3 +252,200 @@ class PlusCodes2Layerlgorithm(QgsProcessingAlgorithm):
 
     def createInstance(self):
         return PlusCodes2Layerlgorithm()
+
+
+def recoverCodes(codes, latitudes, longitudes):
+    """ Returns a list of the full codes recovered from a list of short codes
+    and reference locations, an empty string where it is not possible.
+    """
+    if olc.HAVE_NUMPY:
+        return olc.recoverNearestArray(codes, latitudes, longitudes).tolist()
+    results = []
+    for code, lat, lon in zip(codes, latitudes, longitudes):
+        try:
+            results.append(olc.recoverNearest(code, lat, lon))
+        except Exception:
+            results.append('')
+    return results
+
+
+class RecoverPlusCodesAlgorithm(QgsProcessingAlgorithm):
+    """
+    Algorithm to recover full Plus Codes from a field of short Plus Codes.
+    """
+    # Constants used to refer to parameters and outputs. They will be
+    # used when calling the algorithm from another algorithm, or when
+    # calling from the QGIS console.
+    PrmInputLayer = 'InputLayer'
+    PrmShortCodesField = 'ShortCodesField'
+    PrmReferenceType = 'ReferenceType'
+    PrmReferencePoint = 'ReferencePoint'
+    PrmReferenceLayer = 'ReferenceLayer'
+    PrmPlusCodesFieldName = 'PlusCodesFieldName'
+    PrmOutputLayer = 'OutputLayer'
+
+    def initAlgorithm(self, config):
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmInputLayer,
+                'Input vector layer or table',
+                [QgsProcessing.TypeVector])
+        )
+        self.addParameter(
+            QgsProcessingParameterField(
+                self.PrmShortCodesField,
+                'Field containing short Plus Codes',
+                parentLayerParameterName=self.PrmInputLayer,
+                type=QgsProcessingParameterField.String)
+        )
+        self.addParameter(
+            QgsProcessingParameterEnum(
+                self.PrmReferenceType,
+                'Reference location',
+                options=['Feature geometry', 'Reference point',
+                         'Nearest feature of the reference layer'],
+                defaultValue=0,
+                optional=False)
+        )
+        self.addParameter(
+            QgsProcessingParameterPoint(
+                self.PrmReferencePoint,
+                'Reference point',
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSource(
+                self.PrmReferenceLayer,
+                'Reference layer',
+                [QgsProcessing.TypeVectorAnyGeometry],
+                optional=True)
+        )
+        self.addParameter(
+            QgsProcessingParameterString(
+                self.PrmPlusCodesFieldName,
+                'Full Plus Codes field name',
+                defaultValue='pluscodes_full')
+        )
+        self.addParameter(
+            QgsProcessingParameterFeatureSink(
+                self.PrmOutputLayer,
+                'Output layer')
+        )
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.PrmInputLayer, context)
+        shortcodesfieldname = self.parameterAsString(parameters, self.PrmShortCodesField, context)
+        referenceType = self.parameterAsInt(parameters, self.PrmReferenceType, context)
+        field_name = self.parameterAsString(parameters, self.PrmPlusCodesFieldName, context).strip()
+        if not shortcodesfieldname:
+            msg = 'Select a short Plus Codes field to process'
+            feedback.reportError(msg)
+            raise QgsProcessingException(msg)
+
+        fieldsout = QgsFields(source.fields())
+        if fieldsout.append(QgsField(field_name, QVariant.String)) is False:
+            msg = "Plus Codes Field Name must be unique. There is already a field named '{}'".format(field_name)
+            feedback.reportError(msg)
+            raise QgsProcessingException(msg)
+
+        layerCRS = source.sourceCrs()
+        (sink, dest_id) = self.parameterAsSink(
+            parameters, self.PrmOutputLayer,
+            context, fieldsout, source.wkbType(), layerCRS)
+
+        epsg4326 = QgsCoordinateReferenceSystem('EPSG:4326')
+        if referenceType != 1 and source.wkbType() == QgsWkbTypes.NoGeometry:
+            msg = 'A table without geometry needs a reference point'
+            feedback.reportError(msg)
+            raise QgsProcessingException(msg)
+        if referenceType == 1:
+            if not parameters.get(self.PrmReferencePoint):
+                msg = 'Select a reference point'
+                feedback.reportError(msg)
+                raise QgsProcessingException(msg)
+            pt = self.parameterAsPoint(parameters, self.PrmReferencePoint, context, epsg4326)
+            referenceLat = pt.y()
+            referenceLon = pt.x()
+        else:
+            transform = QgsCoordinateTransform(layerCRS, epsg4326, context.transformContext())
+        if referenceType == 2:
+            refSource = self.parameterAsSource(parameters, self.PrmReferenceLayer, context)
+            if refSource is None:
+                msg = 'Select a reference layer'
+                feedback.reportError(msg)
+                raise QgsProcessingException(msg)
+            # Index the reference layer in the CRS of the input layer
+            request = QgsFeatureRequest().setDestinationCrs(layerCRS, context.transformContext())
+            index = QgsSpatialIndex(
+                refSource.getFeatures(request), feedback, QgsSpatialIndex.FlagStoreFeatureGeometries)
+
+        featureCount = source.featureCount()
+        total = 100.0 / featureCount if featureCount else 0
+        badFeatures = 0
+        cnt = 0
+
+        iterator = source.getFeatures()
+        while not feedback.isCanceled():
+            features = list(islice(iterator, BATCH_SIZE))
+            if not features:
+                break
+            codes = [''] * len(features)
+            lats = [float('nan')] * len(features)
+            lons = [float('nan')] * len(features)
+            for i, feature in enumerate(features):
+                try:
+                    codes[i] = feature[shortcodesfieldname].strip()
+                    if referenceType == 1:
+                        lats[i] = referenceLat
+                        lons[i] = referenceLon
+                        continue
+                    pt = feature.geometry().centroid().asPoint()
+                    if referenceType == 2:
+                        nearest = index.nearestNeighbor(pt, 1)
+                        pt = index.geometry(nearest[0]).centroid().asPoint()
+                    pt = transform.transform(pt)
+                    lats[i] = pt.y()
+                    lons[i] = pt.x()
+                except Exception:
+                    pass
+            for feature, code in zip(features, recoverCodes(codes, lats, lons)):
+                if not code:
+                    badFeatures += 1
+                f = QgsFeature()
+                f.setGeometry(feature.geometry())
+                f.setAttributes(feature.attributes() + [code])
+                sink.addFeature(f)
+            cnt += len(features)
+            feedback.setProgress(int(cnt * total))
+
+        if badFeatures > 0:
+            msg = "{} out of {} features contained recoverable Plus Codes".format(featureCount - badFeatures, featureCount)
+            feedback.pushInfo(msg)
+
+        return {self.PrmOutputLayer: dest_id}
+
+    def name(self):
+        return 'recoverpluscodes'
+
+    def icon(self):
+        return QIcon(os.path.dirname(__file__) + '/images/pluscodes.svg')
+
+    def displayName(self):
+        return 'Recover full Plus Codes from short codes'
+
+    def helpUrl(self):
+        file = os.path.dirname(__file__) + '/index.html'
+        if not os.path.exists(file):
+            return ''
+        return QUrl.fromLocalFile(file).toString(QUrl.FullyEncoded)
+
+    def shortHelpString(self):
+        file = os.path.dirname(__file__) + '/doc/recoverpluscodes.help'
+        if not os.path.exists(file):
+            return ''
+        with open(file) as helpf:
+            help = helpf.read()
+        return help
+
+    def createInstance(self):
+        return RecoverPlusCodesAlgorithm()
@@ -3,9 +3,11 @@ from qgis.core import QgsProcessingProvider
 from qgis.PyQt.QtGui import QIcon
 from .tomgrs import ToMGRSAlgorithm
 from .mgrstogeom import MGRStoLayerlgorithm
-from .pluscodes import ToPlusCodesAlgorithm, PlusCodes2Layerlgorithm
+from .pluscodes import ToPlusCodesAlgorithm, PlusCodes2Layerlgorithm, RecoverPlusCodesAlgorithm
 from .geom2field import Geom2FieldAlgorithm
 from .field2geom import Field2GeomAlgorithm
+from .geohashcover import GeohashCoverAlgorithm
+from .geohashjoin import GeohashJoinAlgorithm
 
 
 class LatLonToolsProvider(QgsProcessingProvider):
@@ -16,10 +18,13 @@ class LatLonToolsProvider(QgsProcessingProvider):
     def loadAlgorithms(self):
         self.addAlgorithm(PlusCodes2Layerlgorithm())
         self.addAlgorithm(ToPlusCodesAlgorithm())
+        self.addAlgorithm(RecoverPlusCodesAlgorithm())
         self.addAlgorithm(MGRStoLayerlgorithm())
         self.addAlgorithm(ToMGRSAlgorithm())
         self.addAlgorithm(Geom2FieldAlgorithm())
         self.addAlgorithm(Field2GeomAlgorithm())
+        self.addAlgorithm(GeohashCoverAlgorithm())
+        self.addAlgorithm(GeohashJoinAlgorithm())
 
     def icon(self):
         return QIcon(os.path.dirname(__file__) + '/images/copyicon.svg')
@@ -1,8 +1,9 @@
 from qgis.PyQt.QtCore import Qt, QUrl
 from qgis.PyQt.QtGui import QColor
-from qgis.core import Qgis, QgsCoordinateTransform, QgsProject, QgsSettings
+from qgis.core import Qgis, QgsSettings
 from qgis.gui import QgsMapToolEmitPoint, QgsVertexMarker
 from .util import epsg4326
+from . import transformCache
 from .settings import settings
 import os
 import webbrowser
@@ -48,7 +49,7 @@ class ShowOnMapTool(QgsMapToolEmitPoint):
         button = event.button()
 
         canvasCRS = self.canvas.mapSettings().destinationCrs()
-        transform = QgsCoordinateTransform(canvasCRS, epsg4326, QgsProject.instance())
+        transform = transformCache.coordinateTransform(canvasCRS, epsg4326)
         pt4326 = transform.transform(pt.x(), pt.y())
         lat = pt4326.y()
         lon = pt4326.x()
@@ -2,7 +2,7 @@ import os
 
 from qgis.PyQt.QtCore import QVariant, QUrl
 from qgis.PyQt.QtGui import QIcon
-from qgis.core import QgsFields, QgsField, QgsFeature, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+from qgis.core import QgsFields, QgsField, QgsFeature, QgsCoordinateReferenceSystem, QgsCoordinateTransform
 
 from qgis.core import (
     QgsProcessing,
@@ -13,7 +13,7 @@ from qgis.core import (
     QgsProcessingParameterFeatureSource,
     QgsProcessingParameterFeatureSink)
 
-from . import mgrs
+from .core import mgrs
 
 
 class ToMGRSAlgorithm(QgsProcessingAlgorithm):
@@ -78,7 +78,7 @@ class ToMGRSAlgorithm(QgsProcessingAlgorithm):
         # If the layer is not EPSG:4326 we need to convert it.
         epsg4326 = QgsCoordinateReferenceSystem('EPSG:4326')
         if layerCRS != epsg4326:
-            transform = QgsCoordinateTransform(layerCRS, epsg4326, QgsProject.instance())
+            transform = QgsCoordinateTransform(layerCRS, epsg4326, context.transformContext())
 
         total = 100.0 / source.featureCount() if source.featureCount() else 0
 
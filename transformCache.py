@@ -0,0 +1,106 @@
+"""
+Shared cache of QgsCoordinateReferenceSystem and QgsCoordinateTransform
+objects used throughout the plugin.
+
+Creating a CRS from a string queries the QGIS CRS database and creating a
+transformation has to look up the coordinate operation, so both are far
+slower than transforming a point. Transformations are cached per thread in
+an LRU keyed by the source and destination CRS. They use the transform
+context of the project, so the cache is cleared when the project CRS or
+transform context changes, see connectProject.
+
+Processing algorithms may run in background threads and must not use the
+project instance, so they do not use this cache and build their
+transformations from the transform context of their QgsProcessingContext
+instead.
+"""
+from functools import lru_cache
+from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+from .core.transformBackends import TransformCache
+
+TRANSFORM_CACHE_SIZE = 64
+CRS_CACHE_SIZE = 64
+
+_transform_cache = TransformCache(TRANSFORM_CACHE_SIZE)
+
+
+@lru_cache(maxsize=CRS_CACHE_SIZE)
+def _crsFromString(definition):
+    return QgsCoordinateReferenceSystem(definition)
+
+
+def crsFromString(definition):
+    """ Returns a QgsCoordinateReferenceSystem for an authority id such as
+    'EPSG:4326' or any other definition accepted by the constructor,
+    creating it only once
+
+    @param definition - CRS definition string
+    @returns - QgsCoordinateReferenceSystem
+    """
+    # Return a copy so the cached CRS cannot be modified by the caller
+    return QgsCoordinateReferenceSystem(_crsFromString(definition))
+
+
+def _crsKey(crs):
+    if isinstance(crs, str):
+        return crs
+    authid = crs.authid()
+    if authid:
+        return authid
+    return crs.toWkt()
+
+
+def coordinateTransform(src, dst):
+    """ Returns a cached QgsCoordinateTransform using the transform context
+    of the current project. The transformation must not be passed to another
+    thread.
+
+    @param src - source QgsCoordinateReferenceSystem or authority id
+    @param dst - destination QgsCoordinateReferenceSystem or authority id
+    @returns - QgsCoordinateTransform
+    """
+    def factory(*key):
+        src_crs = crsFromString(src) if isinstance(src, str) else src
+        dst_crs = crsFromString(dst) if isinstance(dst, str) else dst
+        return QgsCoordinateTransform(src_crs, dst_crs, QgsProject.instance())
+    return _transform_cache.get((_crsKey(src), _crsKey(dst)), factory)
+
+
+def clearCache():
+    """ Drops all cached transformations and resets the counters
+    """
+    _transform_cache.clear()
+
+
+def cacheInfo():
+    """ Returns the transformation cache statistics
+
+    @returns - dict with hits, misses, maxsize and currsize (entries held by
+    the calling thread)
+    """
+    return _transform_cache.info()
+
+
+def _projectChanged(*args):
+    clearCache()
+
+
+def connectProject():
+    """ Clears the cache whenever the project CRS or transform context
+    changes. Called when the plugin is loaded.
+    """
+    project = QgsProject.instance()
+    project.crsChanged.connect(_projectChanged)
+    project.transformContextChanged.connect(_projectChanged)
+
+
+def disconnectProject():
+    """ Undoes connectProject when the plugin is unloaded
+    """
+    project = QgsProject.instance()
+    try:
+        project.crsChanged.disconnect(_projectChanged)
+        project.transformContextChanged.disconnect(_projectChanged)
+    except Exception:
+        pass
+    clearCache()
@@ -1,77 +1,21 @@
-import re
-import math
-from qgis.core import QgsPointXY, QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsProject
+"""
+QGIS side of the UPS conversions. The parsing and formatting are in
+core/ups.py, which does not need QGIS, and are imported from there.
+"""
+from qgis.core import QgsPointXY
 from .util import epsg4326
-
-epsg32661 = QgsCoordinateReferenceSystem("EPSG:32661")
-epsg32761 = QgsCoordinateReferenceSystem("EPSG:32761")
-
-class UpsException(Exception):
-    pass
-
-def upsParse(ups_str):
-    ups = ups_str.strip().upper()
-    m = re.match(r'^([ABYZ])\s+(\d+\.?\d*)\s*M\s*E\s+(\d+\.?\d*)\s*M\s*N', ups)
-    if m is None:
-        m = re.match(r'^([ABYZ])\s+(\d+\.?\d*)\s+(\d+\.?\d*)', ups)
-        if m is None:
-            m = re.match(r'^([ABYZ])(\d+\.?\d*)E(\d+\.?\d*)N', ups)
-    if m:
-        m = m.groups()
-        if len(m) == 3:
-            letter = m[0]
-            easting = float(m[1])
-            northing = float(m[2])
-            return(letter, easting, northing)
-    
-    raise UpsException('Invalid UPS Coordinate')
+from . import transformCache
+from .core.ups import (
+    UpsException, UpsCoordinate, tryParse, upsParse, ups2LatLon, isUps,
+    latLon2Ups)
 
 def ups2Point(ups, crs=epsg4326):
-    letter, easting, northing = upsParse(ups)
-    if letter == 'A' or letter == 'B':
-        epsg = epsg32761
-    else:
-        epsg = epsg32661
-    pt = QgsPointXY(easting, northing)
-    upstrans = QgsCoordinateTransform(epsg, crs, QgsProject.instance())
-    return(upstrans.transform(pt))
-
-def isUps(ups):
-    try:
-        l, e, n = upsParse(ups)
-    except Exception:
-        return(False)
-
-    return(True)
-
-
-def latLon2Ups(lat, lon, precision=0, format=0):
-    if lon < -180 or lon > 360:
-        return("")
-    if lat < 83.5 and lat > -79.5:
-        return("")
-    if lat > 90 or lat < -90:
-        return("")
-    if lon > 180:
-        lon -= 360
-    if lat >= 83.5:
-        epsg = epsg32661
-        if lon < 0:
-            letter = 'Y'
-        else:
-            letter = 'Z'
-    else:
-        epsg = epsg32761
-        if lon < 0:
-            letter = 'A'
-        else:
-            letter = 'B'
-    upstrans = QgsCoordinateTransform(epsg4326, epsg, QgsProject.instance())
+    """ Converts a UPS coordinate string, or a UpsCoordinate returned by
+    tryParse, to a QgsPointXY in crs
+    """
+    lat, lon = ups2LatLon(ups)
     pt = QgsPointXY(lon, lat)
-    upspt = upstrans.transform(pt)
-    if format == 0:
-        msg = '{} {:.{prec}f}mE {:.{prec}f}mN'.format(letter, upspt.x(), upspt.y(), prec=precision)
-    else:
-        msg = '{}{:.{prec}f}E{:.{prec}f}N'.format(letter, upspt.x(), upspt.y(), prec=precision)
-
-    return(msg)
+    if crs == epsg4326:
+        return(pt)
+    trans = transformCache.coordinateTransform(epsg4326, crs)
+    return(trans.transform(pt))
@@ -9,15 +9,17 @@ from qgis.gui import QgsVertexMarker
 from qgis.core import Qgis, QgsJsonUtils, QgsWkbTypes
 from .util import epsg4326, parseDMSString
 from .settings import CoordOrder
-from .utm import isUtm, utm2Point
-from .ups import isUps, ups2Point
+from . import utm
+from .utm import utm2Point
+from . import ups
+from .ups import ups2Point
 # import traceback
 
-from . import mgrs
-from . import olc
-from . import geohash
-from .maidenhead import maidenGridCenter
-from . import georef
+from .core import mgrs
+from .core import olc
+from .core import geohash
+from .core.maidenhead import maidenGridCenter
+from .core import georef
 
 FORM_CLASS, _ = loadUiType(os.path.join(
     os.path.dirname(__file__), 'ui/zoomToLatLon.ui'))
@@ -147,13 +149,15 @@ class ZoomToLatLon(QDockWidget, FORM_CLASS):
                 return(pt.y(), pt.x(), epsg4326)
 
             # Check to see if it is standard UTM
-            if isUtm(text):
-                pt = utm2Point(text)
+            coord = utm.tryParse(text)
+            if coord is not None:
+                pt = utm2Point(coord)
                 return(pt.y(), pt.x(), epsg4326)
 
             # Check to see if it is a UPS coordinate
-            if isUps(text):
-                pt = ups2Point(text)
+            coord = ups.tryParse(text)
+            if coord is not None:
+                pt = ups2Point(coord)
                 return(pt.y(), pt.x(), epsg4326)
 
             # Check to see if it is a Georef coordinate